@@ -0,0 +1,66 @@
+"""
+Seeded random sequence generators and fasta fixtures for the benchmarks.
+
+Included functions:
+    random_dna:                 Returns a random DNA sequence.
+    random_rna:                 Returns a random RNA sequence.
+    random_orf:                 Returns a random RNA open reading frame (start codon, no stop codons).
+    random_protein:             Returns a random protein sequence.
+    mutate:                     Returns a copy of a sequence with random substitutions, insertions and deletions.
+    write_multifasta:           Writes random DNA records of a given total size to a fasta file.
+"""
+
+import random
+
+from rosalind.translation import codon_table
+
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+SENSE_CODONS = [codon for codon, aa in codon_table().items() if aa != '*']
+
+
+def random_dna(length: int, seed: int = 0) -> str:
+    return ''.join(random.Random(seed).choices('ACGT', k=length))
+
+
+def random_rna(length: int, seed: int = 0) -> str:
+    return ''.join(random.Random(seed).choices('ACGU', k=length))
+
+
+def random_orf(length: int, seed: int = 0) -> str:
+    # AUG followed by sense codons only, so translation runs over the whole sequence
+    codons = random.Random(seed).choices(SENSE_CODONS, k=max(0, length // 3 - 1))
+    return 'AUG' + ''.join(codons)
+
+
+def random_protein(length: int, seed: int = 0) -> str:
+    return ''.join(random.Random(seed).choices(AMINO_ACIDS, k=length))
+
+
+def mutate(seq: str, rate: float = 0.01, seed: int = 0, alphabet: str = 'ACGT') -> str:
+    """
+    Apply substitutions, insertions and deletions (each a third of rate) to a sequence.
+    """
+
+    rng = random.Random(seed)
+    out = []
+    for c in seq:
+        r = rng.random()
+        if r < rate / 3:
+            out.append(rng.choice(alphabet))
+        elif r < 2 * rate / 3:
+            out.append(c + rng.choice(alphabet))
+        elif r >= rate:
+            out.append(c)
+    return ''.join(out)
+
+
+def write_multifasta(path, total_length: int, record_length: int = 10_000, line_width: int = 60, seed: int = 0):
+    """
+    Write random DNA records of record_length bases (total_length bases in all) to a fasta file.
+    """
+
+    with open(path, 'w') as f:
+        for i, start in enumerate(range(0, total_length, record_length)):
+            seq = random_dna(min(record_length, total_length - start), seed=seed + i)
+            f.write(f'>record_{i}\n')
+            f.writelines(seq[j:j + line_width] + '\n' for j in range(0, len(seq), line_width))
@@ -0,0 +1,204 @@
+"""
+Benchmarks for the public functions of rosalind.sequence and rosalind.utils.
+
+Every function is timed on synthetic, seeded inputs from 1 kb up to 10 Mb (or up to a smaller size for functions
+with quadratic cost). The best of several repeats is kept, and peak memory is measured in a separate
+run with tracemalloc. Results are written as JSON, and two result files can be compared to flag slowdowns.
+
+Usage:
+    python -m benchmarks.run run --out baseline.json
+    python -m benchmarks.run run --quick --out current.json
+    python -m benchmarks.run compare baseline.json current.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from rosalind.sequence import (reverse_complement, translate_rna, hamming_distance, find_motif,
+                               longest_common_substring, levenshtein_distance)
+from rosalind.utils import read_multifasta, gc, calculate_mw
+
+from .generators import random_dna, random_orf, random_protein, mutate, write_multifasta
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+QUICK_SIZES = (1_000, 10_000)
+
+
+def _setup_reverse_complement(n, tmp):
+    return reverse_complement, (random_dna(n),)
+
+
+def _setup_translate_rna(n, tmp):
+    return translate_rna, (random_orf(n),)
+
+
+def _setup_hamming_distance(n, tmp):
+    return hamming_distance, (random_dna(n, seed=1), random_dna(n, seed=2))
+
+
+def _setup_find_motif(n, tmp):
+    return find_motif, (random_dna(n), 'ACGTAC')
+
+
+def _setup_longest_common_substring(n, tmp):
+    # four related sequences of n / 4 bases each
+    base = random_dna(n // 4)
+    return longest_common_substring, ([mutate(base, 0.05, seed=i) for i in range(4)],)
+
+
+def _setup_levenshtein_distance(n, tmp):
+    seq = random_dna(n)
+    return levenshtein_distance, (seq, mutate(seq, 0.02))
+
+
+def _setup_read_multifasta(n, tmp):
+    path = os.path.join(tmp, f'records_{n}.fa')
+    write_multifasta(path, n)
+    return read_multifasta, (path,)
+
+
+def _setup_gc(n, tmp):
+    return gc, (random_dna(n),)
+
+
+def _setup_calculate_mw(n, tmp):
+    return calculate_mw, (random_protein(n),)
+
+
+# name: (setup function, largest input size)
+BENCHMARKS = {
+    'reverse_complement': (_setup_reverse_complement, 10_000_000),
+    'translate_rna': (_setup_translate_rna, 10_000_000),
+    'hamming_distance': (_setup_hamming_distance, 10_000_000),
+    'find_motif': (_setup_find_motif, 10_000_000),
+    'longest_common_substring': (_setup_longest_common_substring, 100_000),
+    'levenshtein_distance': (_setup_levenshtein_distance, 10_000),
+    'read_multifasta': (_setup_read_multifasta, 10_000_000),
+    'gc': (_setup_gc, 10_000_000),
+    'calculate_mw': (_setup_calculate_mw, 10_000_000),
+}
+
+
+def measure(func, args, repeat: int = 3) -> dict:
+    """
+    Best wall time of repeat calls and peak traced memory of one more call.
+    """
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def run(sizes=SIZES, names=None, repeat: int = 3, log=sys.stderr) -> dict:
+    """
+    Run the benchmarks and return the results as a JSON-serializable dictionary.
+
+    :param sizes: Input sizes in bases (or residues).
+    :param names: Names of the benchmarks to run, defaults to all.
+    :param repeat: Number of timed calls per benchmark, the fastest is kept.
+    :param log: Where to print progress, None for no output.
+    :return: Dictionary {'meta': {...}, 'results': {'name@size': {'seconds': float, 'peak_bytes': int}}}.
+    """
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names or BENCHMARKS:
+            setup, max_size = BENCHMARKS[name]
+            for n in sizes:
+                if n > max_size:
+                    continue
+                func, args = setup(n, tmp)
+                result = measure(func, args, repeat)
+                results[f'{name}@{n}'] = result
+                if log is not None:
+                    print(f'{name:>26} {n:>10}  {result["seconds"]:.6f} s  {result["peak_bytes"] / 1e6:.2f} MB', file=log)
+
+    meta = {
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+    }
+    return {'meta': meta, 'results': results}
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.25) -> list:
+    """
+    Compare two benchmark results.
+
+    :param baseline: Results of an earlier run.
+    :param current: Results of the run to check.
+    :param tolerance: Allowed relative slowdown (0.25 means 25% slower is still fine).
+    :return: List of (key, baseline seconds, current seconds, ratio) for all benchmarks slower than allowed.
+    """
+
+    slower = []
+    for key, now in current['results'].items():
+        before = baseline['results'].get(key)
+        if before is None or before['seconds'] <= 0:
+            continue
+        ratio = now['seconds'] / before['seconds']
+        if ratio > 1 + tolerance:
+            slower.append((key, before['seconds'], now['seconds'], ratio))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description=__doc__.split('\n\n')[0].strip())
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--out', help='write the results to this JSON file (default: stdout)')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=None, help='input sizes in bases')
+    run_parser.add_argument('--quick', action='store_true', help=f'only sizes {QUICK_SIZES}')
+    run_parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='benchmarks to run')
+    run_parser.add_argument('--repeat', type=int, default=3)
+
+    compare_parser = commands.add_parser('compare', help='flag slowdowns against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+        results = run(sizes, args.only, args.repeat)
+        if args.out:
+            with open(args.out, 'w') as f:
+                json.dump(results, f, indent=2)
+        else:
+            json.dump(results, sys.stdout, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    slower = compare(baseline, current, args.tolerance)
+    for key, before, now, ratio in slower:
+        print(f'SLOWER {key}: {before:.6f} s -> {now:.6f} s ({ratio:.2f}x)')
+    if not slower:
+        print('No slowdowns.')
+    return 1 if slower else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
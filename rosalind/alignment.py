@@ -0,0 +1,258 @@
+"""
+Edit distance kernels used by rosalind.sequence.levenshtein_distance and linear-space global alignment.
+
+Included functions:
+    levenshtein_two_row:        Edit distance with a rolling two-row dynamic programming table, O(min(m, n)) memory.
+    levenshtein_bitparallel:    Edit distance with Myers'/Hyyrö's bit-parallel algorithm on Python integers.
+    levenshtein_banded:         Edit distance restricted to a diagonal band, with early exit above a threshold.
+    align:                      Optimal global alignment in linear space (Hirschberg) with configurable costs.
+"""
+
+from collections import namedtuple
+
+Alignment = namedtuple('Alignment', ['aligned_s', 'aligned_t', 'cost', 'ops'])
+
+# full tables up to this many cells are used at the bottom of the Hirschberg recursion
+_FULL_TABLE_CELLS = 4096
+
+
+def _last_row(s, t, match=0, mismatch=1, gap=1) -> list:
+    """
+    Rolling-row kernel: last row of the global alignment cost table of s (rows) against t (columns).
+
+    Costs are minimized; with the defaults the last value is the edit distance.
+    """
+
+    prev = [j * gap for j in range(len(t) + 1)]
+    for i, a in enumerate(s, start=1):
+        cur = [i * gap]
+        left = i * gap
+        for j, b in enumerate(t):
+            # deletion, insertion, match or mismatch
+            left = min(prev[j + 1] + gap, left + gap, prev[j] + (match if a == b else mismatch))
+            cur.append(left)
+        prev = cur
+    return prev
+
+
+def levenshtein_two_row(s, t) -> int:
+    """
+    Edit distance between two strings keeping only two rows of the dynamic programming table.
+
+    :param s: First string.
+    :param t: Second string.
+    :return: Levenshtein distance.
+    """
+
+    # rows run along the shorter string
+    if len(t) > len(s):
+        s, t = t, s
+    return _last_row(s, t)[-1]
+
+
+def levenshtein_bitparallel(s, t) -> int:
+    """
+    Edit distance with Myers' bit-vector algorithm in Hyyrö's formulation for global distance.
+
+    One column of the dynamic programming table is encoded as vertical +1/-1 delta bit vectors stored in
+    Python integers, so the shorter string may be of any length and each character of the longer string
+    costs a fixed number of big integer operations.
+
+    :param s: First string.
+    :param t: Second string.
+    :return: Levenshtein distance.
+    """
+
+    # the shorter string is encoded into the bit vectors
+    if len(t) > len(s):
+        s, t = t, s
+    m = len(t)
+    if m == 0:
+        return len(s)
+
+    # bit i of peq[c] is set if t[i] == c
+    peq = {}
+    for i, c in enumerate(t):
+        peq[c] = peq.get(c, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv = mask
+    mv = 0
+    score = m
+    for c in s:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        # the last row of the column gives the distance to the current prefix of s
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # shift in a +1 at the top: the first row of the table grows by one per character
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
+
+
+def levenshtein_banded(s, t, max_distance: int) -> int:
+    """
+    Edit distance if it is at most max_distance, otherwise max_distance + 1.
+
+    Only the cells within max_distance of the main diagonal are computed (O(k * min(m, n)) time)
+    and the computation stops as soon as a whole row exceeds the threshold.
+
+    :param s: First string.
+    :param t: Second string.
+    :param max_distance: Threshold k.
+    :return: Levenshtein distance, or max_distance + 1 if the distance is larger than max_distance.
+    """
+
+    k = max_distance
+    if k < 0:
+        raise ValueError('max_distance must not be negative!')
+    # rows run along the longer string, the band along the shorter one
+    if len(t) > len(s):
+        s, t = t, s
+    m, n = len(s), len(t)
+    over = k + 1
+    if m - n > k:
+        return over
+
+    # cell (i, j) of the table is stored at band[j - i + k]
+    width = 2 * k + 1
+    prev = [j if 0 <= j <= n else over for j in range(-k, k + 1)]
+    for i in range(1, m + 1):
+        a = s[i - 1]
+        cur = [over] * width
+        row_min = over
+        for j in range(max(0, i - k), min(n, i + k) + 1):
+            d = j - i + k
+            if j == 0:
+                v = i
+            else:
+                # substitution, deletion, insertion
+                v = prev[d] + (a != t[j - 1])
+                if d + 1 < width and prev[d + 1] + 1 < v:
+                    v = prev[d + 1] + 1
+                if d > 0 and cur[d - 1] + 1 < v:
+                    v = cur[d - 1] + 1
+                if v > over:
+                    v = over
+            cur[d] = v
+            if v < row_min:
+                row_min = v
+        # costs never decrease along an alignment path, so the final distance is at least the row minimum
+        if row_min > k:
+            return over
+        prev = cur
+    return prev[n - m + k]
+
+
+def _align_full(s, t, match, mismatch, gap, ops):
+    # small problems: full cost table and traceback, appends the operations to ops
+    m, n = len(s), len(t)
+    dp = [[j * gap for j in range(n + 1)]]
+    for i in range(1, m + 1):
+        row = [i * gap]
+        for j in range(1, n + 1):
+            sub = dp[i - 1][j - 1] + (match if s[i - 1] == t[j - 1] else mismatch)
+            row.append(min(sub, dp[i - 1][j] + gap, row[j - 1] + gap))
+        dp.append(row)
+
+    path = []
+    i, j = m, n
+    while i or j:
+        if i and j and dp[i][j] == dp[i - 1][j - 1] + (match if s[i - 1] == t[j - 1] else mismatch):
+            path.append('=' if s[i - 1] == t[j - 1] else 'X')
+            i -= 1
+            j -= 1
+        elif i and dp[i][j] == dp[i - 1][j] + gap:
+            path.append('D')
+            i -= 1
+        else:
+            path.append('I')
+            j -= 1
+    ops.extend(reversed(path))
+
+
+def _hirschberg(s, t, match, mismatch, gap, ops):
+    if not s:
+        ops.extend('I' * len(t))
+        return
+    if not t:
+        ops.extend('D' * len(s))
+        return
+    if len(s) == 1 or len(s) * len(t) <= _FULL_TABLE_CELLS:
+        _align_full(s, t, match, mismatch, gap, ops)
+        return
+
+    # split s in the middle and find where the optimal path crosses that row
+    mid = len(s) // 2
+    left = _last_row(s[:mid], t, match, mismatch, gap)
+    right = _last_row(s[mid:][::-1], t[::-1], match, mismatch, gap)
+    n = len(t)
+    split = min(range(n + 1), key=lambda j: left[j] + right[n - j])
+
+    _hirschberg(s[:mid], t[:split], match, mismatch, gap, ops)
+    _hirschberg(s[mid:], t[split:], match, mismatch, gap, ops)
+
+
+def align(s, t, match=0, mismatch=1, gap=1) -> Alignment:
+    """
+    Optimal global alignment of two strings with Hirschberg's divide-and-conquer algorithm.
+
+    Uses the same rolling-row kernel as levenshtein_two_row, so memory is O(min(m, n)) while the traceback
+    is still recovered. Costs are minimized; the defaults give an alignment with the Levenshtein distance as cost.
+
+    The edit script has one letter per alignment column:
+    '=' match, 'X' mismatch, 'D' character of s against a gap, 'I' character of t against a gap.
+
+    :param s: First string.
+    :param t: Second string.
+    :param match: Cost of aligning two equal characters.
+    :param mismatch: Cost of aligning two different characters.
+    :param gap: Cost of a character aligned to a gap.
+    :return: Alignment(aligned_s, aligned_t, cost, ops) with gapped strings ('-' for gaps) and the edit script.
+    """
+
+    # keep the rows along the shorter string
+    swapped = len(t) > len(s)
+    if swapped:
+        s, t = t, s
+
+    ops = []
+    _hirschberg(s, t, match, mismatch, gap, ops)
+
+    if swapped:
+        s, t = t, s
+        ops = [{'D': 'I', 'I': 'D'}.get(op, op) for op in ops]
+
+    # gapped strings and cost from the edit script
+    aligned_s = []
+    aligned_t = []
+    cost = 0
+    i = j = 0
+    for op in ops:
+        if op == 'I':
+            aligned_s.append('-')
+            aligned_t.append(t[j])
+            j += 1
+            cost += gap
+        elif op == 'D':
+            aligned_s.append(s[i])
+            aligned_t.append('-')
+            i += 1
+            cost += gap
+        else:
+            aligned_s.append(s[i])
+            aligned_t.append(t[j])
+            i += 1
+            j += 1
+            cost += match if op == '=' else mismatch
+
+    return Alignment(''.join(aligned_s), ''.join(aligned_t), cost, ''.join(ops))
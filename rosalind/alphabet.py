@@ -0,0 +1,163 @@
+"""
+Table-driven validation of sequences against configurable alphabets.
+
+Every alphabet precomputes byte translation tables once. Validation is a single bytes.translate that deletes
+all allowed letters (whatever remains is invalid), and case folding is a single translate which also maps
+invalid letters to 0, so validation and upper-casing are done in the same pass without sets or extra copies.
+Fused kernels answer validity together with a result from the same pass (validate_gc).
+reverse_complement (rosalind.sequence) and translate (rosalind.translation, strict=True) validate
+within their own translation pass as well.
+
+Included functions:
+    Alphabet:                   A set of allowed letters (case-insensitive) with its translation tables.
+    InvalidSequenceError:       ValueError raised for letters outside the alphabet.
+    get_alphabet:               Returns an Alphabet by name ('dna', 'rna', 'nucleotide', 'iupac', 'protein').
+    is_valid:                   Checks if a sequence consists only of letters of an alphabet.
+    normalize:                  Validates and upper-cases a sequence in one pass.
+    validate_gc:                Validates a nucleic acid sequence and returns its GC content in one pass.
+"""
+
+
+class InvalidSequenceError(ValueError):
+    """
+    A sequence contains letters which are not in the expected alphabet.
+    """
+
+
+class Alphabet:
+    """
+    Allowed letters of a sequence type, upper and lower case.
+
+    :param name: Name of the alphabet.
+    :param letters: The allowed letters in upper case.
+    """
+
+    __slots__ = ('name', 'letters', '_delete', '_upper')
+
+    def __init__(self, name: str, letters: str):
+        self.name = name
+        self.letters = letters.upper()
+        allowed = (self.letters + self.letters.lower()).encode('ascii')
+        # translate(None, _delete) leaves only the invalid letters
+        self._delete = allowed
+        # upper case of every allowed letter, 0 for everything else
+        upper = bytearray(256)
+        for c in allowed:
+            upper[c] = ord(chr(c).upper())
+        self._upper = bytes(upper)
+
+    def __repr__(self):
+        return f'Alphabet({self.name!r}, {self.letters!r})'
+
+    def is_valid(self, seq) -> bool:
+        """
+        Whether a sequence (str or bytes) consists only of letters of this alphabet, in any case.
+        """
+
+        raw = _as_bytes(seq)
+        return raw is not None and not raw.translate(None, self._delete)
+
+    def normalize(self, seq):
+        """
+        Upper-case a sequence, raising InvalidSequenceError if it has letters outside this alphabet.
+
+        :param seq: Sequence (str or bytes).
+        :return: Upper-case sequence of the same type.
+        """
+
+        raw = _as_bytes(seq)
+        folded = raw.translate(self._upper) if raw is not None else b'\0'
+        if b'\0' in folded:
+            raise InvalidSequenceError(f'Please enter a valid {self.name} sequence ({self.letters} allowed)')
+        return folded if isinstance(seq, (bytes, bytearray, memoryview)) else folded.decode('ascii')
+
+
+def _as_bytes(seq):
+    # bytes of a str or bytes-like sequence without copying bytes, None for non-ASCII strings
+    if isinstance(seq, str):
+        try:
+            return seq.encode('ascii')
+        except UnicodeEncodeError:
+            return None
+    return seq if isinstance(seq, bytes) else bytes(seq)
+
+
+ALPHABETS = {
+    'dna': Alphabet('DNA', 'ACGT'),
+    'rna': Alphabet('RNA', 'ACGU'),
+    'nucleotide': Alphabet('DNA/RNA', 'ACGTU'),
+    'iupac': Alphabet('IUPAC nucleotide', 'ACGTURYSWKMBDHVN'),
+    'protein': Alphabet('protein', 'ACDEFGHIKLMNPQRSTVWY'),
+}
+
+
+def get_alphabet(alphabet) -> Alphabet:
+    """
+    Alphabet by name, or the given Alphabet.
+
+    :param alphabet: 'dna', 'rna', 'nucleotide' (DNA or RNA), 'iupac' (nucleotides with ambiguity codes),
+                     'protein', or an Alphabet.
+    :return: Alphabet
+    """
+
+    if isinstance(alphabet, Alphabet):
+        return alphabet
+    try:
+        return ALPHABETS[alphabet.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(f'Unknown alphabet {alphabet!r}, available: {sorted(ALPHABETS)}') from None
+
+
+def is_valid(seq, alphabet='nucleotide') -> bool:
+    """
+    Checks if a sequence consists only of letters of an alphabet (any case).
+
+    :param seq: Sequence (str or bytes).
+    :param alphabet: Alphabet or its name, see get_alphabet.
+    :return: bool
+    """
+
+    return get_alphabet(alphabet).is_valid(seq)
+
+
+def normalize(seq, alphabet='nucleotide'):
+    """
+    Validate and upper-case a sequence in one pass.
+
+    :param seq: Sequence (str or bytes).
+    :param alphabet: Alphabet or its name, see get_alphabet.
+    :return: Upper-case sequence of the same type, InvalidSequenceError for letters outside the alphabet.
+    """
+
+    return get_alphabet(alphabet).normalize(seq)
+
+
+# GC tables per alphabet: G, C and S (strong) map to S, other valid letters to W, invalid letters to 0
+_GC_TABLES = {}
+
+
+def validate_gc(seq, alphabet='nucleotide') -> tuple[bool, float]:
+    """
+    Validate a nucleic acid sequence and compute its GC content from the same translation pass.
+
+    :param seq: Sequence (str or bytes).
+    :param alphabet: Alphabet or its name, see get_alphabet.
+    :return: (whether all letters are in the alphabet, fraction of G, C and S letters).
+    """
+
+    alphabet = get_alphabet(alphabet)
+    # keyed by the letters, alphabets of the same name can differ
+    table = _GC_TABLES.get(alphabet.letters)
+    if table is None:
+        table = bytearray(256)
+        for c, upper in enumerate(alphabet._upper):
+            if upper:
+                table[c] = ord('S') if upper in b'GCS' else ord('W')
+        table = _GC_TABLES[alphabet.letters] = bytes(table)
+
+    raw = _as_bytes(seq)
+    if raw is None:
+        # non-ASCII letters are invalid but still count towards the length
+        raw = seq.encode('ascii', errors='replace')
+    classes = raw.translate(table)
+    return b'\0' not in classes, classes.count(b'S') / len(classes)
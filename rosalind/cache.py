@@ -0,0 +1,391 @@
+"""
+Opt-in content-addressed cache of expensive function results.
+
+enable() replaces the cached functions by wrappers (in every loaded rosalind module that refers to them, like
+rosalind.instrument) and disable() puts the original functions back. A call is looked up by a BLAKE2 hash
+of the function name and all its arguments (sequences are hashed by content), first in an in-process LRU tier
+and then in an optional on-disk sqlite tier, which is shared by all processes on the machine
+(WAL mode, writes in transactions) and evicts the least recently used entries above a size in bytes.
+Access times on disk have a resolution of a minute, so repeated disk hits are reads only.
+
+Calls with arguments which cannot be hashed by content (anything other than str, bytes, numbers, None,
+PackedSequence and lists/tuples/dicts of those) are passed through uncached.
+Cached results are shared, so they must not be modified by the caller.
+Together with rosalind.instrument, disable the two in the reverse order of enabling them.
+
+Included functions:
+    ResultCache:                Two-tier (memory LRU and sqlite) store of pickled results by key.
+    cache_key:                  Returns the content hash of a function call.
+    enable:                     Starts caching the results of the given functions.
+    disable:                    Stops caching and restores the original functions.
+    reset:                      Clears the hit/miss statistics.
+    cached:                     Context manager around enable() and disable().
+    stats:                      Returns hit/miss statistics per function.
+
+Example:
+    with cached('~/.cache/rosalind.sqlite', max_disk_bytes=1 << 30):
+        run_pipeline()
+    print(stats())
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .packed import PackedSequence
+from .utils import _patch_functions, _unpatch_functions
+
+DEFAULT_FUNCTIONS = ('rosalind.sequence.longest_common_substring',
+                     'rosalind.sequence.levenshtein_distance',
+                     'rosalind.sequence.translate_rna')
+
+# bump to invalidate the on-disk entries when the results of the cached functions change
+CACHE_VERSION = 1
+
+# access times of disk entries are only updated when they are older than this many seconds
+_USED_RESOLUTION = 60.0
+
+_lock = threading.Lock()
+_originals = {}  # qualified name: original function
+_stats = {}  # qualified name: _CacheStats
+_cache = None
+
+
+class _CacheStats:
+    __slots__ = ('memory_hits', 'disk_hits', 'misses', 'uncached', 'miss_seconds')
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.miss_seconds = 0.0
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _feed(h, value):
+    # add a type tag and the content of a value to the hash
+    if value is None or isinstance(value, (bool, int, float)):
+        h.update(repr((type(value).__name__, value)).encode())
+    elif isinstance(value, str):
+        data = value.encode('utf-8', errors='surrogatepass')
+        h.update(b's' + struct.pack('<Q', len(data)) + data)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        h.update(b'b' + struct.pack('<Q', len(data)) + data)
+    elif isinstance(value, PackedSequence):
+        h.update(b'p' + struct.pack('<Q?', len(value), value.is_rna) + value.data)
+    elif isinstance(value, (list, tuple)):
+        h.update(b'l' + struct.pack('<Q', len(value)))
+        for item in value:
+            _feed(h, item)
+    elif isinstance(value, dict):
+        h.update(b'd' + struct.pack('<Q', len(value)))
+        for key, item in value.items():
+            _feed(h, key)
+            _feed(h, item)
+    else:
+        raise _Uncacheable(type(value).__name__)
+
+
+def cache_key(name: str, arguments: dict) -> bytes:
+    """
+    Content hash of a function call.
+
+    :param name: Qualified function name.
+    :param arguments: Bound arguments of the call {parameter name:value} (with defaults applied).
+    :return: 32 byte BLAKE2b digest.
+    """
+
+    h = hashlib.blake2b(digest_size=32)
+    h.update(f'{CACHE_VERSION}:{name}'.encode())
+    for parameter, value in arguments.items():
+        h.update(parameter.encode() + b'=')
+        _feed(h, value)
+    return h.digest()
+
+
+class ResultCache:
+    """
+    Results by key in an in-process LRU tier and an optional sqlite tier on disk.
+
+    :param path: sqlite database file of the disk tier, None for memory only.
+    :param max_items: Number of results kept in memory.
+    :param max_disk_bytes: Size of the pickled results on disk above which the least recently used are evicted.
+    """
+
+    def __init__(self, path=None, max_items: int = 1024, max_disk_bytes: int = 1 << 30):
+        self.path = os.path.expanduser(path) if path is not None else None
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        if self.path is not None:
+            self._connect()
+
+    def _connect(self):
+        # one connection per process, sqlite connections must not be used across fork
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                               check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS results '
+                                     '(key BLOB PRIMARY KEY, value BLOB, size INTEGER, used REAL)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+            # running total of the sizes, updated in the same transactions as the results
+            self._connection.execute('CREATE TABLE IF NOT EXISTS meta (id INTEGER PRIMARY KEY, total INTEGER)')
+            self._connection.execute('INSERT OR IGNORE INTO meta SELECT 0, total(size) FROM results')
+            self._pid = os.getpid()
+        return self._connection
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: bytes):
+        """
+        Look up a result.
+
+        :param key: Key of the result.
+        :return: (tier, value) with tier 'memory' or 'disk', or (None, None) if the key is not cached.
+        """
+
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return 'memory', self._memory[key]
+            if self.path is None:
+                return None, None
+            connection = self._connect()
+            row = connection.execute('SELECT value, used FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None, None
+            # the eviction order only needs coarse access times, so most hits do not write
+            now = time.time()
+            if now - row[1] > _USED_RESOLUTION:
+                connection.execute('UPDATE results SET used = ? WHERE key = ?', (now, key))
+            value = pickle.loads(row[0])
+            self._remember(key, value)
+            return 'disk', value
+
+    def put(self, key: bytes, value):
+        """
+        Store a result in both tiers, evicting the least recently used entries on disk above max_disk_bytes.
+        """
+
+        with self._lock:
+            self._remember(key, value)
+            if self.path is None:
+                return
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                old = connection.execute('SELECT size FROM results WHERE key = ?', (key,)).fetchone()
+                connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                                   (key, data, len(data), time.time()))
+                connection.execute('UPDATE meta SET total = total + ? WHERE id = 0', (len(data) - (old[0] if old else 0),))
+                total = connection.execute('SELECT total FROM meta WHERE id = 0').fetchone()[0]
+                if total > self.max_disk_bytes:
+                    freed = self._evict(connection, total - self.max_disk_bytes)
+                    connection.execute('UPDATE meta SET total = total - ? WHERE id = 0', (freed,))
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+
+    @staticmethod
+    def _evict(connection, excess):
+        freed = 0
+        old = []
+        for key, size in connection.execute('SELECT key, size FROM results ORDER BY used'):
+            if freed >= excess:
+                break
+            old.append((key,))
+            freed += size
+        connection.executemany('DELETE FROM results WHERE key = ?', old)
+        return freed
+
+    def disk_bytes(self) -> int:
+        """
+        Size of the pickled results in the disk tier.
+        """
+
+        if self.path is None:
+            return 0
+        with self._lock:
+            return int(self._connect().execute('SELECT total FROM meta WHERE id = 0').fetchone()[0])
+
+    def clear(self):
+        """
+        Remove all results from both tiers.
+        """
+
+        with self._lock:
+            self._memory.clear()
+            if self.path is not None:
+                connection = self._connect()
+                connection.execute('BEGIN IMMEDIATE')
+                connection.execute('DELETE FROM results')
+                connection.execute('UPDATE meta SET total = 0 WHERE id = 0')
+                connection.execute('COMMIT')
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+        self._pid = None
+
+
+def _wrap(qualname, func):
+    record = _stats.setdefault(qualname, _CacheStats())
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = _cache
+        try:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = cache_key(qualname, bound.arguments)
+        except (_Uncacheable, TypeError):
+            with _lock:
+                record.uncached += 1
+            return func(*args, **kwargs)
+
+        tier, value = cache.get(key)
+        if tier is not None:
+            with _lock:
+                if tier == 'memory':
+                    record.memory_hits += 1
+                else:
+                    record.disk_hits += 1
+            return value
+
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        cache.put(key, value)
+        with _lock:
+            record.misses += 1
+            record.miss_seconds += elapsed
+        return value
+
+    # not an instrumentation wrapper, even if it wraps one (functools.wraps copies the attributes)
+    wrapper.__dict__.pop('__wrapped_by_rosalind__', None)
+    wrapper.__cached_by_rosalind__ = True
+    return wrapper
+
+
+def enable(path=None, functions=DEFAULT_FUNCTIONS, max_items: int = 1024, max_disk_bytes: int = 1 << 30):
+    """
+    Start caching the results of functions.
+
+    :param path: sqlite database file of the disk tier, shared between processes, None for memory only.
+    :param functions: Qualified names of the functions to cache.
+    :param max_items: Number of results kept in memory.
+    :param max_disk_bytes: Maximal size of the pickled results on disk.
+    """
+
+    global _cache
+    if _originals:
+        disable()
+    _cache = ResultCache(path, max_items, max_disk_bytes)
+
+    wrappers = {}
+    for qualname in functions:
+        module_name, name = qualname.rsplit('.', 1)
+        __import__(module_name)
+        func = getattr(sys.modules[module_name], name)
+        _originals[qualname] = func
+        wrappers[id(func)] = (func, _wrap(qualname, func))
+
+    # replace every reference to the functions in the loaded rosalind modules
+    _patch_functions(wrappers)
+
+
+def disable():
+    """
+    Stop caching and restore the original functions. The disk tier is kept, the statistics are kept until reset().
+    """
+
+    global _cache
+    _unpatch_functions('__cached_by_rosalind__')
+    _originals.clear()
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+
+
+def reset():
+    """
+    Clear the hit/miss statistics.
+    """
+
+    with _lock:
+        _stats.clear()
+
+
+@contextmanager
+def cached(path=None, functions=DEFAULT_FUNCTIONS, max_items: int = 1024, max_disk_bytes: int = 1 << 30):
+    """
+    Context manager: cache the results of functions within the with block.
+
+    :param path: sqlite database file of the disk tier, None for memory only.
+    :param functions: Qualified names of the functions to cache.
+    :param max_items: Number of results kept in memory.
+    :param max_disk_bytes: Maximal size of the pickled results on disk.
+    """
+
+    enable(path, functions, max_items, max_disk_bytes)
+    try:
+        yield
+    finally:
+        disable()
+
+
+def stats() -> dict:
+    """
+    Hit/miss statistics of all cached functions called at least once.
+
+    The saved time is estimated from the mean time of the computed (missed) calls.
+
+    :return: Dictionary {qualified function name:{calls, memory_hits, disk_hits, misses, uncached, hit_rate,
+             miss_seconds, saved_seconds}}.
+    """
+
+    result = {}
+    with _lock:
+        for qualname, record in _stats.items():
+            hits = record.memory_hits + record.disk_hits
+            calls = hits + record.misses + record.uncached
+            if not calls:
+                continue
+            mean = record.miss_seconds / record.misses if record.misses else 0.0
+            result[qualname] = {
+                'calls': calls,
+                'memory_hits': record.memory_hits,
+                'disk_hits': record.disk_hits,
+                'misses': record.misses,
+                'uncached': record.uncached,
+                'hit_rate': hits / calls,
+                'miss_seconds': record.miss_seconds,
+                'saved_seconds': hits * mean,
+            }
+    return result
@@ -0,0 +1,263 @@
+"""
+Command line interface: streams fasta records from files or stdin through rosalind functions to stdout.
+
+Subcommands:
+    revcomp:                    Reverse complement of every record (fasta).
+    translate:                  Protein translation of every record (fasta), optionally all six frames.
+    gc:                         GC content of every record (tab-separated).
+    motif:                      1-based positions of one or more motifs in every record (tab-separated).
+    hamming:                    Hamming distance of every record to a query sequence (tab-separated).
+    lcs:                        Longest common substring of all records.
+    kmers:                      (Canonical) k-mer counts of all records, or their spectrum (tab-separated).
+    mw:                         Protein mass of every record (tab-separated).
+    dist:                       All-vs-all distance matrix (see rosalind.pairwise).
+
+Records are read one at a time and results are written in large blocks. With --jobs, records are processed
+in batches in a process pool (see rosalind.parallel) and written in input order. Only argparse is imported
+at startup, everything else is imported when a subcommand runs, so the command starts fast in shell pipelines.
+
+Example:
+    zcat genome.fa.gz | rosalind gc - --jobs 8 > gc.tsv
+"""
+
+import argparse
+import sys
+from functools import partial
+from itertools import chain
+
+# number of result records collected before one write
+WRITE_BATCH = 256
+
+# compiled motif automata of this (worker) process
+_automata = {}
+
+
+def _wrap(seq: str, width: int) -> str:
+    return '\n'.join(seq[i:i + width] for i in range(0, len(seq), width)) if seq else ''
+
+
+def _revcomp(record, width):
+    from .alphabet import InvalidSequenceError
+    from .sequence import reverse_complement
+
+    name, seq = record
+    try:
+        # bytes raise for invalid letters instead of returning a message
+        rc = reverse_complement(seq.encode('ascii', errors='replace')).decode()
+    except InvalidSequenceError:
+        raise InvalidSequenceError(f'Record {name} is not a valid DNA/RNA sequence') from None
+    return f'>{name}\n{_wrap(rc, width)}\n'
+
+
+def _translate(record, table, six_frame, to_stop, width):
+    from . import translation
+
+    name, seq = record
+    if six_frame:
+        frames = translation.six_frame(seq, table)
+        return ''.join(f'>{name} frame={frame}\n{_wrap(protein, width)}\n' for frame, protein in frames.items())
+    return f'>{name}\n{_wrap(translation.translate(seq, table, to_stop=to_stop), width)}\n'
+
+
+def _gc(record):
+    from .alphabet import validate_gc
+
+    name, seq = record
+    if not seq:
+        return f'{name}\t0.0\n'
+    valid, content = validate_gc(seq)
+    if not valid:
+        # warnings go to stderr, stdout is the table
+        print(f'Record {name} is not a valid DNA/RNA sequence (A,T,G,C,U allowed)', file=sys.stderr)
+    return f'{name}\t{content}\n'
+
+
+def _motif(record, motifs, both_strands):
+    from .motif import MotifAutomaton
+
+    key = (motifs, both_strands)
+    if key not in _automata:
+        _automata[key] = MotifAutomaton(motifs, both_strands)
+    name, seq = record
+    hits = _automata[key].search(seq)
+    return ''.join(f'{name}\t{motif}\t{" ".join(map(str, starts))}\n' for motif, starts in hits.items())
+
+
+def _hamming(record, query):
+    from .sequence import hamming_distance
+
+    name, seq = record
+    return f'{name}\t{hamming_distance(query, seq)}\n'
+
+
+def _mw(record, average):
+    from .mass import protein_mass
+
+    name, seq = record
+    return f'{name}\t{protein_mass(seq, average)}\n'
+
+
+def _records(paths):
+    from .utils import iter_fasta
+
+    for path in paths:
+        if path == '-':
+            yield from iter_fasta(sys.stdin.buffer)
+        else:
+            yield from iter_fasta(path)
+
+
+def _write_all(results, out):
+    batch = []
+    for result in results:
+        batch.append(result)
+        if len(batch) >= WRITE_BATCH:
+            out.write(''.join(batch).encode())
+            batch = []
+    if batch:
+        out.write(''.join(batch).encode())
+
+
+def _lcs(records, show_all, min_count):
+    from .suffix import longest_common_substrings
+
+    sequences = [seq for _, seq in records]
+    substrings = longest_common_substrings(sequences, min_count)
+    if not show_all:
+        substrings = substrings[:1]
+    return [s + '\n' for s in substrings]
+
+
+def _kmers(paths, k, canonical, spectrum, min_count, jobs):
+    from .kmercount import iter_fasta_kmer_counts, kmer_spectrum
+    from .utils import iter_fasta
+
+    records = chain.from_iterable(iter_fasta(sys.stdin.buffer if path == '-' else path, as_bytes=True)
+                                  for path in paths)
+    parts = iter_fasta_kmer_counts(records, k, canonical, jobs, min_count)
+    if spectrum:
+        return (f'{multiplicity}\t{kmers}\n' for multiplicity, kmers in kmer_spectrum(parts).items())
+    return (f'{kmer}\t{count}\n' for part in parts for kmer, count in part.items())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='rosalind', description='Stream fasta records through rosalind functions.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(name, help_text):
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument('fasta', nargs='*', default=['-'], help='fasta files, - for stdin (default)')
+        command.add_argument('-j', '--jobs', '--threads', type=int, default=1, dest='jobs',
+                             help='worker processes for per-record parallelism')
+        return command
+
+    revcomp = add_command('revcomp', 'Reverse complement of every record.')
+    revcomp.add_argument('--line-width', type=int, default=60)
+
+    translate = add_command('translate', 'Protein translation of every record.')
+    translate.add_argument('--table', type=int, default=1, help='NCBI genetic code number')
+    translate.add_argument('--six-frame', action='store_true', help='translate all six reading frames')
+    translate.add_argument('--to-stop', action='store_true', help='stop at the first stop codon')
+    translate.add_argument('--line-width', type=int, default=60)
+
+    add_command('gc', 'GC content of every record.')
+
+    motif = add_command('motif', 'Positions of motifs in every record.')
+    motif.add_argument('-m', '--motif', action='append', required=True, dest='motifs', help='motif (repeatable)')
+    motif.add_argument('--both-strands', action='store_true')
+
+    hamming = add_command('hamming', 'Hamming distance of every record to a query.')
+    hamming.add_argument('--query', help='query sequence (default: the first record)')
+
+    lcs = add_command('lcs', 'Longest common substring of all records.')
+    lcs.add_argument('--all', action='store_true', dest='show_all', help='print all tied substrings')
+    lcs.add_argument('--min-count', type=int, default=None, help='shared by at least this many records')
+
+    kmers = add_command('kmers', 'k-mer counts of all records.')
+    kmers.add_argument('-k', type=int, required=True, help='k-mer length (at most 32)')
+    kmers.add_argument('--forward', action='store_false', dest='canonical',
+                       help='count k-mers as they are, not together with their reverse complement')
+    kmers.add_argument('--spectrum', action='store_true', help='print the k-mer spectrum instead of the counts')
+    kmers.add_argument('--min-count', type=int, default=1, help='only print k-mers seen at least this often')
+
+    mw = add_command('mw', 'Protein mass of every record.')
+    mw.add_argument('--average', action='store_true', help='average instead of monoisotopic residue masses')
+
+    dist = commands.add_parser('dist', help='All-vs-all distance matrix (see python -m rosalind.pairwise -h).',
+                               add_help=False)
+    dist.add_argument('args', nargs=argparse.REMAINDER)
+    return parser
+
+
+def main(argv=None, out=None):
+    """
+    Entry point of the rosalind command.
+
+    Invalid input (a ValueError, e.g. an invalid record) is reported as a one-line message on stderr.
+
+    :param argv: Command line arguments, defaults to sys.argv[1:].
+    :param out: Binary output stream, defaults to sys.stdout.buffer.
+    :return: Exit status.
+    """
+
+    args = build_parser().parse_args(argv)
+    if out is None:
+        out = sys.stdout.buffer
+    try:
+        return _run(args, out)
+    except ValueError as e:
+        out.flush()
+        print(f'rosalind: {e}', file=sys.stderr)
+        return 1
+
+
+def _run(args, out):
+    if args.command == 'dist':
+        from .pairwise import main as pairwise_main
+        out.flush()
+        return pairwise_main(args.args)
+
+    if args.command == 'kmers':
+        _write_all(_kmers(args.fasta, args.k, args.canonical, args.spectrum, args.min_count, args.jobs), out)
+        out.flush()
+        return
+
+    records = _records(args.fasta)
+
+    if args.command == 'lcs':
+        _write_all(_lcs(records, args.show_all, args.min_count), out)
+        out.flush()
+        return
+
+    if args.command == 'revcomp':
+        func = partial(_revcomp, width=args.line_width)
+    elif args.command == 'translate':
+        func = partial(_translate, table=args.table, six_frame=args.six_frame, to_stop=args.to_stop,
+                       width=args.line_width)
+    elif args.command == 'gc':
+        func = _gc
+    elif args.command == 'motif':
+        func = partial(_motif, motifs=tuple(args.motifs), both_strands=args.both_strands)
+    elif args.command == 'hamming':
+        query = args.query
+        if query is None:
+            first = next(records, None)
+            if first is None:
+                return
+            query = first[1]
+            records = chain([first], records)
+        func = partial(_hamming, query=query)
+    else:
+        func = partial(_mw, average=args.average)
+
+    if args.jobs > 1:
+        from .parallel import parallel_map
+        results = parallel_map(func, records, args.jobs)
+    else:
+        results = map(func, records)
+    _write_all(results, out)
+    out.flush()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Transparent reading of gzip and BGZF compressed files.
+
+open_compressed detects the compression from the first bytes of a file, so the fasta readers accept .fa.gz files
+(and compressed stdin) without decompressing them to disk first.
+
+BGZF (blocked gzip, as written by bgzip and used for indexed references) is a series of independent gzip blocks
+of at most 64 KiB. The blocks are read sequentially, decompressed in a thread pool (zlib releases the GIL),
+and reassembled in order, with a bounded number of batches in flight.
+Other gzip files are decompressed in a single stream with large reads.
+
+Included functions:
+    open_compressed:            Opens a file or binary stream for reading, decompressing gzip and BGZF transparently.
+    BgzfReader:                 Raw reader of a BGZF stream with multithreaded block decompression.
+    GzipReader:                 Raw reader of a (multi-member) gzip stream with large buffered reads.
+    write_bgzf:                 Compresses data into BGZF blocks.
+
+Example:
+    with open_compressed('genome.fa.gz', threads=8) as f:
+        for name, seq in iter_fasta(f):
+            ...
+"""
+
+import io
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from gzip import BadGzipFile
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# bytes read from the compressed file at once in the plain gzip path
+_GZIP_READ_SIZE = 1 << 22
+
+# bytes of decompressed data buffered for the consumer
+_BUFFER_SIZE = 1 << 20
+
+# BGZF blocks decompressed by one thread pool task
+_BLOCKS_PER_TASK = 16
+
+# uncompressed bytes per BGZF block written by write_bgzf (as bgzip does)
+_BGZF_BLOCK_SIZE = 0xff00
+
+# the empty block marking the end of a BGZF file
+_BGZF_EOF = bytes.fromhex('1f8b08040000000000ff0600424302001b0003000000000000000000')
+
+
+def is_bgzf(header: bytes) -> bool:
+    """
+    Whether the first bytes of a file are a BGZF block header (gzip with a BC extra subfield).
+
+    :param header: At least the first 16 bytes of the file.
+    :return: bool
+    """
+
+    return (len(header) >= 16 and header.startswith(_GZIP_MAGIC) and header[3] & 4 == 4
+            and header[12:14] == b'BC' and header[14:16] == b'\x02\x00')
+
+
+def _inflate_blocks(blocks):
+    # decompress and check a batch of (compressed data, crc, size) BGZF blocks, runs in a worker thread
+    parts = []
+    for cdata, crc, size in blocks:
+        try:
+            data = zlib.decompress(cdata, -15)
+        except zlib.error as e:
+            raise BadGzipFile(f'Corrupt BGZF block ({e})') from None
+        if len(data) != size or zlib.crc32(data) != crc:
+            raise BadGzipFile('Corrupt BGZF block (CRC or size mismatch)')
+        parts.append(data)
+    return b''.join(parts)
+
+
+class BgzfReader(io.RawIOBase):
+    """
+    Read-only raw stream of the decompressed content of a BGZF file.
+
+    :param fileobj: Binary file object positioned at the start of a BGZF block.
+    :param threads: Number of decompression threads, defaults to the number of CPUs.
+    :param blocks_per_task: Number of blocks decompressed by one task.
+    :param close_fileobj: Close fileobj when this stream is closed.
+    """
+
+    def __init__(self, fileobj, threads: int = None, blocks_per_task: int = _BLOCKS_PER_TASK,
+                 close_fileobj: bool = False):
+        super().__init__()
+        self._fileobj = fileobj
+        self._threads = threads or os.cpu_count() or 1
+        self._blocks_per_task = blocks_per_task
+        self._close_fileobj = close_fileobj
+        self._chunks = self._decompressed()
+        self._buffer = b''
+        self._offset = 0
+
+    def readable(self):
+        return True
+
+    def _read_block(self):
+        # (compressed data, crc, uncompressed size) of the next block, None at the end of the file
+        header = self._fileobj.read(12)
+        if not header:
+            return None
+        if len(header) < 12 or not header.startswith(_GZIP_MAGIC) or not header[3] & 4:
+            raise BadGzipFile('Not a BGZF block')
+        xlen = struct.unpack('<H', header[10:12])[0]
+        extra = self._fileobj.read(xlen)
+        bsize = None
+        pos = 0
+        while pos + 4 <= len(extra):
+            slen = struct.unpack('<H', extra[pos + 2:pos + 4])[0]
+            if extra[pos:pos + 2] == b'BC' and slen == 2:
+                bsize = struct.unpack('<H', extra[pos + 4:pos + 6])[0]
+            pos += 4 + slen
+        if bsize is None:
+            raise BadGzipFile('Gzip member without a BGZF block size')
+        rest = self._fileobj.read(bsize + 1 - 12 - xlen)
+        if len(rest) != bsize + 1 - 12 - xlen:
+            raise BadGzipFile('Truncated BGZF block')
+        crc, size = struct.unpack('<II', rest[-8:])
+        return rest[:-8], crc, size
+
+    def _decompressed(self):
+        # decompressed batches of blocks in file order
+        max_in_flight = 2 * self._threads
+        with ThreadPoolExecutor(max_workers=self._threads) as pool:
+            pending = deque()
+            while True:
+                batch = []
+                while len(batch) < self._blocks_per_task:
+                    block = self._read_block()
+                    if block is None:
+                        break
+                    batch.append(block)
+                if batch:
+                    pending.append(pool.submit(_inflate_blocks, batch))
+                # wait for the oldest batch once the window is full or the file is exhausted
+                while pending and (len(pending) >= max_in_flight or not batch):
+                    yield pending.popleft().result()
+                if not batch:
+                    break
+
+    def readinto(self, b):
+        while self._offset >= len(self._buffer):
+            self._buffer = next(self._chunks, None)
+            self._offset = 0
+            if self._buffer is None:
+                self._buffer = b''
+                return 0
+        n = min(len(b), len(self._buffer) - self._offset)
+        b[:n] = self._buffer[self._offset:self._offset + n]
+        self._offset += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._chunks.close()
+            if self._close_fileobj:
+                self._fileobj.close()
+        super().close()
+
+
+class GzipReader(io.RawIOBase):
+    """
+    Read-only raw stream of the decompressed content of a gzip file (one or more members),
+    reading the compressed file in large blocks.
+
+    :param fileobj: Binary file object positioned at the start of a gzip member.
+    :param read_size: Number of compressed bytes read at once.
+    :param close_fileobj: Close fileobj when this stream is closed.
+    """
+
+    def __init__(self, fileobj, read_size: int = _GZIP_READ_SIZE, close_fileobj: bool = False):
+        super().__init__()
+        self._fileobj = fileobj
+        self._read_size = read_size
+        self._close_fileobj = close_fileobj
+        self._decompressor = zlib.decompressobj(31)
+        self._buffer = b''
+        self._offset = 0
+
+    def readable(self):
+        return True
+
+    def _fill(self):
+        # decompress the next piece of the file, returns False at the end of the file
+        while True:
+            decompressor = self._decompressor
+            if decompressor.eof:
+                # next member, starting with the bytes after the end of the previous one
+                data = decompressor.unused_data or self._fileobj.read(self._read_size)
+                if not data:
+                    return False
+                decompressor = self._decompressor = zlib.decompressobj(31)
+            else:
+                data = decompressor.unconsumed_tail or self._fileobj.read(self._read_size)
+                if not data:
+                    raise BadGzipFile('Compressed file ended before the end-of-stream marker was reached')
+            self._buffer = decompressor.decompress(data, _BUFFER_SIZE)
+            self._offset = 0
+            if self._buffer:
+                return True
+
+    def readinto(self, b):
+        if self._offset >= len(self._buffer) and not self._fill():
+            return 0
+        n = min(len(b), len(self._buffer) - self._offset)
+        b[:n] = self._buffer[self._offset:self._offset + n]
+        self._offset += n
+        return n
+
+    def close(self):
+        if not self.closed and self._close_fileobj:
+            self._fileobj.close()
+        super().close()
+
+
+def open_compressed(source, threads: int = None):
+    """
+    Open a file or binary stream for reading, decompressing it if it is gzip or BGZF compressed.
+
+    The compression is detected from the content, not the file name.
+
+    :param source: Path to a file or a binary file object (e.g. sys.stdin.buffer).
+    :param threads: Number of BGZF decompression threads, defaults to the number of CPUs.
+    :return: Binary file object. Closing it closes the file if it was opened here.
+    """
+
+    if hasattr(source, 'read'):
+        f = source if hasattr(source, 'peek') else io.BufferedReader(source)
+        close = False
+    else:
+        f = open(source, 'rb', buffering=_BUFFER_SIZE)
+        close = True
+    header = f.peek(16)[:16]
+    if is_bgzf(header):
+        raw = BgzfReader(f, threads, close_fileobj=close)
+    elif header.startswith(_GZIP_MAGIC):
+        raw = GzipReader(f, close_fileobj=close)
+    else:
+        return f
+    return io.BufferedReader(raw, _BUFFER_SIZE)
+
+
+def write_bgzf(data: bytes, out):
+    """
+    Compress data into BGZF blocks, readable by bgzip, samtools and any gzip reader.
+
+    :param data: Uncompressed bytes.
+    :param out: Path or binary file object to write to.
+    """
+
+    if not hasattr(out, 'write'):
+        with open(out, 'wb') as f:
+            return write_bgzf(data, f)
+
+    for start in range(0, len(data), _BGZF_BLOCK_SIZE):
+        block = data[start:start + _BGZF_BLOCK_SIZE]
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        cdata = compressor.compress(block) + compressor.flush()
+        # header with the BC subfield holding the total block size - 1
+        out.write(struct.pack('<4BI2BH2BHH', 0x1f, 0x8b, 8, 4, 0, 0, 0xff, 6, 66, 67, 2, len(cdata) + 25))
+        out.write(cdata)
+        out.write(struct.pack('<II', zlib.crc32(block), len(block)))
+    out.write(_BGZF_EOF)
@@ -0,0 +1,251 @@
+"""
+Indexed random access to sequences in (large) fasta files.
+
+The index is a tab-separated sidecar file (by default <fasta>.fai) in the samtools faidx layout with one line
+per record: name, length, byte offset of the first base, bases per line and bytes per line.
+Unlike samtools, the name is the full header line, not just its first word.
+The fasta file itself is memory-mapped, so fetching a record or a small window of it
+reads only the bytes of that window.
+
+Included functions:
+    build_index:                Scans a fasta file and writes its .fai index.
+    read_index:                 Reads a .fai index into a dictionary like so: {name:FaidxEntry}.
+    IndexedFasta:               Memory-mapped fasta reader, fa["chr1"][1_000_000:1_001_000] returns a string.
+
+Example:
+    with IndexedFasta('genome.fa') as fa:
+        window = fa['chr1'][1_000_000:1_001_000]
+"""
+
+import mmap
+import os
+from collections import namedtuple
+
+FaidxEntry = namedtuple('FaidxEntry', ['name', 'length', 'offset', 'line_bases', 'line_width'])
+
+
+def build_index(fasta_path, index_path=None) -> dict:
+    """
+    Build a faidx-style index of a fasta file and write it next to the file.
+
+    All sequence lines of a record except the last one must have the same length,
+    otherwise the byte position of a base cannot be computed and a ValueError is raised.
+    Compressed files are rejected with a ValueError as well.
+    Record names are the full header lines (without >), same as the keys of read_multifasta. Note that samtools
+    uses only the first word of the header, so indexes of files with descriptions in the headers differ.
+    Duplicate record names raise a ValueError.
+
+    :param fasta_path: Path to the fasta file.
+    :param index_path: Where to write the index, defaults to fasta_path + '.fai'.
+    :return: Dictionary {name[str]:FaidxEntry}
+    """
+
+    if index_path is None:
+        index_path = str(fasta_path) + '.fai'
+
+    entries = {}
+    name = None
+
+    def add_entry():
+        if name in entries:
+            raise ValueError(f'Duplicate record name {name!r} in {fasta_path}')
+        entries[name] = FaidxEntry(name, length, offset, line_bases or 0, line_width or 0)
+
+    with open(fasta_path, 'rb') as f:
+        if f.peek(2)[:2] == b'\x1f\x8b':
+            raise ValueError(f'{fasta_path} is compressed, random access needs an uncompressed fasta file')
+        pos = 0
+        for line in f:
+            line_start = pos
+            pos += len(line)
+            if line.startswith(b'>'):
+                if name is not None:
+                    add_entry()
+                name = line[1:].strip().decode()
+                offset = pos
+                length = 0
+                line_bases = line_width = None
+                last_short = False
+                continue
+            bases = len(line.rstrip(b'\r\n'))
+            if name is None:
+                if bases:
+                    raise ValueError(f'Sequence before the first header at byte {line_start}')
+                continue
+            if bases == 0:
+                last_short = True
+                continue
+            if last_short:
+                raise ValueError(f'Inconsistent line length in record {name} at byte {line_start}')
+            if line_bases is None:
+                line_bases, line_width = bases, len(line)
+            elif bases > line_bases or (bases == line_bases and line.endswith(b'\n') and len(line) != line_width):
+                raise ValueError(f'Inconsistent line length in record {name} at byte {line_start}')
+            # only the last line of a record may be shorter
+            if bases < line_bases:
+                last_short = True
+            length += bases
+        if name is not None:
+            add_entry()
+
+    with open(index_path, 'w') as out:
+        for e in entries.values():
+            out.write(f'{e.name}\t{e.length}\t{e.offset}\t{e.line_bases}\t{e.line_width}\n')
+
+    return entries
+
+
+def read_index(index_path) -> dict:
+    """
+    Read a faidx-style index written by build_index (or samtools faidx).
+
+    :param index_path: Path to the .fai file.
+    :return: Dictionary {name[str]:FaidxEntry}
+    """
+
+    entries = {}
+    with open(index_path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            name, length, offset, line_bases, line_width = line.rstrip('\r\n').split('\t')[:5]
+            entries[name] = FaidxEntry(name, int(length), int(offset), int(line_bases), int(line_width))
+    return entries
+
+
+class FastaRecord:
+    """
+    A lazy view on one record of an IndexedFasta. Slicing returns the bases as a string.
+    """
+
+    __slots__ = ('_fasta', 'entry')
+
+    def __init__(self, fasta, entry):
+        self._fasta = fasta
+        self.entry = entry
+
+    @property
+    def name(self) -> str:
+        return self.entry.name
+
+    def __len__(self):
+        return self.entry.length
+
+    def __getitem__(self, item) -> str:
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self.entry.length)
+            if step == 1:
+                return self._fasta.fetch(self.entry.name, start, stop)
+            if step > 0:
+                return self._fasta.fetch(self.entry.name, start, max(start, stop))[::step]
+            # negative step: fetch the covered range once and slice it in memory
+            lo = stop + 1
+            return self._fasta.fetch(self.entry.name, lo, max(lo, start + 1))[::step]
+        if item < 0:
+            item += self.entry.length
+        if not 0 <= item < self.entry.length:
+            raise IndexError('sequence index out of range')
+        return self._fasta.fetch(self.entry.name, item, item + 1)
+
+    def __str__(self):
+        return self._fasta.fetch(self.entry.name)
+
+    def iter_chunks(self, size: int = 1 << 20):
+        """
+        Yield the sequence in pieces of size bases, so it never has to be held in memory at once.
+
+        :param size: Number of bases per piece.
+        :return: Generator of strings.
+        """
+
+        for start in range(0, self.entry.length, size):
+            yield self._fasta.fetch(self.entry.name, start, start + size)
+
+    def __repr__(self):
+        return f'FastaRecord({self.entry.name!r}, length={self.entry.length})'
+
+
+class IndexedFasta:
+    """
+    Random access to the records of a fasta file through a memory map and a faidx-style index.
+
+    The index is read from index_path (default <fasta>.fai) and built with build_index if it does not exist
+    or is stale (the fasta file was modified after the index, or is too short for the indexed records).
+
+    :param fasta_path: Path to the fasta file.
+    :param index_path: Path to the index, defaults to fasta_path + '.fai'.
+    """
+
+    def __init__(self, fasta_path, index_path=None):
+        self.fasta_path = fasta_path
+        if index_path is None:
+            index_path = str(fasta_path) + '.fai'
+        self.index = None
+        if os.path.exists(index_path) and os.stat(index_path).st_mtime_ns >= os.stat(fasta_path).st_mtime_ns:
+            self.index = read_index(index_path)
+            size = os.path.getsize(fasta_path)
+            if any(entry.length and self._byte_offset(entry, entry.length - 1) >= size
+                   for entry in self.index.values()):
+                self.index = None
+        if self.index is None:
+            self.index = build_index(fasta_path, index_path)
+
+        self._file = open(fasta_path, 'rb')
+        # mmap cannot map an empty file
+        if os.fstat(self._file.fileno()).st_size:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mm = b''
+
+    def _byte_offset(self, entry, pos):
+        # byte position of 0-based base pos of a record
+        if entry.line_bases == 0:
+            return entry.offset
+        return entry.offset + (pos // entry.line_bases) * entry.line_width + pos % entry.line_bases
+
+    def fetch(self, name: str, start: int = 0, end: int = None, as_bytes: bool = False):
+        """
+        Return bases [start, end) (0-based, end exclusive) of a record.
+
+        :param name: Record name.
+        :param start: First base, 0-based.
+        :param end: End position (exclusive), defaults to the end of the record.
+        :param as_bytes: Return bytes instead of str.
+        :return: The sequence as a string.
+        """
+
+        entry = self.index[name]
+        if end is None or end > entry.length:
+            end = entry.length
+        start = max(start, 0)
+        if start >= end:
+            return b'' if as_bytes else ''
+        raw = self._mm[self._byte_offset(entry, start):self._byte_offset(entry, end - 1) + 1]
+        seq = raw.translate(None, b'\r\n')
+        return seq if as_bytes else seq.decode()
+
+    def __getitem__(self, name: str) -> FastaRecord:
+        return FastaRecord(self, self.index[name])
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def keys(self):
+        return self.index.keys()
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
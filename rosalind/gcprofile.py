@@ -0,0 +1,188 @@
+"""
+GC content and GC skew profiles along a sequence.
+
+Cumulative G and C counts are built once, in a single pass over the sequence or over chunks of it.
+Afterwards the GC content or GC skew of any interval, and of every window of a sliding-window track,
+is answered in O(1) from two differences of the prefix sums.
+
+The prefix sums are 32-bit (switching to 64-bit only for sequences of more than 4 Gb), so a profile takes
+8 bytes per base. With resolution > 1 only every resolution-th prefix sum is kept, which makes the profile of
+a chromosome small (resolution=100 takes 250 MB for a human genome instead of 25 GB), and intervals have to
+start and end at multiples of the resolution.
+
+Included functions:
+    GCProfile:                  Prefix sums of G and C counts with interval and sliding-window queries.
+
+Example:
+    with IndexedFasta('genome.fa') as fa:
+        profile = GCProfile.from_chunks(fa['chr1'].iter_chunks(1 << 20), resolution=100)
+    track = profile.gc_windows(1000, step=500)
+"""
+
+from array import array
+from itertools import accumulate
+
+_G_TABLE = bytes(1 if b in b'Gg' else 0 for b in range(256))
+_C_TABLE = bytes(1 if b in b'Cc' else 0 for b in range(256))
+
+# prefix sums fit into 32-bit counts up to this sequence length
+_MAX_SHORT_LENGTH = (1 << 8 * array('I').itemsize) - 1
+
+
+class GCProfile:
+    """
+    Cumulative G and C counts of a DNA/RNA sequence.
+
+    :param seq: The sequence (str or bytes). Use GCProfile.from_chunks for sequences given in pieces.
+    :param resolution: Keep the prefix sums only every resolution bases (8 bytes per kept position).
+    """
+
+    __slots__ = ('resolution', 'length', '_g', '_c', '_rest')
+
+    def __init__(self, seq='', resolution: int = 1):
+        if resolution < 1:
+            raise ValueError('resolution must be a positive integer')
+        self.resolution = resolution
+        self.length = 0
+        self._g = array('I', [0])
+        self._c = array('I', [0])
+        # bases of an unfinished block (resolution > 1)
+        self._rest = b''
+        self.update(seq)
+
+    @classmethod
+    def from_chunks(cls, chunks, resolution: int = 1) -> 'GCProfile':
+        """
+        Build a profile from an iterable of str or bytes pieces of one sequence.
+
+        :param chunks: Iterable of sequence pieces.
+        :param resolution: Keep the prefix sums only every resolution bases.
+        :return: GCProfile of the concatenated sequence.
+        """
+
+        profile = cls(resolution=resolution)
+        for chunk in chunks:
+            profile.update(chunk)
+        return profile
+
+    def update(self, chunk):
+        """
+        Append the next piece of the sequence to the profile.
+
+        :param chunk: str or bytes.
+        """
+
+        if isinstance(chunk, str):
+            chunk = chunk.encode('ascii', errors='replace')
+        if not chunk:
+            return
+        self.length += len(chunk)
+        if self.length > _MAX_SHORT_LENGTH and self._g.typecode == 'I':
+            self._g = array('Q', self._g)
+            self._c = array('Q', self._c)
+
+        if self.resolution == 1:
+            self._g.extend(accumulate(chunk.translate(_G_TABLE), initial=self._g[-1]))
+            self._c.extend(accumulate(chunk.translate(_C_TABLE), initial=self._c[-1]))
+            # accumulate repeats the initial value
+            del self._g[-len(chunk) - 1]
+            del self._c[-len(chunk) - 1]
+            return
+
+        # whole blocks only, the rest waits for the next chunk
+        r = self.resolution
+        data = self._rest + chunk
+        whole = len(data) - len(data) % r
+        self._rest = data[whole:]
+        g, c = self._g[-1], self._c[-1]
+        g_counts = []
+        c_counts = []
+        for i in range(0, whole, r):
+            block = data[i:i + r]
+            g += block.count(b'G') + block.count(b'g')
+            c += block.count(b'C') + block.count(b'c')
+            g_counts.append(g)
+            c_counts.append(c)
+        self._g.extend(g_counts)
+        self._c.extend(c_counts)
+
+    def _counts(self, start, end):
+        # G and C counts of [start, end)
+        r = self.resolution
+        if start % r or (end % r and end != self.length):
+            raise ValueError(f'Interval bounds must be multiples of the resolution ({r})')
+        if not 0 <= start <= end <= self.length:
+            raise ValueError(f'Interval [{start}, {end}) is outside of the sequence of length {self.length}')
+        if end % r:
+            # the sequence end inside an unfinished block
+            tail = self._rest
+            i = end // r
+            return (self._g[i] - self._g[start // r] + tail.count(b'G') + tail.count(b'g'),
+                    self._c[i] - self._c[start // r] + tail.count(b'C') + tail.count(b'c'))
+        return self._g[end // r] - self._g[start // r], self._c[end // r] - self._c[start // r]
+
+    def gc(self, start: int = 0, end: int = None) -> float:
+        """
+        GC fraction of the interval [start, end) (0-based), same as gc(seq[start:end]).
+
+        :param start: Start of the interval.
+        :param end: End of the interval (exclusive), defaults to the sequence end.
+        :return: A float representing %GC. Raises ValueError for an empty interval.
+        """
+
+        if end is None:
+            end = self.length
+        g, c = self._counts(start, end)
+        if start == end:
+            raise ValueError(f'The GC content of the empty interval [{start}, {end}) is undefined')
+        return (g + c) / (end - start)
+
+    def skew(self, start: int = 0, end: int = None) -> float:
+        """
+        GC skew (G - C) / (G + C) of the interval [start, end), 0.0 if it has no G or C.
+
+        :param start: Start of the interval.
+        :param end: End of the interval (exclusive), defaults to the sequence end.
+        :return: GC skew between -1 and 1.
+        """
+
+        if end is None:
+            end = self.length
+        g, c = self._counts(start, end)
+        return (g - c) / (g + c) if g + c else 0.0
+
+    def _windows(self, size, step, value):
+        if step is None:
+            step = size
+        r = self.resolution
+        if size < 1 or step < 1 or size % r or step % r:
+            raise ValueError(f'Window size and step must be positive multiples of the resolution ({r})')
+        g, c = self._g, self._c
+        out = array('d')
+        # in units of the prefix sum arrays
+        size, step = size // r, step // r
+        for i in range(0, self.length // r - size + 1, step):
+            out.append(value(g[i + size] - g[i], c[i + size] - c[i], size * r))
+        return out
+
+    def gc_windows(self, size: int, step: int = None) -> array:
+        """
+        GC fraction of every window [i * step, i * step + size) that lies within the sequence.
+
+        :param size: Window size.
+        :param step: Distance between window starts, defaults to size (non-overlapping windows).
+        :return: array('d') with one value per window.
+        """
+
+        return self._windows(size, step, lambda g, c, n: (g + c) / n)
+
+    def skew_windows(self, size: int, step: int = None) -> array:
+        """
+        GC skew (G - C) / (G + C) of every window [i * step, i * step + size) that lies within the sequence.
+
+        :param size: Window size.
+        :param step: Distance between window starts, defaults to size (non-overlapping windows).
+        :return: array('d') with one value per window.
+        """
+
+        return self._windows(size, step, lambda g, c, n: (g - c) / (g + c) if g + c else 0.0)
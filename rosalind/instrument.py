@@ -0,0 +1,283 @@
+"""
+Opt-in instrumentation of the public functions of rosalind.sequence and rosalind.utils.
+
+enable() replaces the public functions by timing wrappers (in every loaded rosalind module that refers to them)
+and disable() puts the original functions back, so there is no cost at all while instrumentation is off.
+Note that references taken before enable(), like a 'from rosalind.sequence import gc' in another package,
+keep pointing to the original functions.
+
+For every function the number of calls, total and percentile latencies and the processed input size
+(bases per second) are recorded. Selected functions can additionally be sampled with cProfile.
+
+Included functions:
+    enable:                     Starts recording calls of the public functions.
+    disable:                    Stops recording and restores the original functions.
+    reset:                      Clears all recorded statistics.
+    instrumented:               Context manager around enable() and disable().
+    stats:                      Returns the recorded statistics as a dictionary.
+    to_json:                    Returns (or writes) the statistics as JSON.
+    to_prometheus:              Returns the statistics in the Prometheus text exposition format.
+    profile_stats:              Returns the cProfile statistics collected for a sampled function.
+
+Example:
+    with instrumented():
+        run_pipeline()
+    print(to_prometheus())
+"""
+
+import cProfile
+import functools
+import inspect
+import json
+import pstats
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from .packed import PackedSequence
+from .utils import _patch_functions, _unpatch_functions
+
+MODULES = ('rosalind.sequence', 'rosalind.utils')
+
+# latencies kept per function for the percentiles (reservoir sample)
+MAX_SAMPLES = 10_000
+
+_lock = threading.Lock()
+_originals = {}  # qualified name: original function
+_stats = {}  # qualified name: _FunctionStats
+_profiles = {}  # qualified name: cProfile.Profile
+_profiling_active = threading.local()
+
+
+class _FunctionStats:
+    __slots__ = ('calls', 'seconds', 'bases', 'max_seconds', 'samples')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.bases = 0
+        self.max_seconds = 0.0
+        self.samples = []
+
+    def add(self, seconds, bases):
+        self.calls += 1
+        self.seconds += seconds
+        self.bases += bases
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(seconds)
+        else:
+            i = random.randrange(self.calls)
+            if i < MAX_SAMPLES:
+                self.samples[i] = seconds
+
+
+def _input_size(args) -> int:
+    # number of bases (or residues) in the sequence arguments of a call
+    size = 0
+    for arg in args:
+        if isinstance(arg, (str, bytes, bytearray, PackedSequence)):
+            size += len(arg)
+        elif isinstance(arg, (list, tuple)):
+            size += sum(len(a) for a in arg if isinstance(a, (str, bytes, PackedSequence)))
+        elif isinstance(arg, dict):
+            size += sum(len(a) for a in arg.values() if isinstance(a, (str, bytes, PackedSequence)))
+    return size
+
+
+def _public_functions(module):
+    # functions defined in the module itself and not starting with an underscore (generators are not timed)
+    for name, obj in vars(module).items():
+        if not name.startswith('_') and inspect.isfunction(obj) and obj.__module__ == module.__name__ \
+                and not inspect.isgeneratorfunction(obj):
+            yield name, obj
+
+
+def _wrap(qualname, func, sample_every):
+    record = _stats.setdefault(qualname, _FunctionStats())
+    counter = [0]
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = None
+        if sample_every:
+            with _lock:
+                counter[0] += 1
+                sampled = counter[0] % sample_every == 0
+            if sampled and not getattr(_profiling_active, 'on', False):
+                profile = _profiles.setdefault(qualname, cProfile.Profile())
+        start = time.perf_counter()
+        try:
+            if profile is None:
+                return func(*args, **kwargs)
+            _profiling_active.on = True
+            try:
+                return profile.runcall(func, *args, **kwargs)
+            finally:
+                _profiling_active.on = False
+        finally:
+            elapsed = time.perf_counter() - start
+            with _lock:
+                record.add(elapsed, _input_size(args))
+
+    wrapper.__wrapped_by_rosalind__ = True
+    return wrapper
+
+
+def enable(cprofile=(), sample_rate: float = 1.0):
+    """
+    Start recording the calls of all public functions of rosalind.sequence and rosalind.utils.
+
+    :param cprofile: Name or names of functions (e.g. 'levenshtein_distance') to also run under cProfile.
+    :param sample_rate: Fraction of the calls of these functions that are profiled.
+    """
+
+    if _originals:
+        disable()
+    if not 0 < sample_rate <= 1:
+        raise ValueError('sample_rate must be in (0, 1]')
+    sample_every = round(1 / sample_rate)
+    # a single name, not its substrings
+    cprofile = {cprofile} if isinstance(cprofile, str) else set(cprofile)
+
+    import rosalind.sequence
+    import rosalind.utils
+
+    wrappers = {}
+    for module_name in MODULES:
+        module = sys.modules[module_name]
+        for name, func in _public_functions(module):
+            qualname = f'{module_name}.{name}'
+            _originals[qualname] = func
+            wrappers[id(func)] = (func, _wrap(qualname, func, sample_every if name in cprofile else 0))
+
+    # replace every reference to the functions in the loaded rosalind modules
+    _patch_functions(wrappers)
+
+
+def disable():
+    """
+    Stop recording and restore the original functions. The statistics are kept until reset().
+    """
+
+    _unpatch_functions('__wrapped_by_rosalind__')
+    _originals.clear()
+
+
+def reset():
+    """
+    Clear all recorded statistics and cProfile samples.
+    """
+
+    with _lock:
+        _stats.clear()
+        _profiles.clear()
+
+
+@contextmanager
+def instrumented(cprofile=(), sample_rate: float = 1.0, reset_stats: bool = True):
+    """
+    Context manager: record calls within the with block.
+
+    :param cprofile: Name or names of functions to also run under cProfile.
+    :param sample_rate: Fraction of the calls of these functions that are profiled.
+    :param reset_stats: Clear earlier statistics first.
+    """
+
+    if reset_stats:
+        reset()
+    enable(cprofile, sample_rate)
+    try:
+        yield
+    finally:
+        disable()
+
+
+def _percentile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(q * len(sorted_samples)))]
+
+
+def stats() -> dict:
+    """
+    Statistics of all functions called at least once.
+
+    :return: Dictionary {qualified function name:{calls, total_seconds, mean_seconds, p50_seconds, p90_seconds,
+             p99_seconds, max_seconds, bases, bases_per_second}}.
+    """
+
+    result = {}
+    with _lock:
+        for qualname, record in _stats.items():
+            if not record.calls:
+                continue
+            samples = sorted(record.samples)
+            result[qualname] = {
+                'calls': record.calls,
+                'total_seconds': record.seconds,
+                'mean_seconds': record.seconds / record.calls,
+                'p50_seconds': _percentile(samples, 0.5),
+                'p90_seconds': _percentile(samples, 0.9),
+                'p99_seconds': _percentile(samples, 0.99),
+                'max_seconds': record.max_seconds,
+                'bases': record.bases,
+                'bases_per_second': record.bases / record.seconds if record.seconds else 0.0,
+            }
+    return result
+
+
+def to_json(path=None) -> str:
+    """
+    Statistics as JSON.
+
+    :param path: Optional file to write the JSON to.
+    :return: The JSON string.
+    """
+
+    text = json.dumps(stats(), indent=2)
+    if path is not None:
+        with open(path, 'w') as f:
+            f.write(text)
+    return text
+
+
+def to_prometheus(prefix: str = 'rosalind') -> str:
+    """
+    Statistics in the Prometheus text exposition format (counters and a latency summary per function).
+
+    :param prefix: Prefix of the metric names.
+    :return: The metrics as text.
+    """
+
+    current = stats()
+    lines = [f'# HELP {prefix}_calls_total Number of calls.', f'# TYPE {prefix}_calls_total counter']
+    lines += [f'{prefix}_calls_total{{function="{name}"}} {s["calls"]}' for name, s in current.items()]
+    lines += [f'# HELP {prefix}_bases_total Number of bases in the sequence arguments.',
+              f'# TYPE {prefix}_bases_total counter']
+    lines += [f'{prefix}_bases_total{{function="{name}"}} {s["bases"]}' for name, s in current.items()]
+    lines += [f'# HELP {prefix}_latency_seconds Call latency.', f'# TYPE {prefix}_latency_seconds summary']
+    for name, s in current.items():
+        for q in ('0.5', '0.9', '0.99'):
+            key = 'p' + q[2:].ljust(2, '0') + '_seconds'
+            lines.append(f'{prefix}_latency_seconds{{function="{name}",quantile="{q}"}} {s[key]}')
+        lines.append(f'{prefix}_latency_seconds_sum{{function="{name}"}} {s["total_seconds"]}')
+        lines.append(f'{prefix}_latency_seconds_count{{function="{name}"}} {s["calls"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def profile_stats(name: str) -> pstats.Stats:
+    """
+    cProfile statistics collected for a function given in enable(cprofile=...).
+
+    :param name: Function name, e.g. 'levenshtein_distance' or 'rosalind.sequence.levenshtein_distance'.
+    :return: pstats.Stats of all sampled calls.
+    """
+
+    for qualname, profile in _profiles.items():
+        if qualname == name or qualname.rsplit('.', 1)[-1] == name:
+            return pstats.Stats(profile)
+    raise KeyError(f'No cProfile samples for {name!r}')
@@ -0,0 +1,123 @@
+"""
+2-bit encoding of k-mers.
+
+A k-mer of A,C,G,T (case-insensitive) is encoded as an integer with two bits per base (A=0, C=1, G=2, T=3),
+the first base in the highest bits, so sorting the codes sorts the k-mers alphabetically.
+
+Included functions:
+    encode_kmer:                Returns the 2-bit integer code of a k-mer.
+    decode_kmer:                Returns the k-mer of a 2-bit integer code.
+    reverse_complement_kmer:    Returns the code of the reverse complement of a k-mer code.
+    canonical_kmer:             Returns the smaller of a k-mer code and its reverse complement code.
+    iter_kmers:                 Yields (position, code) of all (canonical) k-mers of a sequence with a rolling encoding.
+"""
+
+# base code of every byte, 4 for bytes which are not A,C,G,T (the base encoding of all rosalind modules)
+_CODES = bytearray(b'\x04' * 256)
+for _code, _bases in enumerate(('Aa', 'Cc', 'Gg', 'Tt')):
+    for _base in _bases:
+        _CODES[ord(_base)] = _code
+_CODES = bytes(_CODES)
+# the same with U encoded like T
+_RNA_CODES = bytes(3 if chr(b) in 'Uu' else c for b, c in enumerate(_CODES))
+
+
+def _ascii_bytes(seq) -> bytes:
+    # one byte per letter of a str or bytes-like sequence, non-ASCII letters become '?'
+    if isinstance(seq, str):
+        return seq.encode('ascii', errors='replace')
+    return bytes(seq)
+
+
+def _encode_bases(seq, rna: bool = False) -> bytes:
+    # base codes of a str or bytes sequence, with rna=True U is encoded like T
+    return _ascii_bytes(seq).translate(_RNA_CODES if rna else _CODES)
+
+
+def encode_kmer(kmer) -> int:
+    """
+    2-bit integer code of a k-mer.
+
+    :param kmer: String of A,C,G,T (any case).
+    :return: Integer code.
+    """
+
+    code = 0
+    for c in _encode_bases(kmer):
+        if c > 3:
+            raise ValueError(f'{kmer!r} is not a DNA k-mer (A,C,G,T only)')
+        code = (code << 2) | c
+    return code
+
+
+def decode_kmer(code: int, k: int) -> str:
+    """
+    k-mer of a 2-bit integer code.
+
+    :param code: Integer code.
+    :param k: Length of the k-mer.
+    :return: The k-mer in upper case.
+    """
+
+    return ''.join('ACGT'[(code >> (2 * (k - 1 - i))) & 3] for i in range(k))
+
+
+def reverse_complement_kmer(code: int, k: int) -> int:
+    """
+    Code of the reverse complement of a k-mer.
+
+    :param code: Integer code.
+    :param k: Length of the k-mer.
+    :return: Integer code of the reverse complement.
+    """
+
+    rc = 0
+    for _ in range(k):
+        rc = (rc << 2) | (3 - (code & 3))
+        code >>= 2
+    return rc
+
+
+def canonical_kmer(code: int, k: int) -> int:
+    """
+    Canonical code of a k-mer: the smaller of its code and the code of its reverse complement,
+    so a k-mer and its reverse complement are counted together.
+
+    :param code: Integer code.
+    :param k: Length of the k-mer.
+    :return: Canonical integer code.
+    """
+
+    return min(code, reverse_complement_kmer(code, k))
+
+
+def iter_kmers(seq, k: int, canonical: bool = False):
+    """
+    Rolling 2-bit encoding of all k-mers of a sequence. k-mers containing other letters than A,C,G,T are skipped.
+
+    :param seq: Sequence (str or bytes).
+    :param k: k-mer length.
+    :param canonical: Yield canonical codes (see canonical_kmer).
+    :return: Generator of (0-based start, code) tuples.
+    """
+
+    if k < 1:
+        raise ValueError('k must be a positive integer')
+    mask = (1 << (2 * k)) - 1
+    shift = 2 * (k - 1)
+    code = 0
+    rc = 0  # code of the reverse complement, updated from the other end
+    valid = 0  # number of valid bases ending at the current position
+    for i, c in enumerate(_encode_bases(seq)):
+        if c > 3:
+            valid = 0
+            code = 0
+            continue
+        code = ((code << 2) | c) & mask
+        valid += 1
+        if canonical:
+            rc = (rc >> 2) | ((3 - c) << shift)
+            if valid >= k:
+                yield i - k + 1, min(code, rc)
+        elif valid >= k:
+            yield i - k + 1, code
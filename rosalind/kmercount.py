@@ -0,0 +1,402 @@
+"""
+k-mer counting and k-mer spectra.
+
+k-mers are 2-bit encoded with a rolling encoding (see rosalind.kmer), by default as canonical k-mers,
+so a k-mer and its reverse complement are counted together. With numpy, the codes of a whole sequence
+are computed with array operations and counted with bincount (small k) or sort+unique (large k);
+without numpy a Counter over the rolling codes is used.
+
+iter_fasta_kmer_counts counts in bounded memory: counts are merged in memory until they exceed max_in_memory
+distinct k-mers, then spilled to partition files on disk (split by k-mer code). Each partition is merged and
+yielded separately at the end, in k-mer order, so only one partition is ever in memory; kmer_spectrum builds
+the spectrum from the parts incrementally. Records can be counted in a process pool (see rosalind.parallel).
+
+Included functions:
+    KmerCounts:                 Sorted k-mer codes with their counts: lookup, merging and the k-mer spectrum.
+    count_kmers:                Counts the k-mers of one sequence.
+    iter_fasta_kmer_counts:     Counts the k-mers of a fasta file in bounded memory, yielding the counts in parts.
+    count_fasta_kmers:          Counts the k-mers of all records of a fasta file, spilling to disk if needed.
+    kmer_spectrum:              Returns the k-mer spectrum of counts given in parts.
+    merge_counts:               Merges several KmerCounts.
+
+Example:
+    parts = iter_fasta_kmer_counts('reads.fa', k=21, jobs=8)
+    for multiplicity, kmers in kmer_spectrum(parts).items():
+        print(multiplicity, kmers)
+"""
+
+import os
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from functools import partial
+from itertools import chain
+
+from .kmer import _encode_bases, canonical_kmer, decode_kmer, encode_kmer, iter_kmers
+from .parallel import parallel_map
+from .utils import _numpy, iter_fasta
+
+# largest table of counts (4**k) counted with bincount
+_BINCOUNT_MAX_SIZE = 1 << 22
+
+# bases encoded at once with numpy, long records are processed in overlapping chunks of this size
+_CHUNK_SIZE = 1 << 24
+
+
+class KmerCounts:
+    """
+    Counts of k-mers, stored as sorted k-mer codes and their counts (numpy uint64 arrays, or lists without numpy).
+
+    :param k: k-mer length.
+    :param codes: Sorted, unique k-mer codes.
+    :param counts: Count of every code.
+    :param canonical: Whether the codes are canonical k-mers (lookups are then canonicalized too).
+    """
+
+    def __init__(self, k: int, codes=(), counts=(), canonical: bool = True):
+        self.k = k
+        self.canonical = canonical
+        np = _numpy()
+        if np is not None:
+            self.codes = np.asarray(codes, dtype=np.uint64)
+            self.counts = np.asarray(counts, dtype=np.uint64)
+        else:
+            self.codes = list(codes)
+            self.counts = list(counts)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, kmer) -> int:
+        code = encode_kmer(kmer)
+        if self.canonical:
+            code = canonical_kmer(code, self.k)
+        i = bisect_left(self.codes, code)
+        if i < len(self.codes) and self.codes[i] == code:
+            return int(self.counts[i])
+        return 0
+
+    def items(self):
+        """
+        Yields (k-mer, count) in alphabetical order of the k-mers.
+        """
+
+        for code, count in zip(self.codes, self.counts):
+            yield decode_kmer(int(code), self.k), int(count)
+
+    @property
+    def total(self) -> int:
+        """Number of counted k-mers (with multiplicity)."""
+        return sum(self.counts) if isinstance(self.counts, list) else int(self.counts.sum())
+
+    def spectrum(self) -> dict[int, int]:
+        """
+        k-mer spectrum: number of distinct k-mers for every multiplicity.
+
+        :return: Dictionary {multiplicity:number of k-mers}, sorted by multiplicity.
+        """
+
+        if isinstance(self.counts, list):
+            return dict(sorted(Counter(self.counts).items()))
+        multiplicities, kmers = _numpy().unique(self.counts, return_counts=True)
+        return dict(zip(multiplicities.tolist(), kmers.tolist()))
+
+    def merge(self, other):
+        """
+        Sum of two k-mer counts.
+        """
+
+        return merge_counts([self, other])
+
+
+def _merge_arrays(codes, counts):
+    # sorted unique codes with summed counts, numpy arrays
+    np = _numpy()
+    if len(codes) == 0:
+        return codes, counts
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    counts = counts[order]
+    starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+    return codes[starts], np.add.reduceat(counts, starts)
+
+
+def _kmer_codes(seq, k, canonical, positions=False):
+    # numpy array of the (canonical) codes of all k-mers of A,C,G,T only (and their 0-based starts)
+    np = _numpy()
+    bases = np.frombuffer(_encode_bases(seq), dtype=np.uint8)
+    n = len(bases) - k + 1
+    if n <= 0:
+        empty = np.empty(0, dtype=np.uint64)
+        return (empty, empty) if positions else empty
+    values = (bases & 3).astype(np.uint64)
+    two = np.uint64(2)
+    codes = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        codes <<= two
+        codes |= values[j:j + n]
+    if canonical:
+        rc = np.zeros(n, dtype=np.uint64)
+        complement = np.uint64(3) - values
+        for j in range(k):
+            rc |= complement[j:j + n] << np.uint64(2 * j)
+        np.minimum(codes, rc, out=codes)
+    # drop windows with other letters than A,C,G,T
+    invalid = np.concatenate(([0], np.cumsum(bases > 3)))
+    valid = invalid[k:] == invalid[:n]
+    if positions:
+        return codes[valid], np.flatnonzero(valid).astype(np.uint64)
+    return codes[valid]
+
+
+def _count_codes(codes, k):
+    # sorted unique codes and their counts
+    np = _numpy()
+    size = 4 ** k
+    if size <= _BINCOUNT_MAX_SIZE and size <= 16 * len(codes):
+        table = np.bincount(codes.astype(np.intp), minlength=size)
+        present = np.flatnonzero(table)
+        return present.astype(np.uint64), table[present].astype(np.uint64)
+    present, counts = np.unique(codes, return_counts=True)
+    return present, counts.astype(np.uint64)
+
+
+def _count_sequence(seq, k, canonical):
+    # (codes, counts) of one sequence, numpy arrays or lists
+    np = _numpy()
+    if np is None:
+        counter = Counter(code for _, code in iter_kmers(seq, k, canonical))
+        codes = sorted(counter)
+        return codes, [counter[code] for code in codes]
+    if len(seq) <= _CHUNK_SIZE:
+        return _count_codes(_kmer_codes(seq, k, canonical), k)
+    # overlapping chunks, so every k-mer is in exactly one chunk
+    step = _CHUNK_SIZE - k + 1
+    parts = [_count_codes(_kmer_codes(seq[i:i + _CHUNK_SIZE], k, canonical), k)
+             for i in range(0, len(seq) - k + 1, step)]
+    return _merge_arrays(np.concatenate([c for c, _ in parts]), np.concatenate([n for _, n in parts]))
+
+
+def _count_record(record, k, canonical):
+    return _count_sequence(record[1], k, canonical)
+
+
+def count_kmers(seq, k: int, canonical: bool = True) -> KmerCounts:
+    """
+    Count the k-mers of a sequence. k-mers with other letters than A,C,G,T are skipped.
+
+    :param seq: DNA sequence (str or bytes, any case).
+    :param k: k-mer length (at most 32).
+    :param canonical: Count a k-mer and its reverse complement together.
+    :return: KmerCounts
+    """
+
+    if not 1 <= k <= 32:
+        raise ValueError('k must be between 1 and 32')
+    codes, counts = _count_sequence(seq, k, canonical)
+    return KmerCounts(k, codes, counts, canonical)
+
+
+def merge_counts(counts) -> KmerCounts:
+    """
+    Merge k-mer counts (e.g. of different records, files or processes).
+
+    :param counts: Iterable of KmerCounts with the same k.
+    :return: KmerCounts with the summed counts.
+    """
+
+    counts = list(counts)
+    if not counts:
+        raise ValueError('Nothing to merge')
+    k, canonical = counts[0].k, counts[0].canonical
+    if any(c.k != k or c.canonical != canonical for c in counts):
+        raise ValueError('Only counts with the same k and canonical setting can be merged')
+    np = _numpy()
+    if np is None:
+        merged = Counter()
+        for c in counts:
+            merged.update(dict(zip(c.codes, c.counts)))
+        codes = sorted(merged)
+        return KmerCounts(k, codes, [merged[code] for code in codes], canonical)
+    codes, totals = _merge_arrays(np.concatenate([c.codes for c in counts]),
+                                  np.concatenate([c.counts for c in counts]))
+    return KmerCounts(k, codes, totals, canonical)
+
+
+class _Spill:
+    # partition files of (code, count) pairs, partitioned by code so the partitions are in k-mer order
+
+    def __init__(self, k, partitions, tmp_dir):
+        self.dir = tempfile.TemporaryDirectory(dir=tmp_dir, prefix='kmers-')
+        self.bounds = [(i << (2 * k)) // partitions for i in range(1, partitions)]
+        self.paths = [(os.path.join(self.dir.name, f'{i}.codes'), os.path.join(self.dir.name, f'{i}.counts'))
+                      for i in range(partitions)]
+
+    def write(self, codes, counts):
+        # sorted codes and their counts, numpy arrays or lists
+        if isinstance(codes, list):
+            splits = [bisect_left(codes, bound) for bound in self.bounds]
+            codes, counts = array('Q', codes), array('Q', counts)
+        else:
+            np = _numpy()
+            splits = np.searchsorted(codes, np.array(self.bounds, dtype=np.uint64)).tolist()
+        for (codes_path, counts_path), start, end in zip(self.paths, [0] + splits, splits + [len(codes)]):
+            if start == end:
+                continue
+            with open(codes_path, 'ab') as f:
+                codes[start:end].tofile(f)
+            with open(counts_path, 'ab') as f:
+                counts[start:end].tofile(f)
+
+    def merged(self):
+        # merged (codes, counts) of every partition, in k-mer order, as numpy arrays or lists
+        np = _numpy()
+        for codes_path, counts_path in self.paths:
+            if not os.path.exists(codes_path):
+                continue
+            if np is not None:
+                yield _merge_arrays(np.fromfile(codes_path, dtype=np.uint64),
+                                    np.fromfile(counts_path, dtype=np.uint64))
+                continue
+            codes, counts = array('Q'), array('Q')
+            with open(codes_path, 'rb') as f:
+                codes.frombytes(f.read())
+            with open(counts_path, 'rb') as f:
+                counts.frombytes(f.read())
+            merged = Counter()
+            for code, count in zip(codes, counts):
+                merged[code] += count
+            codes = sorted(merged)
+            yield codes, [merged[code] for code in codes]
+
+    def close(self):
+        self.dir.cleanup()
+
+
+def _solid(k, codes, counts, canonical, min_count):
+    # KmerCounts of the codes seen at least min_count times
+    if isinstance(codes, list):
+        keep = [i for i, count in enumerate(counts) if count >= min_count]
+        return KmerCounts(k, [codes[i] for i in keep], [counts[i] for i in keep], canonical)
+    keep = counts >= min_count
+    return KmerCounts(k, codes[keep], counts[keep], canonical)
+
+
+def iter_fasta_kmer_counts(fasta, k: int, canonical: bool = True, jobs: int = 1, min_count: int = 1,
+                           max_in_memory: int = 1 << 24, partitions: int = 16, tmp_dir=None):
+    """
+    Count the k-mers of all records of a fasta file in bounded memory, yielding the counts in parts.
+
+    Counts are merged in memory; whenever more than max_in_memory distinct k-mers are held, they are spilled
+    to partition files in tmp_dir. The partitions are then merged and yielded one at a time, so at most one
+    partition is in memory, never all distinct k-mers. Without spilling, a single part is yielded.
+
+    :param fasta: Path to a fasta file, a binary file object, or an iterable of (name, sequence) tuples.
+    :param k: k-mer length (at most 32).
+    :param canonical: Count a k-mer and its reverse complement together.
+    :param jobs: Number of worker processes counting the records.
+    :param min_count: Only keep k-mers seen at least this often.
+    :param max_in_memory: Number of distinct k-mers held in memory before spilling to disk.
+    :param partitions: Number of partition files.
+    :param tmp_dir: Directory for the partition files, defaults to the system temporary directory.
+    :return: Generator of KmerCounts of disjoint k-mer ranges, in k-mer order.
+    """
+
+    if not 1 <= k <= 32:
+        raise ValueError('k must be between 1 and 32')
+    if isinstance(fasta, (str, bytes, os.PathLike)) or hasattr(fasta, 'read'):
+        fasta = iter_fasta(fasta, as_bytes=True)
+    results = parallel_map(partial(_count_record, k=k, canonical=canonical), fasta, jobs)
+
+    spill = None
+    try:
+        np = _numpy()
+        if np is None:
+            held = Counter()
+            for codes, counts in results:
+                held.update(dict(zip(codes, counts)))
+                if len(held) > max_in_memory:
+                    if spill is None:
+                        spill = _Spill(k, partitions, tmp_dir)
+                    codes = sorted(held)
+                    spill.write(codes, [held[code] for code in codes])
+                    held = Counter()
+            codes = sorted(held)
+            held_codes, held_counts = codes, [held[code] for code in codes]
+        else:
+            held_codes = np.empty(0, dtype=np.uint64)
+            held_counts = np.empty(0, dtype=np.uint64)
+            pending = []
+            pending_size = 0
+            for codes, counts in chain(results, [(None, None)]):
+                if codes is not None:
+                    pending.append((codes, counts))
+                    pending_size += len(codes)
+                    if pending_size < max(max_in_memory - len(held_codes), 1) // 2:
+                        continue
+                held_codes, held_counts = _merge_arrays(np.concatenate([held_codes] + [c for c, _ in pending]),
+                                                        np.concatenate([held_counts] + [n for _, n in pending]))
+                pending = []
+                pending_size = 0
+                if len(held_codes) > max_in_memory:
+                    if spill is None:
+                        spill = _Spill(k, partitions, tmp_dir)
+                    spill.write(held_codes, held_counts)
+                    held_codes = np.empty(0, dtype=np.uint64)
+                    held_counts = np.empty(0, dtype=np.uint64)
+
+        if spill is None:
+            yield _solid(k, held_codes, held_counts, canonical, min_count)
+            return
+        spill.write(held_codes, held_counts)
+        del held_codes, held_counts
+        for codes, counts in spill.merged():
+            yield _solid(k, codes, counts, canonical, min_count)
+    finally:
+        if spill is not None:
+            spill.close()
+
+
+def count_fasta_kmers(fasta, k: int, canonical: bool = True, jobs: int = 1, min_count: int = 1,
+                      max_in_memory: int = 1 << 24, partitions: int = 16, tmp_dir=None) -> KmerCounts:
+    """
+    Count the k-mers of all records of a fasta file.
+
+    Counting spills to disk like iter_fasta_kmer_counts, but the result holds all (solid) k-mers in memory.
+    For inputs whose distinct k-mers do not fit in memory, use iter_fasta_kmer_counts and kmer_spectrum.
+
+    :param fasta: Path to a fasta file, a binary file object, or an iterable of (name, sequence) tuples.
+    :param k: k-mer length (at most 32).
+    :param canonical: Count a k-mer and its reverse complement together.
+    :param jobs: Number of worker processes counting the records.
+    :param min_count: Only keep k-mers seen at least this often (keeps the result small).
+    :param max_in_memory: Number of distinct k-mers held in memory before spilling to disk.
+    :param partitions: Number of partition files.
+    :param tmp_dir: Directory for the partition files, defaults to the system temporary directory.
+    :return: KmerCounts
+    """
+
+    parts = list(iter_fasta_kmer_counts(fasta, k, canonical, jobs, min_count, max_in_memory, partitions, tmp_dir))
+    if len(parts) == 1:
+        return parts[0]
+    # the parts are disjoint and in k-mer order
+    np = _numpy()
+    if np is None:
+        return KmerCounts(k, list(chain.from_iterable(p.codes for p in parts)),
+                          list(chain.from_iterable(p.counts for p in parts)), canonical)
+    return KmerCounts(k, np.concatenate([p.codes for p in parts]), np.concatenate([p.counts for p in parts]), canonical)
+
+
+def kmer_spectrum(parts) -> dict[int, int]:
+    """
+    k-mer spectrum of k-mer counts given in parts (e.g. by iter_fasta_kmer_counts), one part at a time.
+
+    :param parts: Iterable of KmerCounts of disjoint sets of k-mers.
+    :return: Dictionary {multiplicity:number of k-mers}, sorted by multiplicity.
+    """
+
+    spectrum = Counter()
+    for part in parts:
+        spectrum.update(part.spectrum())
+    return dict(sorted(spectrum.items()))
@@ -0,0 +1,311 @@
+"""
+Persistent on-disk k-mer index for repeated exact motif queries.
+
+All k-mers of the indexed fasta records are stored 2-bit encoded (see rosalind.kmer) together with their
+record and position, sorted by k-mer, in memory-mapped files. A motif query looks up its rarest k-mer by binary search
+and only verifies the candidate positions against the sequence, which is read through an IndexedFasta.
+Query time therefore depends on the number of candidates, not on the size of the genome.
+
+The index is a directory with a meta.json file and one or more segments. Every add_fasta call writes a new
+segment, so records can be added without rebuilding the index; compact() merges all segments into one.
+add_fasta works in bounded memory: the k-mers are sorted in runs of at most max_in_memory entries,
+which are written to disk and merged into the new segment.
+
+Included functions:
+    KmerIndex:                  On-disk k-mer index with exact motif queries and incremental addition of records.
+
+Example:
+    index = KmerIndex('genome.kmers', k=12)
+    index.add_fasta('genome.fa')
+    hits = index.find_motif('GATTACAGATTACA')
+"""
+
+import heapq
+import json
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_left
+
+from .faidx import IndexedFasta
+from .kmer import encode_kmer, iter_kmers
+from .kmercount import _kmer_codes
+from .utils import _numpy, iter_fasta
+
+_NOT_ACGT = re.compile(rb'[^ACGTacgt]+')
+
+# entries written at once when merging segments
+_MERGE_BUFFER = 1 << 16
+
+
+def _map_array(path, typecode):
+    # read-only memory map of an array file as a memoryview of the given type
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return array(typecode)
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)).cast(typecode)
+
+
+class KmerIndex:
+    """
+    On-disk index of all k-mers of a set of fasta records.
+
+    The fasta files are not copied, queries read them through their .fai index, so they must stay in place.
+    Queries are case-insensitive and motifs may only contain A,C,G,T.
+
+    :param index_dir: Directory of the index, created if it does not exist.
+    :param k: k-mer length (at most 32), only needed when the index is created.
+    """
+
+    def __init__(self, index_dir, k: int = None):
+        self.index_dir = index_dir
+        self._meta_path = os.path.join(index_dir, 'meta.json')
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                self._meta = json.load(f)
+            if k is not None and k != self._meta['k']:
+                raise ValueError(f'The index at {index_dir} uses k={self._meta["k"]}, not {k}')
+        else:
+            if k is None:
+                raise ValueError('k is required to create a new index')
+            if not 1 <= k <= 32:
+                raise ValueError('k must be between 1 and 32')
+            os.makedirs(index_dir, exist_ok=True)
+            self._meta = {'k': k, 'next_segment': 0, 'segments': [], 'records': []}
+            self._save_meta()
+
+        self.k = self._meta['k']
+        self._segments = [self._load_segment(name) for name in self._meta['segments']]
+        self._fastas = {}
+
+    @property
+    def records(self) -> list[str]:
+        """Names of the indexed records."""
+        return [r['name'] for r in self._meta['records']]
+
+    def _save_meta(self):
+        tmp = self._meta_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self._meta, f)
+        os.replace(tmp, self._meta_path)
+
+    def _segment_path(self, name, part):
+        return os.path.join(self.index_dir, f'{name}.{part}')
+
+    def _load_segment(self, name):
+        return tuple(_map_array(self._segment_path(name, part), typecode)
+                     for part, typecode in (('codes', 'Q'), ('records', 'I'), ('positions', 'I')))
+
+    def _write_segment(self, entries):
+        # entries: iterable of (code, record, position) sorted by code, or a tuple of the three numpy columns,
+        # returns the segment name
+        number = self._meta.get('next_segment', 0)
+        self._meta['next_segment'] = number + 1
+        name = f'segment-{number:04d}'
+        files = [open(self._segment_path(name, part), 'wb') for part in ('codes', 'records', 'positions')]
+        try:
+            if isinstance(entries, tuple):
+                for column, f, dtype in zip(entries, files, ('uint64', 'uint32', 'uint32')):
+                    column.astype(dtype).tofile(f)
+                return name
+            buffers = (array('Q'), array('I'), array('I'))
+            for entry in entries:
+                for buffer, value in zip(buffers, entry):
+                    buffer.append(value)
+                if len(buffers[0]) >= _MERGE_BUFFER:
+                    for buffer, f in zip(buffers, files):
+                        buffer.tofile(f)
+                        del buffer[:]
+            for buffer, f in zip(buffers, files):
+                buffer.tofile(f)
+        finally:
+            for f in files:
+                f.close()
+        return name
+
+    def _new_records(self, fasta_path, records):
+        # (record id, sequence) of the records of a fasta file, their metadata is appended to records
+        names = set(self.records)
+        for name, seq in iter_fasta(fasta_path, as_bytes=True):
+            if name in names:
+                raise ValueError(f'Record {name} of {fasta_path} is already indexed')
+            names.add(name)
+            # runs of other letters than A,C,G,T: k-mers overlapping them are not indexed
+            breaks = [[m.start(), m.end()] for m in _NOT_ACGT.finditer(seq)]
+            records.append({'name': name, 'fasta': fasta_path, 'length': len(seq), 'breaks': breaks})
+            yield len(self._meta['records']) + len(records) - 1, seq
+
+    def _sorted_runs(self, records, max_in_memory):
+        # sorted runs of at most about max_in_memory entries: iterables of (code, record, position),
+        # with numpy tuples of the three columns
+        k = self.k
+        np = _numpy()
+        if np is None:
+            low = (1 << 32) - 1
+            entries = []
+            for rid, seq in records:
+                for pos, code in iter_kmers(seq, k):
+                    entries.append((code << 64) | (rid << 32) | pos)
+                    if len(entries) >= max_in_memory:
+                        entries.sort()
+                        yield ((e >> 64, (e >> 32) & low, e & low) for e in entries)
+                        entries = []
+            entries.sort()
+            yield ((e >> 64, (e >> 32) & low, e & low) for e in entries)
+            return
+
+        def run(parts):
+            codes, rids, positions = (np.concatenate(arrays) for arrays in zip(*parts))
+            order = np.lexsort((positions, rids, codes))
+            return codes[order], rids[order], positions[order]
+
+        parts = []
+        size = 0
+        # overlapping chunks of long records, so every k-mer is in exactly one chunk
+        step = max(max_in_memory - k + 1, 1)
+        for rid, seq in records:
+            for start in range(0, max(len(seq) - k + 1, 0), step):
+                codes, positions = _kmer_codes(seq[start:start + step + k - 1], k, False, positions=True)
+                parts.append((codes, np.full(len(codes), rid, dtype=np.uint64), positions + np.uint64(start)))
+                size += len(codes)
+                if size >= max_in_memory:
+                    yield run(parts)
+                    parts = []
+                    size = 0
+        empty = np.empty(0, dtype=np.uint64)
+        yield run(parts) if parts else (empty, empty, empty)
+
+    def add_fasta(self, fasta_path, max_in_memory: int = 1 << 21):
+        """
+        Index all records of a fasta file as a new segment (the existing segments are not touched).
+
+        :param fasta_path: Path to the fasta file. A .fai index is created next to it if needed.
+                           Raises ValueError if the file or one of its record names is already indexed.
+        :param max_in_memory: Number of k-mers sorted in memory at once, more are sorted in runs on disk.
+        """
+
+        fasta_path = os.path.abspath(fasta_path)
+        if any(record['fasta'] == fasta_path for record in self._meta['records']):
+            raise ValueError(f'{fasta_path} is already indexed')
+
+        records = []
+        runs = []
+        try:
+            for entries in self._sorted_runs(self._new_records(fasta_path, records), max_in_memory):
+                runs.append(self._write_segment(entries))
+            if len(runs) == 1:
+                name = runs.pop()
+            else:
+                name = self._write_segment(heapq.merge(*(zip(*self._load_segment(run)) for run in runs)))
+        finally:
+            self._remove_segments(runs)
+
+        self._meta['records'].extend(records)
+        self._meta['segments'].append(name)
+        self._save_meta()
+        self._segments.append(self._load_segment(name))
+
+    def _remove_segments(self, names):
+        for segment in names:
+            for part in ('codes', 'records', 'positions'):
+                os.remove(self._segment_path(segment, part))
+
+    def compact(self):
+        """
+        Merge all segments into a single one.
+        """
+
+        if len(self._segments) <= 1:
+            return
+        old = self._meta['segments']
+        merged = heapq.merge(*(zip(*segment) for segment in self._segments))
+        name = self._write_segment(merged)
+        self._segments = []
+        self._meta['segments'] = [name]
+        self._save_meta()
+        self._remove_segments(old)
+        self._segments = [self._load_segment(name)]
+
+    def _ranges(self, low, high):
+        # (segment, first, end) of all entries with low <= code < high
+        for segment in self._segments:
+            codes = segment[0]
+            yield segment, bisect_left(codes, low), bisect_left(codes, high)
+
+    def _fetch(self, rid, start, end):
+        record = self._meta['records'][rid]
+        fasta = self._fastas.get(record['fasta'])
+        if fasta is None:
+            fasta = self._fastas[record['fasta']] = IndexedFasta(record['fasta'])
+        return fasta.fetch(record['name'], start, end, as_bytes=True)
+
+    def find_motif(self, motif: str) -> dict[str, list[int]]:
+        """
+        All locations of a motif in all indexed records.
+
+        :param motif: Motif of A,C,G,T (any case).
+        :return: Dictionary {record name:sorted list of 1-based starts} of the records with at least one hit.
+        """
+
+        k = self.k
+        pattern = motif.upper().encode()
+        if not pattern or _NOT_ACGT.search(pattern):
+            raise ValueError(f'{motif!r} is not a DNA motif (A,C,G,T only)')
+        length = len(pattern)
+        hits = set()
+
+        if length >= k:
+            # seed with the rarest k-mer of the motif, then verify the candidates
+            best = None
+            for offset in range(length - k + 1):
+                code = encode_kmer(pattern[offset:offset + k])
+                ranges = list(self._ranges(code, code + 1))
+                count = sum(end - first for _, first, end in ranges)
+                if best is None or count < best[0]:
+                    best = (count, offset, ranges)
+                if count == 0:
+                    break
+            _, offset, ranges = best
+            for (_, records, positions), first, end in ranges:
+                for i in range(first, end):
+                    start = positions[i] - offset
+                    if start < 0:
+                        continue
+                    rid = records[i]
+                    if length == k or self._fetch(rid, start, start + length).upper() == pattern:
+                        hits.add((rid, start))
+        else:
+            # every k-mer starting with the motif is a hit
+            shift = 2 * (k - length)
+            code = encode_kmer(pattern)
+            for (_, records, positions), first, end in self._ranges(code << shift, (code + 1) << shift):
+                hits.update(zip(records[first:end], positions[first:end]))
+            # starts which have no complete k-mer: before non-ACGT runs and at the end of each record
+            for rid, record in enumerate(self._meta['records']):
+                regions = [start for start, _ in record['breaks']] + [record['length']]
+                for region_end in regions:
+                    region_start = max(0, region_end - k + 1)
+                    window = self._fetch(rid, region_start, region_end).upper()
+                    i = window.find(pattern)
+                    while i != -1:
+                        hits.add((rid, region_start + i))
+                        i = window.find(pattern, i + 1)
+
+        names = self.records
+        result = {}
+        for rid, start in sorted(hits):
+            result.setdefault(names[rid], []).append(start + 1)  # use 1-based indexing
+        return result
+
+    def close(self):
+        for fasta in self._fastas.values():
+            fasta.close()
+        self._fastas = {}
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
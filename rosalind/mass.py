@@ -0,0 +1,263 @@
+"""
+Protein masses and fragment (b/y ion) masses.
+
+Residue masses (monoisotopic and average) are tabulated once at import as 256-entry lookup tables indexed
+by byte, upper and lower case, with NaN for letters that are not amino acids. The mass of a protein is one
+table lookup over its bytes (a numpy gather when numpy is available) and a sum; an invalid residue makes
+the sum NaN, which is reported as a ValueError.
+
+Batch mode computes the masses of many peptides at once: the peptides are concatenated, looked up in one
+gather and summed per peptide with numpy.add.reduceat. FragmentMasses keeps the prefix sums of a peptide,
+so every prefix and suffix (b and y ion) and every subpeptide mass is a difference of two prefix sums.
+
+Included functions:
+    residue_masses:             Returns the residue mass table (monoisotopic or average).
+    protein_mass:               Returns the mass of a protein (sum of residue masses, optionally with water).
+    protein_masses:             Returns the masses of many proteins in one vectorized pass.
+    fasta_masses:               Yields (name, mass) for every record of a fasta file, in batches.
+    FragmentMasses:             Prefix sums of residue masses with O(1) subpeptide, b ion and y ion masses.
+
+Example:
+    for name, mass in fasta_masses('proteome.fa', average=True):
+        print(name, mass)
+    fragments = FragmentMasses('PEPTIDE')
+    fragments.b_ions(), fragments.y_ions()
+"""
+
+import math
+import os
+from itertools import accumulate, islice
+
+from .kmer import _ascii_bytes
+from .utils import _NUMPY_MIN_LENGTH, _numpy, iter_fasta
+
+MONOISOTOPIC_MASSES = {
+    'A': 71.03711, 'C': 103.00919, 'D': 115.02694, 'E': 129.04259, 'F': 147.06841,
+    'G': 57.02146, 'H': 137.05891, 'I': 113.08406, 'K': 128.09496, 'L': 113.08406,
+    'M': 131.04049, 'N': 114.04293, 'P': 97.05276, 'Q': 128.05858, 'R': 156.10111,
+    'S': 87.03203, 'T': 101.04768, 'V': 99.06841, 'W': 186.07931, 'Y': 163.06333,
+}
+
+AVERAGE_MASSES = {
+    'A': 71.0788, 'C': 103.1388, 'D': 115.0886, 'E': 129.1155, 'F': 147.1766,
+    'G': 57.0519, 'H': 137.1411, 'I': 113.1594, 'K': 128.1741, 'L': 113.1594,
+    'M': 131.1926, 'N': 114.1038, 'P': 97.1167, 'Q': 128.1307, 'R': 156.1875,
+    'S': 87.0782, 'T': 101.1051, 'V': 99.1326, 'W': 186.2132, 'Y': 163.1760,
+}
+
+WATER_MONOISOTOPIC = 18.01056
+WATER_AVERAGE = 18.01528
+PROTON = 1.007276
+
+# proteins per batch in fasta_masses
+_BATCH_SIZE = 100_000
+
+
+def _lookup_table(masses: dict) -> list:
+    # mass of every byte (upper and lower case letters), NaN for everything else
+    table = [math.nan] * 256
+    for residue, mass in masses.items():
+        table[ord(residue)] = table[ord(residue.lower())] = mass
+    return table
+
+
+_TABLES = {False: _lookup_table(MONOISOTOPIC_MASSES), True: _lookup_table(AVERAGE_MASSES)}
+_ARRAY_TABLES = {}  # numpy arrays of _TABLES, made on first use
+
+
+def _array_table(average):
+    table = _ARRAY_TABLES.get(average)
+    if table is None:
+        table = _ARRAY_TABLES[average] = _numpy().array(_TABLES[average])
+    return table
+
+
+def residue_masses(average: bool = False) -> dict:
+    """
+    Residue mass table.
+
+    :param average: Average instead of monoisotopic masses.
+    :return: Dictionary {amino acid:mass}.
+    """
+
+    return dict(AVERAGE_MASSES if average else MONOISOTOPIC_MASSES)
+
+
+def _invalid(protein):
+    raw = _ascii_bytes(protein)
+    bad = next(chr(c) for c in raw if math.isnan(_TABLES[False][c]))
+    return ValueError(f'Please provide a valid protein sequence ({bad!r} is not an amino acid)')
+
+
+def protein_mass(protein, average: bool = False, water: bool = False) -> float:
+    """
+    Mass of a protein: the sum of its residue masses, like the Rosalind PRTM problem.
+
+    :param protein: Protein sequence (str or bytes, any case).
+    :param average: Use average instead of monoisotopic masses.
+    :param water: Add one water for the mass of the intact peptide (instead of the residues only).
+    :return: Mass in Da. Raises ValueError for letters that are not amino acids.
+    """
+
+    raw = _ascii_bytes(protein)
+    np = _numpy() if len(raw) >= _NUMPY_MIN_LENGTH else None
+    if np is not None:
+        mass = float(_array_table(average)[np.frombuffer(raw, dtype=np.uint8)].sum())
+    else:
+        mass = sum(map(_TABLES[average].__getitem__, raw), 0.0)
+    if math.isnan(mass):
+        raise _invalid(raw)
+    if water:
+        mass += WATER_AVERAGE if average else WATER_MONOISOTOPIC
+    return mass
+
+
+def protein_masses(proteins, average: bool = False, water: bool = False):
+    """
+    Masses of many proteins (e.g. millions of peptides) in one vectorized pass.
+
+    :param proteins: Iterable of protein sequences (str or bytes).
+    :param average: Use average instead of monoisotopic masses.
+    :param water: Add one water to every mass.
+    :return: numpy float64 array (list of floats without numpy). Raises ValueError for invalid residues.
+    """
+
+    raw = [_ascii_bytes(p) for p in proteins]
+    np = _numpy()
+    if np is None:
+        return [protein_mass(p, average, water) for p in raw]
+
+    lengths = np.fromiter(map(len, raw), dtype=np.int64, count=len(raw))
+    masses = np.zeros(len(raw))
+    # reduceat needs valid start indices, so empty proteins keep the mass 0
+    nonempty = lengths > 0
+    if nonempty.any():
+        residues = _array_table(average)[np.frombuffer(b''.join(raw), dtype=np.uint8)]
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+        masses[nonempty] = np.add.reduceat(residues, starts)
+    invalid = np.flatnonzero(np.isnan(masses))
+    if len(invalid):
+        raise _invalid(raw[invalid[0]])
+    if water:
+        masses += WATER_AVERAGE if average else WATER_MONOISOTOPIC
+    return masses
+
+
+def fasta_masses(fasta, average: bool = False, water: bool = False, batch_size: int = _BATCH_SIZE):
+    """
+    Masses of all protein records of a fasta file, computed in batches with protein_masses.
+
+    :param fasta: Path to a fasta file, a binary file object, or an iterable of (name, sequence) tuples.
+    :param average: Use average instead of monoisotopic masses.
+    :param water: Add one water to every mass.
+    :param batch_size: Number of records computed at once.
+    :return: Generator of (name, mass) tuples in the order of the records.
+    """
+
+    if isinstance(fasta, (str, bytes, os.PathLike)) or hasattr(fasta, 'read'):
+        fasta = iter_fasta(fasta, as_bytes=True)
+    records = iter(fasta)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        names = [name for name, _ in batch]
+        try:
+            masses = protein_masses((seq for _, seq in batch), average, water)
+        except ValueError:
+            # name the first invalid record
+            for name, seq in batch:
+                try:
+                    protein_mass(seq)
+                except ValueError as e:
+                    raise ValueError(f'Record {name}: {e}') from None
+            raise
+        yield from zip(names, (float(m) for m in masses))
+
+
+class FragmentMasses:
+    """
+    Prefix sums of the residue masses of a peptide.
+
+    Prefix i holds the mass of the first i residues, so any subpeptide mass is one difference.
+    Ion masses are singly protonated: b ions are prefix + proton, y ions are suffix + water + proton.
+
+    :param peptide: Peptide sequence (str or bytes, any case).
+    :param average: Use average instead of monoisotopic masses.
+    """
+
+    __slots__ = ('average', 'prefix')
+
+    def __init__(self, peptide, average: bool = False):
+        self.average = average
+        raw = _ascii_bytes(peptide)
+        np = _numpy()
+        if np is not None:
+            self.prefix = np.concatenate(([0.0], np.cumsum(_array_table(average)[np.frombuffer(raw, np.uint8)])))
+        else:
+            self.prefix = list(accumulate(map(_TABLES[average].__getitem__, raw), initial=0.0))
+        if math.isnan(self.prefix[-1]):
+            raise _invalid(raw)
+
+    def __len__(self):
+        return len(self.prefix) - 1
+
+    @property
+    def water(self) -> float:
+        return WATER_AVERAGE if self.average else WATER_MONOISOTOPIC
+
+    def mass(self, start: int = 0, end: int = None) -> float:
+        """
+        Residue mass of the subpeptide [start, end) (0-based, end exclusive).
+        """
+
+        if end is None:
+            end = len(self)
+        if not 0 <= start <= end <= len(self):
+            raise IndexError(f'Invalid subpeptide [{start}, {end}) of a peptide of length {len(self)}')
+        return float(self.prefix[end] - self.prefix[start])
+
+    def precursor_mass(self) -> float:
+        """
+        Neutral mass of the intact peptide (residues and water).
+        """
+
+        return float(self.prefix[-1]) + self.water
+
+    def b_ions(self):
+        """
+        Masses of the b1..b(n-1) ions (N-terminal fragments).
+
+        :return: numpy array (list without numpy).
+        """
+
+        if isinstance(self.prefix, list):
+            return [m + PROTON for m in self.prefix[1:-1]]
+        return self.prefix[1:-1] + PROTON
+
+    def y_ions(self):
+        """
+        Masses of the y1..y(n-1) ions (C-terminal fragments), y_i has the last i residues.
+
+        :return: numpy array (list without numpy).
+        """
+
+        total = self.prefix[-1]
+        if isinstance(self.prefix, list):
+            return [total - m + self.water + PROTON for m in self.prefix[-2:0:-1]]
+        return (total - self.prefix[-2:0:-1]) + self.water + PROTON
+
+    def subpeptide_masses(self, min_length: int = 1, max_length: int = None):
+        """
+        Masses of all (linear) subpeptides with min_length to max_length residues.
+
+        :return: Generator of (start, end, mass) tuples, 0-based and end exclusive.
+        """
+
+        n = len(self)
+        if max_length is None:
+            max_length = n
+        prefix = self.prefix
+        for start in range(n):
+            for end in range(start + min_length, min(n, start + max_length) + 1):
+                yield start, end, float(prefix[end] - prefix[start])
@@ -0,0 +1,258 @@
+"""
+Multi-pattern and approximate motif search.
+
+An Aho-Corasick automaton is compiled once from a collection of motifs and then reports every occurrence
+of every motif, including overlapping ones, in a single pass over each sequence.
+The compiled automaton can be reused for any number of sequences, e.g. all records of a fasta file.
+
+Approximate search (up to d mismatches) is bit-parallel over the text, a shift-add scheme with big integers:
+every text byte is a counter lane, and for each motif position the mismatch indicator of the whole text is
+shifted and added at once, so no Python code runs per text position (with numpy, the lanes are a uint8
+array). Longer motifs are split into d+1 pieces, one of which must match exactly (pigeonhole principle);
+the pieces are located with str.find and only their candidate positions are verified.
+
+Included functions:
+    MotifAutomaton:             Compiled Aho-Corasick automaton for a collection of motifs.
+    find_motifs:                Returns 1-based starts of all locations of several motifs within given sequence.
+    find_approximate:           Returns 1-based starts of all locations of a motif with at most d mismatches.
+
+Example:
+    automaton = MotifAutomaton(['ATAT', 'GCA'], both_strands=True)
+    for name, seq in iter_fasta('reads.fa'):
+        hits = automaton.search(seq)
+"""
+
+from collections import deque
+from operator import ne
+
+from .kmer import _ascii_bytes
+from .sequence import reverse_complement
+from .utils import _numpy, is_valid
+
+# lane counters are bytes, so the bit-parallel search handles motifs up to this length
+_MAX_LANE_COUNT = 255
+
+# motifs with pigeonhole pieces at least this long are seeded instead of scanned bit-parallel
+_SEED_MIN_LENGTH = 12
+
+# 1 for a counter lane with at most d mismatches, for every d
+_HIT_TABLES = {}
+
+
+class MotifAutomaton:
+    """
+    Aho-Corasick automaton over a collection of motifs. Matching is exact and case-sensitive, like find_motif.
+
+    :param motifs: Iterable of motif strings (duplicates are ignored).
+    :param both_strands: Also report occurrences of the reverse complement of each motif (the minus strand).
+    """
+
+    def __init__(self, motifs, both_strands: bool = False):
+        self.motifs = list(dict.fromkeys(motifs))
+        if not all(self.motifs):
+            raise ValueError('Motifs must be non-empty strings!')
+        self.both_strands = both_strands
+
+        # every searched pattern is (pattern, motif, strand)
+        self._patterns = [(m, m, '+') for m in self.motifs]
+        if both_strands:
+            for m in self.motifs:
+                if not is_valid(m):
+                    raise ValueError(f'Cannot search the minus strand for {m!r}, it is not a valid DNA/RNA sequence')
+                self._patterns.append((reverse_complement(m), m, '-'))
+
+        self._build()
+
+    def _build(self):
+        # trie of all patterns
+        goto = [{}]
+        out = [[]]
+        for pid, (pattern, _, _) in enumerate(self._patterns):
+            state = 0
+            for c in pattern:
+                nxt = goto[state].get(c)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][c] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pid)
+
+        # breadth-first: failure links, merged outputs and full transition table (a DFA)
+        alphabet = {c for pattern, _, _ in self._patterns for c in pattern}
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = {c: goto[0].get(c, 0) for c in alphabet}
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            f = fail[state]
+            out[state] = out[state] + out[f]
+            delta[state] = {c: goto[state][c] if c in goto[state] else delta[f][c] for c in alphabet}
+            for c, nxt in goto[state].items():
+                fail[nxt] = delta[f][c]
+                queue.append(nxt)
+
+        self._delta = delta
+        self._out = [tuple(o) for o in out]
+
+    def iter_matches(self, seq: str):
+        """
+        Scan a sequence once and yield every occurrence of every motif.
+
+        :param seq: Sequence to search in.
+        :return: Generator of (0-based start, motif, strand) tuples in order of the end position.
+        """
+
+        delta = self._delta
+        out = self._out
+        patterns = self._patterns
+        state = 0
+        for i, c in enumerate(seq):
+            state = delta[state].get(c, 0)
+            if out[state]:
+                for pid in out[state]:
+                    pattern, motif, strand = patterns[pid]
+                    yield i - len(pattern) + 1, motif, strand
+
+    def search(self, seq: str) -> dict[str, list[int]]:
+        """
+        Find all locations of all motifs in a sequence.
+
+        With both_strands, a motif's list also contains the starts of its reverse complement,
+        in coordinates of the given sequence.
+
+        :param seq: Sequence to search in.
+        :return: Dictionary {motif:sorted list of 1-based starts}, with an entry for every motif.
+        """
+
+        hits = {m: [] for m in self.motifs}
+        for start, motif, _ in self.iter_matches(seq):
+            hits[motif].append(start + 1)  # use 1-based indexing
+        for motif, starts in hits.items():
+            if self.both_strands:
+                # palindromic motifs match on both strands at the same position
+                hits[motif] = sorted(set(starts))
+            else:
+                starts.sort()
+        return hits
+
+    def search_records(self, records):
+        """
+        Search many records with the same automaton, e.g. the output of iter_fasta.
+
+        :param records: Iterable of (name, sequence) tuples.
+        :return: Generator of (name, {motif:list of 1-based starts}) tuples.
+        """
+
+        for name, seq in records:
+            yield name, self.search(seq)
+
+
+def find_motifs(s: str, motifs, both_strands: bool = False) -> dict[str, list[int]]:
+    """
+    Return all locations of several motifs within a sequence in one pass (Aho-Corasick).
+
+    To search many sequences with the same motifs, build a MotifAutomaton once and reuse it.
+
+    :param s: Longer sequence in which to search.
+    :param motifs: The motifs to be found.
+    :param both_strands: Also report locations of the reverse complement of each motif.
+    :return: Dictionary {motif:list of 1-based integer starts of all found motif locations}.
+    """
+
+    return MotifAutomaton(motifs, both_strands).search(s)
+
+
+def _scan_bit_parallel(s: bytes, t: bytes, max_mismatches: int) -> list[int]:
+    # sum the shifted mismatch indicators of all motif positions, one byte lane per text position
+    n, m = len(s), len(t)
+    indicators = {}
+    counts = 0
+    for j, c in enumerate(t):
+        mismatch = indicators.get(c)
+        if mismatch is None:
+            table = bytes(int(b != c) for b in range(256))
+            mismatch = indicators[c] = int.from_bytes(s.translate(table), 'little')
+        counts += mismatch >> (8 * j)
+    lanes = counts.to_bytes(n, 'little')[:n - m + 1]
+
+    hit_table = _HIT_TABLES.get(max_mismatches)
+    if hit_table is None:
+        hit_table = _HIT_TABLES[max_mismatches] = bytes(int(v <= max_mismatches) for v in range(256))
+    hits = lanes.translate(hit_table)
+    starts = []
+    i = hits.find(1)
+    while i != -1:
+        starts.append(i)
+        i = hits.find(1, i + 1)
+    return starts
+
+
+def _scan_numpy(np, s: bytes, t: bytes, max_mismatches: int) -> list[int]:
+    # same lanes as _scan_bit_parallel, as a uint8 array of match counts
+    windows = len(s) - len(t) + 1
+    text = np.frombuffer(s, dtype=np.uint8)
+    matches = {c: text == c for c in set(t)}
+    counts = np.zeros(windows, dtype=np.uint8)
+    for j, c in enumerate(t):
+        counts += matches[c][j:j + windows]
+    return np.flatnonzero(counts >= len(t) - max_mismatches).tolist()
+
+
+def _scan_seeded(s: bytes, t: bytes, max_mismatches: int) -> list[int]:
+    # pigeonhole: one of max_mismatches + 1 pieces matches exactly, verify the candidates it seeds
+    n, m = len(s), len(t)
+    pieces = max_mismatches + 1
+    candidates = set()
+    for p in range(pieces):
+        offset, end = p * m // pieces, (p + 1) * m // pieces
+        piece = t[offset:end]
+        i = s.find(piece)
+        while i != -1:
+            start = i - offset
+            if 0 <= start <= n - m:
+                candidates.add(start)
+            i = s.find(piece, i + 1)
+    return sorted(start for start in candidates if sum(map(ne, s[start:start + m], t)) <= max_mismatches)
+
+
+def _approximate_starts(s: bytes, t: bytes, max_mismatches: int) -> list[int]:
+    # 0-based starts of all windows of s with at most max_mismatches mismatches to t
+    n, m = len(s), len(t)
+    if m > n:
+        return []
+    if max_mismatches >= m:
+        return list(range(n - m + 1))
+    if m > _MAX_LANE_COUNT or m // (max_mismatches + 1) >= _SEED_MIN_LENGTH:
+        return _scan_seeded(s, t, max_mismatches)
+    np = _numpy()
+    if np is not None:
+        return _scan_numpy(np, s, t, max_mismatches)
+    return _scan_bit_parallel(s, t, max_mismatches)
+
+
+def find_approximate(s: str, t: str, max_mismatches: int = 0, both_strands: bool = False) -> list[int]:
+    """
+    Return all locations of a motif within a sequence with at most max_mismatches mismatches (Hamming distance).
+    Matching is case-sensitive, like find_motif.
+
+    :param s: Longer sequence in which to search.
+    :param t: The motif to be found.
+    :param max_mismatches: Maximal number of mismatching positions.
+    :param both_strands: Also report locations of the reverse complement of the motif.
+    :return: Sorted list of 1-based integer starts of all found motif locations.
+    """
+
+    if max_mismatches < 0:
+        raise ValueError('max_mismatches must not be negative')
+    if not t:
+        return []
+    text = _ascii_bytes(s)
+    starts = set(_approximate_starts(text, _ascii_bytes(t), max_mismatches))
+    if both_strands:
+        if not is_valid(t):
+            raise ValueError(f'Cannot search the minus strand for {t!r}, it is not a valid DNA/RNA sequence')
+        starts.update(_approximate_starts(text, _ascii_bytes(reverse_complement(t)), max_mismatches))
+    return [start + 1 for start in sorted(starts)]  # use 1-based indexing
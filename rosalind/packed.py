@@ -0,0 +1,208 @@
+"""
+Compact 2-bit packed nucleotide sequences.
+
+A PackedSequence stores four bases per byte (A=0, C=1, G=2, T/U=3, first base in the high bits) and is validated
+once at construction. Packing, unpacking and the sequence operations are done with byte translation tables
+and big integer arithmetic, so no Python code runs per base.
+
+reverse_complement, gc, hamming_distance, find_motif and translate_rna accept a PackedSequence directly.
+All of them work on the packed bytes except find_motif, which unpacks the sequence first (with translation
+tables, so still no Python code per base). Contiguous slices are cut from the packed bytes as well.
+
+Included functions:
+    PackedSequence:             2-bit packed DNA/RNA sequence (A,C,G,T/U only, case-insensitive).
+"""
+
+from .kmer import _ascii_bytes, _encode_bases
+from .translation import _get_table
+
+# base code c at position i of a byte is stored as c << _SHIFTS[i]
+_SHIFTS = (6, 4, 2, 0)
+_SHIFT_TABLES = tuple(bytes((c << shift) & 0xFF if c < 4 else 0 for c in range(256)) for shift in _SHIFTS)
+
+
+def _letter_tables(letters):
+    # letter of the base at position i of every packed byte
+    return tuple(bytes(letters[(b >> shift) & 3] for b in range(256)) for shift in _SHIFTS)
+
+
+_DNA_LETTERS = _letter_tables(b'ACGT')
+_RNA_LETTERS = _letter_tables(b'ACGU')
+
+# reverse complement of the four bases within one byte
+_REVCOMP_BYTE = bytes(sum((3 - ((b >> shift) & 3)) << (6 - shift) for shift in _SHIFTS) for b in range(256))
+
+# number of C and G bases in every packed byte
+_GC_COUNT = bytes(sum(((b >> shift) & 3) in (1, 2) for shift in _SHIFTS) for b in range(256))
+
+# 3 packed bytes hold 4 codons; a codon index (first << 4 | second << 2 | third) is 6 of their 24 bits
+_HIGH_6 = bytes(b >> 2 for b in range(256))
+_LOW_2 = bytes((b & 3) << 4 for b in range(256))
+_HIGH_4 = bytes(b >> 4 for b in range(256))
+_LOW_4 = bytes((b & 15) << 2 for b in range(256))
+_HIGH_2 = bytes(b >> 6 for b in range(256))
+_LOW_6 = bytes(b & 63 for b in range(256))
+
+
+def _or_bytes(a: bytes, b: bytes) -> bytes:
+    # bitwise or of two equally long byte strings
+    return (int.from_bytes(a, 'big') | int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+
+class PackedSequence:
+    """
+    A DNA or RNA sequence packed into 2 bits per base.
+
+    The sequence is validated and case-folded once. It is considered RNA if it contains U but no T,
+    in which case str() returns U instead of T (same rule as reverse_complement).
+
+    :param seq: Sequence of A,C,G,T,U letters in any case.
+    """
+
+    __slots__ = ('_data', '_length', 'is_rna')
+
+    def __init__(self, seq: str):
+        raw = _ascii_bytes(seq)
+        codes = _encode_bases(raw, rna=True)
+        if b'\x04' in codes:
+            raise ValueError('Please enter a valid DNA/RNA sequence (a,t,g,c,u allowed)')
+
+        self._length = len(codes)
+        self.is_rna = (b'U' in raw or b'u' in raw) and not (b'T' in raw or b't' in raw)
+
+        # pad with A to whole bytes, then merge the four interleaved base positions with shifted codes
+        codes += bytes(-len(codes) % 4)
+        nbytes = len(codes) // 4
+        packed = 0
+        for i, table in enumerate(_SHIFT_TABLES):
+            packed |= int.from_bytes(codes[i::4].translate(table), 'big')
+        self._data = packed.to_bytes(nbytes, 'big')
+
+    @classmethod
+    def _from_packed(cls, data: bytes, length: int, is_rna: bool = False):
+        obj = cls.__new__(cls)
+        obj._data = data
+        obj._length = length
+        obj.is_rna = is_rna
+        return obj
+
+    @property
+    def data(self) -> bytes:
+        """The packed bytes (the last byte is padded with A)."""
+        return self._data
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        tables = _RNA_LETTERS if self.is_rna else _DNA_LETTERS
+        out = bytearray(4 * len(self._data))
+        for i, table in enumerate(tables):
+            out[i::4] = self._data.translate(table)
+        del out[self._length:]
+        return out.decode()
+
+    def __repr__(self):
+        seq = str(self) if self._length <= 20 else str(self[:17]) + '...'
+        return f'PackedSequence({seq!r}, length={self._length})'
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedSequence):
+            return NotImplemented
+        return self._length == other._length and self._data == other._data
+
+    def __hash__(self):
+        return hash((self._length, self._data))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self._length)
+            if step != 1:
+                sliced = PackedSequence(str(self)[item])
+                sliced.is_rna = self.is_rna
+                return sliced
+            return self._slice(start, max(stop, start))
+        if item < 0:
+            item += self._length
+        if not 0 <= item < self._length:
+            raise IndexError('sequence index out of range')
+        code = (self._data[item // 4] >> _SHIFTS[item % 4]) & 3
+        return ('ACGU' if self.is_rna else 'ACGT')[code]
+
+    def _slice(self, start, stop):
+        # bases [start, stop) shifted to the start of new packed bytes, padded with A
+        length = stop - start
+        nbytes = (length + 3) // 4
+        chunk = self._data[start // 4:(stop + 3) // 4]
+        value = (int.from_bytes(chunk, 'big') << (2 * (start % 4))) & ((1 << (8 * len(chunk))) - 1)
+        value >>= 8 * (len(chunk) - nbytes)
+        pad = -length % 4
+        value = value >> (2 * pad) << (2 * pad)
+        return PackedSequence._from_packed(value.to_bytes(nbytes, 'big'), length, self.is_rna)
+
+    def codon_indices(self) -> bytes:
+        """
+        Codon index (first << 4 | second << 2 | third, with A=0, C=1, G=2, T/U=3) of every complete codon
+        of the first reading frame, cut from the packed bytes.
+        """
+
+        data = self._data + bytes(-len(self._data) % 3)
+        first, second, third = data[0::3], data[1::3], data[2::3]
+        out = bytearray(4 * len(first))
+        out[0::4] = first.translate(_HIGH_6)
+        out[1::4] = _or_bytes(first.translate(_LOW_2), second.translate(_HIGH_4))
+        out[2::4] = _or_bytes(second.translate(_LOW_4), third.translate(_HIGH_2))
+        out[3::4] = third.translate(_LOW_6)
+        del out[self._length // 3:]
+        return bytes(out)
+
+    def translate(self, table: int = 1, to_stop: bool = False) -> str:
+        """
+        Protein translation of the first reading frame, computed on the packed bytes.
+
+        :param table: NCBI genetic code number.
+        :param to_stop: Stop at (and exclude) the first stop codon.
+        :return: Protein sequence, stops are '*'. A trailing partial codon is ignored.
+        """
+
+        protein = self.codon_indices().translate(_get_table(table)).decode()
+        if to_stop:
+            stop = protein.find('*')
+            if stop != -1:
+                return protein[:stop]
+        return protein
+
+    def gc(self) -> float:
+        """
+        GC fraction of the sequence, counted per byte with a lookup table.
+        """
+
+        counts = self._data.translate(_GC_COUNT)
+        return sum(k * counts.count(k) for k in range(1, 5)) / self._length
+
+    def reverse_complement(self) -> 'PackedSequence':
+        """
+        Reverse complement as a new PackedSequence, computed on the packed bytes.
+        """
+
+        # reverse the byte order and the bases within each byte, complementing them
+        data = self._data[::-1].translate(_REVCOMP_BYTE)
+        # the padding is now at the start: shift it out
+        pad = -self._length % 4
+        if pad:
+            nbytes = len(data)
+            value = (int.from_bytes(data, 'big') << (2 * pad)) & ((1 << (8 * nbytes)) - 1)
+            data = value.to_bytes(nbytes, 'big')
+        return PackedSequence._from_packed(data, self._length, self.is_rna)
+
+    def hamming_distance(self, other: 'PackedSequence') -> int:
+        """
+        Number of mismatching bases between two packed sequences of equal length.
+        """
+
+        if self._length != other._length:
+            raise ValueError('Length of the two sequences must be the same!')
+        diff = int.from_bytes(self._data, 'big') ^ int.from_bytes(other._data, 'big')
+        # one bit per base that differs in either of its two bits
+        low_bits = int.from_bytes(b'\x55' * len(self._data), 'big')
+        return ((diff | (diff >> 1)) & low_bits).bit_count()
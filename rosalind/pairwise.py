@@ -0,0 +1,240 @@
+"""
+All-vs-all distances between many sequences, computed in parallel.
+
+The upper triangle of the distance matrix is split into square tiles which are computed in a process pool.
+Results are stored in condensed form (the upper triangle row by row, like scipy's pdist) in a compact
+int64 array or in a memory-mapped file.
+
+Included functions:
+    condensed_index:            Returns the position of pair (i, j) in a condensed distance matrix.
+    distance_matrix:            Computes all pairwise distances into a condensed int64 array or file.
+    close_pairs:                Yields only the pairs with a distance at most a threshold.
+    main:                       Command line interface, run as: python -m rosalind.pairwise seqs.fasta
+
+Example:
+    sequences = read_multifasta('seqs.fasta')
+    distances = distance_matrix(list(sequences.values()), metric='levenshtein', jobs=8)
+"""
+
+import argparse
+import inspect
+import mmap
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .sequence import hamming_distance, levenshtein_distance
+from .utils import read_multifasta
+
+METRICS = {'hamming': hamming_distance, 'levenshtein': levenshtein_distance}
+
+# sequences and metric of a worker process, set once by the pool initializer
+_worker_state = {}
+
+
+def condensed_index(n: int, i: int, j: int) -> int:
+    """
+    Position of the distance between sequences i and j (i < j) in a condensed matrix of n sequences.
+
+    :param n: Number of sequences.
+    :param i: Index of the first sequence.
+    :param j: Index of the second sequence.
+    :return: Index into the condensed array.
+    """
+
+    if i > j:
+        i, j = j, i
+    if i == j:
+        raise ValueError('The diagonal is not stored in a condensed distance matrix')
+    return n * i - i * (i + 1) // 2 + j - i - 1
+
+
+def _resolve_metric(metric):
+    if callable(metric):
+        return metric
+    try:
+        return METRICS[metric]
+    except KeyError:
+        raise ValueError(f'Unknown metric {metric!r}, choose one of {sorted(METRICS)} or pass a function') from None
+
+
+def _tiles(n, tile_size):
+    # (row start, row end, column start, column end) covering the upper triangle
+    for a in range(0, n, tile_size):
+        for c in range(a, n, tile_size):
+            yield a, min(a + tile_size, n), c, min(c + tile_size, n)
+
+
+def _init_worker(sequences, metric, threshold):
+    _worker_state['sequences'] = sequences
+    _worker_state['metric'] = metric
+    _worker_state['threshold'] = threshold
+
+
+def _compute_tile(tile):
+    # all distances of one tile, as one list of distances per row
+    a, b, c, d = tile
+    sequences = _worker_state['sequences']
+    metric = _worker_state['metric']
+    rows = []
+    for i in range(a, b):
+        s = sequences[i]
+        rows.append([metric(s, sequences[j]) for j in range(max(c, i + 1), d)])
+    return tile, rows
+
+
+def _close_pairs_tile(tile):
+    # only the pairs of one tile within the threshold, using the early exit of levenshtein_distance
+    a, b, c, d = tile
+    sequences = _worker_state['sequences']
+    metric = _worker_state['metric']
+    threshold = _worker_state['threshold']
+    # compare the unwrapped functions, rosalind.cache and rosalind.instrument replace levenshtein_distance
+    # by wrappers (which are then called below)
+    early_exit = inspect.unwrap(metric) is inspect.unwrap(levenshtein_distance)
+    pairs = []
+    for i in range(a, b):
+        s = sequences[i]
+        for j in range(max(c, i + 1), d):
+            if early_exit:
+                dist = levenshtein_distance(s, sequences[j], max_distance=threshold)
+            else:
+                dist = metric(s, sequences[j])
+            if dist <= threshold:
+                pairs.append((i, j, dist))
+    return tile, pairs
+
+
+def _run_tiles(func, sequences, metric, threshold, jobs, tile_size):
+    """
+    Yield func(tile) for all tiles, in a process pool if jobs != 1, with a bounded number of tiles in flight.
+    """
+
+    tiles = _tiles(len(sequences), tile_size)
+    if jobs == 1:
+        _init_worker(sequences, metric, threshold)
+        try:
+            yield from map(func, tiles)
+        finally:
+            _worker_state.clear()
+        return
+
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(sequences, metric, threshold)) as pool:
+        max_in_flight = 4 * workers
+        pending = set()
+        for tile in tiles:
+            pending.add(pool.submit(func, tile))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def distance_matrix(sequences, metric='hamming', jobs: int = None, tile_size: int = 64, out=None):
+    """
+    Compute the distances between all pairs of sequences.
+
+    The result is the condensed upper triangle: the distance of sequences i < j is at condensed_index(n, i, j).
+
+    :param sequences: List of sequences (or a dictionary {name:sequence} as returned by read_multifasta).
+    :param metric: 'hamming', 'levenshtein' or a picklable function of two sequences returning an integer.
+    :param jobs: Number of worker processes, defaults to the number of CPUs. With 1 no pool is started.
+    :param tile_size: Number of rows and columns of the matrix computed by one task.
+    :param out: Optional path of a file to store the matrix in as native int64 values.
+    :return: array('q') of n * (n - 1) / 2 distances, or a memoryview of the memory-mapped out file.
+    """
+
+    if isinstance(sequences, dict):
+        sequences = list(sequences.values())
+    n = len(sequences)
+    size = n * (n - 1) // 2
+    metric = _resolve_metric(metric)
+
+    if out is None:
+        result = array('q', bytes(8 * size))
+    else:
+        with open(out, 'wb') as f:
+            f.truncate(8 * size)
+        if size:
+            with open(out, 'r+b') as f:
+                result = memoryview(mmap.mmap(f.fileno(), 0)).cast('q')
+        else:
+            result = memoryview(b'').cast('q')
+
+    for (a, b, c, d), rows in _run_tiles(_compute_tile, sequences, metric, None, jobs, tile_size):
+        for i, row in zip(range(a, b), rows):
+            if row:
+                start = condensed_index(n, i, max(c, i + 1))
+                result[start:start + len(row)] = array('q', row)
+
+    if out is not None and size:
+        result.obj.flush()
+    return result
+
+
+def close_pairs(sequences, threshold: int, metric='hamming', jobs: int = None, tile_size: int = 64):
+    """
+    Find all pairs of sequences with a distance of at most threshold, without storing the full matrix.
+
+    For the levenshtein metric, distances are only computed up to the threshold.
+
+    :param sequences: List of sequences (or a dictionary {name:sequence} as returned by read_multifasta).
+    :param threshold: Maximal distance of a reported pair.
+    :param metric: 'hamming', 'levenshtein' or a picklable function of two sequences returning an integer.
+    :param jobs: Number of worker processes, defaults to the number of CPUs. With 1 no pool is started.
+    :param tile_size: Number of rows and columns of the matrix computed by one task.
+    :return: Generator of (i, j, distance) tuples with i < j, ordered by tile.
+    """
+
+    if isinstance(sequences, dict):
+        sequences = list(sequences.values())
+    metric = _resolve_metric(metric)
+    for _, pairs in _run_tiles(_close_pairs_tile, sequences, metric, threshold, jobs, tile_size):
+        yield from pairs
+
+
+def main(argv=None):
+    """
+    Command line interface: all-vs-all distances of the records of a fasta file.
+
+    Prints a tab-separated square matrix, or only the close pairs with --threshold,
+    or writes the condensed int64 matrix to a file with --out.
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m rosalind.pairwise', description=main.__doc__.strip())
+    parser.add_argument('fasta', help='multi-fasta file')
+    parser.add_argument('--metric', choices=sorted(METRICS), default='hamming')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: all CPUs)')
+    parser.add_argument('--tile-size', type=int, default=64)
+    parser.add_argument('--threshold', type=int, default=None, help='only report pairs within this distance')
+    parser.add_argument('--out', default=None, help='write the condensed int64 matrix to this file')
+    args = parser.parse_args(argv)
+
+    records = read_multifasta(args.fasta)
+    names = list(records)
+    sequences = list(records.values())
+    write = sys.stdout.write
+
+    if args.threshold is not None:
+        for i, j, dist in close_pairs(sequences, args.threshold, args.metric, args.jobs, args.tile_size):
+            write(f'{names[i]}\t{names[j]}\t{dist}\n')
+        return
+
+    distances = distance_matrix(sequences, args.metric, args.jobs, args.tile_size, args.out)
+    if args.out is not None:
+        return
+
+    n = len(names)
+    write('\t' + '\t'.join(names) + '\n')
+    for i in range(n):
+        row = [0 if i == j else distances[condensed_index(n, i, j)] for j in range(n)]
+        write(names[i] + '\t' + '\t'.join(map(str, row)) + '\n')
+
+
+if __name__ == '__main__':
+    main()
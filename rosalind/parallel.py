@@ -0,0 +1,86 @@
+"""
+Ordered parallel map over fasta records (or any other items) with a process pool.
+
+Items are pulled lazily from the input, grouped into batches to amortize the inter-process communication,
+and at most max_in_flight batches are submitted at any time, so memory stays flat on files with millions of records.
+Results are yielded in input order.
+
+The function has to be picklable: a module-level function (any rosalind function works), or a functools.partial
+of one, but not a lambda or a nested function.
+
+Included functions:
+    parallel_map:               Yields func(item) for every item, in input order, computed in a process pool.
+    map_fasta:                  Yields (name, func(sequence)) for every record of a fasta file or stream.
+
+Example:
+    for name, mass in map_fasta(calculate_mw, 'proteins.fasta', jobs=32):
+        print(name, mass)
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from .utils import iter_fasta
+
+
+def _run_batch(func, batch):
+    return [func(item) for item in batch]
+
+
+def _apply_to_sequence(func, record):
+    name, seq = record
+    return name, func(seq)
+
+
+def parallel_map(func, items, jobs: int = None, batch_size: int = 64, max_in_flight: int = None):
+    """
+    Apply func to every item in a process pool and yield the results in input order.
+
+    :param func: Picklable function of one item.
+    :param items: Any iterable, consumed lazily.
+    :param jobs: Number of worker processes, defaults to the number of CPUs. With 1 everything runs in this process.
+    :param batch_size: Number of items sent to a worker at once.
+    :param max_in_flight: Maximal number of submitted but not yet yielded batches, defaults to 2 * jobs.
+    :return: Generator of func(item).
+    """
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1:
+        yield from map(func, items)
+        return
+    if max_in_flight is None:
+        max_in_flight = 2 * jobs
+
+    items = iter(items)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        while True:
+            batch = list(islice(items, batch_size))
+            if batch:
+                pending.append(pool.submit(_run_batch, func, batch))
+            # wait for the oldest batch once the window is full or the input is exhausted
+            while pending and (len(pending) >= max_in_flight or not batch):
+                yield from pending.popleft().result()
+            if not batch:
+                break
+
+
+def map_fasta(func, fasta, jobs: int = None, batch_size: int = 64, max_in_flight: int = None):
+    """
+    Apply a function of a sequence (e.g. gc, translate_rna, reverse_complement, calculate_mw) to every fasta record.
+
+    :param func: Picklable function of one sequence.
+    :param fasta: Path to a fasta file, a binary file object, or an iterable of (name, sequence) tuples.
+    :param jobs: Number of worker processes, defaults to the number of CPUs.
+    :param batch_size: Number of records sent to a worker at once.
+    :param max_in_flight: Maximal number of batches in flight, defaults to 2 * jobs.
+    :return: Generator of (name, func(sequence)) tuples in the order of the records.
+    """
+
+    if isinstance(fasta, (str, bytes, os.PathLike)) or hasattr(fasta, 'read'):
+        fasta = iter_fasta(fasta)
+    return parallel_map(partial(_apply_to_sequence, func), fasta, jobs, batch_size, max_in_flight)
@@ -5,16 +5,40 @@ The functions are tailored to solving Rosalind problems but can be used independ
 
 Included functions:
     reverse_complement:         Returns reverse complement of a DNA or RNA sequence.
-    translate:                  Translates RNA sequence into protein using standard codon table.
+    reverse_complement_fasta:   Writes reverse complements of fasta records in constant memory.
+    translate_rna:              Translates RNA sequence into protein using standard (or another NCBI) codon table.
     hamming_distance:           Calculates Hamming distance (substitution only) between two sequences of equal length.
-    find_motif:                 Returns 1-based starts of all locations of a motif within given sequence (exact match).
+    hamming_distances:          Calculates Hamming distances between one query and many sequences of the same length.
+    find_motif:                 Returns 1-based starts of all locations of a motif within given sequence (up to d mismatches).
     all_common_substrings:      Return a set of all common substrings between two DNA strings.
     longest_common_substring:   Returns one longest common substring between k DNA strings given as fasta file.
-    levenshtein_distance:       Returns edit distance between two strings.
+    levenshtein_distance:       Returns edit distance between two strings (optionally only up to a threshold).
 """
 
+from operator import ne
+
 # import utility functions (like reading fasta)
-from .utils import read_multifasta, is_valid, gc
+from .utils import _NUMPY_MIN_LENGTH, _numpy, read_multifasta, is_valid, gc
+from .suffix import longest_common_substrings
+from .alignment import levenshtein_bitparallel, levenshtein_banded
+from .packed import PackedSequence
+from .translation import translate
+from .alphabet import InvalidSequenceError
+
+
+def _complement_table(pairs: str) -> bytes:
+    # byte translation table for complementing, bytes which are not in pairs map to 0
+    table = bytearray(256)
+    for base, complement in zip(pairs[0::2], pairs[1::2]):
+        table[ord(base)] = ord(complement)
+        table[ord(base.lower())] = ord(complement.lower())
+    return bytes(table)
+
+
+# IUPAC codes and their complements (U pairs with A)
+_IUPAC_PAIRS = 'GCCGRYYRKMMKSSWWBVVBDHHDNN'
+_DNA_COMPLEMENT = _complement_table(_IUPAC_PAIRS + 'ATTAUA')
+_RNA_COMPLEMENT = _complement_table(_IUPAC_PAIRS + 'AUUATA')
 
 
 def reverse_complement(dna: str) -> str:
@@ -23,127 +47,113 @@ def reverse_complement(dna: str) -> str:
     Returns reverse complement sequence.
 
     If a sequence has both U and T it assumes DNA and translates A to T by default.
+    IUPAC ambiguity codes are complemented as well (e.g. R to Y, N to N).
+    Validation is fused into the complement: one translation pass maps invalid letters to 0.
 
-    :param dna: Input DNA or RNA sequence (allowed letters A,a,T,t,G,g,C,c,U,u)
-    :type dna: str
+    bytes input gives bytes output (and raises InvalidSequenceError, a ValueError, for invalid letters).
+    A PackedSequence is reverse complemented on its packed bytes and returned as a PackedSequence.
+    To reverse complement fasta records larger than memory, see reverse_complement_fasta.
+
+    :param dna: Input DNA or RNA sequence (allowed letters A,a,T,t,G,g,C,c,U,u and IUPAC codes)
+    :type dna: str, bytes or PackedSequence
     """
 
-    # check if is valid nucleic acid sequence
-    if not is_valid(dna):
-        return 'Please enter a valid DNA/RNA sequence (no IUPAC allowed)'
+    if isinstance(dna, PackedSequence):
+        return dna.reverse_complement()
 
-    # determine if RNA or DNA
-    # TODO add IUPAC letters
+    if isinstance(dna, (bytes, bytearray)):
+        raw = dna
+    else:
+        try:
+            raw = dna.encode('ascii')
+        except UnicodeEncodeError:
+            raw = b'\0'
 
-    if 'U' in dna.upper() and 'T' not in dna.upper():
-        table = str.maketrans({'G': 'C', 'C': 'G', 'A': 'U', 'U': 'A', 'g': 'c', 'c': 'g', 'a': 'u', 'u': 'a'})
+    # determine if RNA or DNA
+    if (b'U' in raw or b'u' in raw) and not (b'T' in raw or b't' in raw):
+        table = _RNA_COMPLEMENT
     else:
-        table = str.maketrans(
-            {'G': 'C', 'C': 'G', 'A': 'T', 'T': 'A', 'U': 'A', 'g': 'c', 'c': 'g', 'a': 't', 't': 'a', 'u': 'a'})
-    # reverse and complement
-    return dna[::-1].translate(table)
+        table = _DNA_COMPLEMENT
+
+    # reverse and complement, invalid letters are complemented to 0
+    result = raw[::-1].translate(table)
+    if b'\0' in result:
+        if raw is dna:
+            raise InvalidSequenceError('Please enter a valid DNA/RNA sequence (IUPAC allowed)')
+        return 'Please enter a valid DNA/RNA sequence (IUPAC allowed)'
+    return result if raw is dna else result.decode()
 
 
-def translate_rna(rna: str) -> str:
+def reverse_complement_fasta(fasta_path, out, names=None, rna: bool = False, block_size: int = 1 << 20,
+                             line_width: int = 60, index_path=None):
+    """
+    Write the reverse complement of fasta records, reading each record backwards in blocks.
+
+    The records are read through an IndexedFasta memory map, from their end towards their start, and written out
+    block by block, so peak memory depends on block_size and not on the length of a record.
+    This needs a .fai index: if there is none (or it is stale), one is written next to the fasta file,
+    or to index_path.
+
+    :param fasta_path: Path to the fasta file.
+    :param out: Output path or binary file object (e.g. sys.stdout.buffer).
+    :param names: Names of the records to write, defaults to all records.
+    :param rna: Complement A to U instead of T.
+    :param block_size: Number of bases read at once.
+    :param line_width: Number of bases per output line.
+    :param index_path: Where to read or write the index, defaults to fasta_path + '.fai'.
+    """
+
+    from .faidx import IndexedFasta
+
+    table = _RNA_COMPLEMENT if rna else _DNA_COMPLEMENT
+    if not hasattr(out, 'write'):
+        with open(out, 'wb') as f:
+            return reverse_complement_fasta(fasta_path, f, names, rna, block_size, line_width, index_path)
+
+    with IndexedFasta(fasta_path, index_path) as fa:
+        for name in (fa.keys() if names is None else names):
+            length = len(fa[name])
+            out.write(b'>' + name.encode() + b'\n')
+            pending = b''
+            for end in range(length, 0, -block_size):
+                block = fa.fetch(name, max(0, end - block_size), end, as_bytes=True)[::-1].translate(table)
+                if b'\0' in block:
+                    raise ValueError(f'Record {name} is not a valid DNA/RNA sequence')
+                # write whole lines, keep the rest for the next block
+                data = pending + block
+                whole = len(data) - len(data) % line_width
+                if whole:
+                    out.write(b'\n'.join(data[i:i + line_width] for i in range(0, whole, line_width)) + b'\n')
+                pending = data[whole:]
+            if pending:
+                out.write(pending + b'\n')
+
+
+def translate_rna(rna: str, table: int = 1) -> str:
     """
     Given: An RNA string s corresponding to a strand of mRNA (of length at most 10 kbp).
     If provided with DNA, it will transcribe into RNA before proceeding.
 
     Return: The protein string encoded by s.
 
-    This function uses standard eukaryotic genetic code.
+    This function uses standard eukaryotic genetic code by default, other NCBI genetic codes can be chosen
+    by number (e.g. 2 for vertebrate mitochondrial, 11 for bacterial). A trailing partial codon is ignored.
+    For other reading frames, six-frame and streaming translation see rosalind.translation.
 
-    :param rna: RNA string.
+    :param rna: RNA string (or PackedSequence).
+    :param table: NCBI genetic code number.
     :return: Protein sequence.
     """
 
-    # check if sequence is valid
-    if not is_valid(rna):
-        return 'Please enter a valid DNA/RNA sequence (a,t,g,c,u allowed)'
+    # a packed sequence is already valid
+    if isinstance(rna, PackedSequence):
+        return rna.translate(table, to_stop=True)
 
-    # handle lower case
-    if not rna.isupper():
-        rna = rna.upper()
-    # transcribe DNA
-    if 'T' in rna:
-        rna = rna.replace('T', 'U')
-
-    # TODO option for mitochondrial/bacterial codon table
-    # genetic code table
-    codons = {'UUU': 'F',
-              'UUC': 'F',
-              'UUA': 'L',
-              'UUG': 'L',
-              'UCU': 'S',
-              'UCC': 'S',
-              'UCA': 'S',
-              'UCG': 'S',
-              'UAU': 'Y',
-              'UAC': 'Y',
-              'UAA': 'Stop',
-              'UAG': 'Stop',
-              'UGU': 'C',
-              'UGC': 'C',
-              'UGA': 'Stop',
-              'UGG': 'W',
-              'CUU': 'L',
-              'CUC': 'L',
-              'CUA': 'L',
-              'CUG': 'L',
-              'CCU': 'P',
-              'CCC': 'P',
-              'CCA': 'P',
-              'CCG': 'P',
-              'CAU': 'H',
-              'CAC': 'H',
-              'CAA': 'Q',
-              'CAG': 'Q',
-              'CGU': 'R',
-              'CGC': 'R',
-              'CGA': 'R',
-              'CGG': 'R',
-              'AUU': 'I',
-              'AUC': 'I',
-              'AUA': 'I',
-              'AUG': 'M',
-              'ACU': 'T',
-              'ACC': 'T',
-              'ACA': 'T',
-              'ACG': 'T',
-              'AAU': 'N',
-              'AAC': 'N',
-              'AAA': 'K',
-              'AAG': 'K',
-              'AGU': 'S',
-              'AGC': 'S',
-              'AGA': 'R',
-              'AGG': 'R',
-              'GUU': 'V',
-              'GUC': 'V',
-              'GUA': 'V',
-              'GUG': 'V',
-              'GCU': 'A',
-              'GCC': 'A',
-              'GCA': 'A',
-              'GCG': 'A',
-              'GAU': 'D',
-              'GAC': 'D',
-              'GAA': 'E',
-              'GAG': 'E',
-              'GGU': 'G',
-              'GGC': 'G',
-              'GGA': 'G',
-              'GGG': 'G'}
-
-    # produce protein stopping at the first stop
-
-    protein = ''
-    for i in range(0, len(rna), 3):
-        aa = codons[rna[i:i + 3]]
-        if aa == "Stop":
-            return protein
-        protein += aa
-    return protein
+    # produce protein stopping at the first stop, the bases are validated while they are encoded
+    try:
+        return translate(rna, table, to_stop=True, strict=True)
+    except InvalidSequenceError:
+        return 'Please enter a valid DNA/RNA sequence (a,t,g,c,u allowed)'
 
 
 ###############################################################################################
@@ -155,6 +165,14 @@ def translate_rna(rna: str) -> str:
 # Functions to compare two sequences
 ###############################################################################################
 
+def _fold_case(seq):
+    # ASCII sequences as upper case bytes, None for other strings
+    try:
+        return seq.encode('ascii').upper()
+    except UnicodeEncodeError:
+        return None
+
+
 def hamming_distance(dna1: str, dna2: str) -> int:
     """
     Returns Hamming distance (the number of substitutions) between two DNA sequences of equal length.
@@ -163,49 +181,120 @@ def hamming_distance(dna1: str, dna2: str) -> int:
 
     The output is not case-sensitive.
 
+    If NumPy is installed, long sequences are compared as uint8 arrays in a single vectorized comparison.
+    Two PackedSequence objects are compared on their packed bits.
+
     :param dna1:
     :param dna2:
     :return ham_dist:
     """
 
+    if isinstance(dna1, PackedSequence) and isinstance(dna2, PackedSequence):
+        return dna1.hamming_distance(dna2)
+    if isinstance(dna1, PackedSequence):
+        dna1 = str(dna1)
+    if isinstance(dna2, PackedSequence):
+        dna2 = str(dna2)
+
     # exception if the length is not the same
     if len(dna1) != len(dna2):
         raise ValueError('Length of the two sequences must be the same!')
 
-    ham_dist = 0
+    # case-fold each sequence once
+    a = _fold_case(dna1)
+    b = _fold_case(dna2)
+    if a is None or b is None:
+        return sum(c1.upper() != c2.upper() for c1, c2 in zip(dna1, dna2))
+
+    np = _numpy() if len(a) >= _NUMPY_MIN_LENGTH else None
+    if np is not None:
+        return int(np.count_nonzero(np.frombuffer(a, np.uint8) != np.frombuffer(b, np.uint8)))
+    return sum(map(ne, a, b))
 
-    for i in range(len(dna1)):
-        if dna1[i].upper() != dna2[i].upper():
-            ham_dist += 1
 
-    return ham_dist
+def hamming_distances(query: str, sequences):
+    """
+    Returns Hamming distances between one query and many sequences of the same length.
+
+    With NumPy, the sequences may also be given as an (N, L) uint8 array (or an array of N bytes strings of length L),
+    and all distances are computed in one vectorized call. Not case-sensitive, like hamming_distance.
+
+    :param query: Query sequence of length L.
+    :param sequences: List of N sequences of length L, or an (N, L) NumPy array.
+    :return: NumPy array (if NumPy is installed and the batch has at least _NUMPY_MIN_LENGTH letters,
+             or is an array) or list of N distances.
+    """
+
+    # numpy is only loaded for batches large enough to gain from it, or if it already holds the input
+    is_array = type(sequences).__module__ == 'numpy'
+    if not is_array:
+        sequences = list(sequences)
+    np = _numpy() if is_array or len(query) * len(sequences) >= _NUMPY_MIN_LENGTH else None
+    if np is None:
+        return [hamming_distance(query, seq) for seq in sequences]
+
+    q = _fold_case(query)
+    if q is None:
+        raise ValueError('Only ASCII sequences can be compared in batch mode!')
+    q = np.frombuffer(q, np.uint8)
+
+    if isinstance(sequences, np.ndarray):
+        matrix = sequences
+        if matrix.dtype.kind == 'S':
+            matrix = matrix.view(np.uint8).reshape(len(matrix), -1)
+        if matrix.ndim != 2 or matrix.dtype != np.uint8:
+            raise ValueError('sequences must be an (N, L) uint8 array')
+        upper = np.arange(256, dtype=np.uint8)
+        upper[ord('a'):ord('z') + 1] -= 32
+        matrix = upper[matrix]
+    else:
+        encoded = [_fold_case(seq) for seq in sequences]
+        if any(seq is None for seq in encoded):
+            raise ValueError('Only ASCII sequences can be compared in batch mode!')
+        if any(len(seq) != len(q) for seq in encoded):
+            raise ValueError('Length of the two sequences must be the same!')
+        matrix = np.frombuffer(b''.join(encoded), np.uint8).reshape(len(encoded), len(q))
+
+    if matrix.shape[1] != len(q):
+        raise ValueError('Length of the two sequences must be the same!')
+    return np.count_nonzero(matrix != q, axis=1)
 
 
-def find_motif(s: str, t: str) -> list[int]:
+def find_motif(s: str, t: str, max_mismatches: int = 0, both_strands: bool = False) -> list[int]:
     """
     Given two DNA strings s and t (each of length at most 1 kbp), return all locations of t as a substring of s.
 
     :param s: Longer sequence in which to search.
     :param t: The motif to be found.
+    :param max_mismatches: Also report locations with up to this many mismatches (see rosalind.motif.find_approximate).
+    :param both_strands: Also report locations of the reverse complement of t.
     :return: List of 1-based integer starts of all found motif locations.
+
+    To search for many motifs at once, use rosalind.motif.find_motifs.
+    A PackedSequence is unpacked once with table lookups before searching (there is no search on packed bytes).
     """
 
+    if isinstance(s, PackedSequence):
+        s = str(s)
+    if isinstance(t, PackedSequence):
+        t = str(t)
+
+    if max_mismatches or both_strands:
+        from .motif import find_approximate  # rosalind.motif imports this module
+
+        return find_approximate(s, t, max_mismatches, both_strands)
+
     # initiate answer
     ans = []
+    if not t:
+        return ans
 
     # go through the string finding next motif and moving the pointer
-    # start with the first motif
     i = s.find(t)
-    if i > 0:
+    while i != -1:
         ans.append(i + 1)  # use 1-based indexing
-    while i < len(s):
-        # jump to the mext motif
+        # jump to the next motif, overlapping matches allowed
         i = s.find(t, i + 1)
-        if i > 0:
-            ans.append(i + 1)
-        # if none is found, finish
-        else:
-            break
 
     return ans
 
@@ -266,56 +355,44 @@ def longest_common_substring(sequences: list[str]) -> str:
 
     Return: One longest common substring of the collection. (If multiple solutions exist, it returns only one of them.)
 
-    Note: this function uses brute-force approach and will be too slow on larger inputs.
+    Uses a generalized suffix array with an LCP array (see rosalind.suffix), which scales to hundreds of
+    long sequences. To get all tied solutions or substrings shared by only some of the sequences,
+    use rosalind.suffix.longest_common_substrings.
 
-    :param sequences: List with sequences.
+    :param sequences: List with sequences (it is not modified).
     :return: A string which is one longest common substring for all sequences.
     """
 
-    # find all the common substrings of any length between the first two sequences
-    seq1 = sequences.pop()
-    seq2 = sequences.pop()
-    substrings = list(all_common_substrings(seq1, seq2))
-
-    # read more sequences until EOF and eliminate substrings which are not included in each sequence
-    for seq in sequences:
-        # only take substrings which are in sequence
-        substrings = [subs for subs in substrings if subs in seq]
-
-    # sort remaining substrings by length
-    substrings.sort(key=lambda x: len(x))
-    # return the longest
-    return substrings[-1]
-
-
-def levenshtein_distance(s, t):
-    m, n = len(s), len(t)
-
-    # make dp matrix with 1 more position accounting for empty string
-    dp = [[0 for _ in range(n + 1)] for _ in range(m + 1)]
-
-    # fill up the matrix
-    # m= rows, n = cols
-    # edge cases (one of the strings is empty):
-    for i in range(m + 1):
-        dp[i][0] = i
-    for j in range(n + 1):
-        dp[0][j] = j
-
-        # fill up the table
-    for i in range(1, m+1):
-        for j in range(1, n+1):
-            # if characters are the same, copy diagonal value (no change needed):
-            # note the 1-offset between strings and dp matrix positions
-            if s[i-1] == t[j-1]:
-                dp[i][j] = dp[i - 1][j - 1]
-            else:
-                # otherwise take minial of the three possibilities:
-                # insertion, deletion of substitution
-                insertion = dp[i][j - 1]
-                deletion = dp[i - 1][j]
-                substitution = dp[i - 1][j - 1]
-                dp[i][j] = 1 + min(insertion, deletion, substitution)
-
-    # lower right corner of the dp matrix will be the sought edit distance
-    return dp[m][n]
+    substrings = longest_common_substrings(sequences)
+    # return the first one in alphabetical order, or an empty string if nothing is shared
+    return substrings[0] if substrings else ''
+
+
+def levenshtein_distance(s, t, max_distance: int = None) -> int:
+    """
+    Returns edit distance (substitutions, insertions and deletions) between two strings.
+
+    Without a threshold the bit-parallel algorithm is used. With max_distance, the answer is only exact up to
+    the threshold: a banded computation with early exit is used for narrow bands and anything above
+    the threshold is reported as max_distance + 1, which is enough to answer "is the distance <= k?".
+
+    The kernels are in rosalind.alignment.
+
+    :param s: First string.
+    :param t: Second string.
+    :param max_distance: Optional threshold k.
+    :return: Edit distance, or max_distance + 1 if it is larger than max_distance.
+    """
+
+    if max_distance is None:
+        return levenshtein_bitparallel(s, t)
+    if max_distance < 0:
+        raise ValueError('max_distance must not be negative!')
+
+    # the distance is at least the difference in length
+    if abs(len(s) - len(t)) > max_distance:
+        return max_distance + 1
+    # each band cell is a python operation while a bit-parallel column costs about one per 512 characters
+    if (2 * max_distance + 1) * 512 < min(len(s), len(t)) + 1024:
+        return levenshtein_banded(s, t, max_distance)
+    return min(levenshtein_bitparallel(s, t), max_distance + 1)
@@ -0,0 +1,274 @@
+"""
+Suffix array based engine for finding substrings shared between many sequences.
+
+The sequences are concatenated with unique separators into one generalized text.
+Its suffix array (built by prefix doubling) and LCP array (Kasai's algorithm) are then scanned
+with a sliding window to find the longest substrings that occur in at least m of the k sequences.
+
+Included functions:
+    suffix_array:               Returns the suffix array of a string or a list of integers.
+    lcp_array:                  Returns the longest-common-prefix array for a suffix array (Kasai's algorithm).
+    longest_common_substrings:  Returns all longest substrings shared by (at least m of) k sequences.
+"""
+
+from collections import deque
+from itertools import groupby
+from operator import itemgetter
+
+from .utils import _NUMPY_MIN_LENGTH, _numpy
+
+
+def _initial_ranks(text):
+    # ranks of the first L symbols of every suffix, packed into one integer of at most 62 bits (L >= 1)
+    alphabet = {c: r for r, c in enumerate(sorted(set(text)), start=1)}
+    base = len(alphabet) + 1  # 0 pads suffixes shorter than L
+    length = 1
+    while base ** (length + 1) < 1 << 62:
+        length += 1
+    top = base ** (length - 1)
+    packed = [0] * len(text)
+    key = 0
+    for i in range(len(text) - 1, -1, -1):
+        key = alphabet[text[i]] * top + key // base
+        packed[i] = key
+    return packed, length
+
+
+def _suffix_array_numpy(np, text):
+    # prefix doubling with numpy arrays; also returns the ranks of every round for _lcp_numpy
+    n = len(text)
+    if isinstance(text, str):
+        symbols = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    else:
+        symbols = np.asarray(text, dtype=np.int64)
+    rank = np.unique(symbols, return_inverse=True)[1].reshape(n).astype(np.int64)
+    sa = np.argsort(rank, kind='stable')
+    max_rank = int(rank[sa[-1]])
+    rank_dtype = np.int32 if n < 1 << 31 else np.int64
+    ranks = [rank.astype(rank_dtype)]
+
+    k = 1
+    while max_rank < n - 1:
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - k] = rank[k:]
+        keys = rank * (max_rank + 2) + second + 1
+        sa = np.argsort(keys)
+        sorted_keys = keys[sa]
+        new = np.zeros(n, dtype=np.int64)
+        new[1:] = np.cumsum(sorted_keys[1:] != sorted_keys[:-1])
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = new
+        max_rank = int(new[-1])
+        ranks.append(rank.astype(rank_dtype))
+        k *= 2
+    return sa, ranks
+
+
+def _lcp_numpy(np, sa, ranks):
+    # lcp of adjacent suffixes by binary lifting over the ranks of the doubling rounds:
+    # equal ranks in round j mean equal first 2^j symbols
+    n = len(sa)
+    lcp = np.zeros(n, dtype=np.int64)
+    if n < 2:
+        return lcp
+    p, q = sa[1:], sa[:-1]
+    h = np.zeros(n - 1, dtype=np.int64)
+    for j in range(len(ranks) - 1, -1, -1):
+        rank = ranks[j]
+        pj, qj = p + h, q + h
+        inside = (pj < n) & (qj < n)
+        equal = inside & (rank[np.minimum(pj, n - 1)] == rank[np.minimum(qj, n - 1)])
+        h += equal.astype(np.int64) << j
+    lcp[1:] = h
+    return lcp
+
+
+def suffix_array(text) -> list[int]:
+    """
+    Build the suffix array of a text by prefix doubling.
+
+    Each round sorts the suffixes by the ranks of their first 2^k characters, packed into a single integer key,
+    and the loop stops as soon as all ranks are unique. This is O(n log^2 n) in the worst case
+    but only needs as many rounds as the longest repeat requires. Long texts are sorted with numpy if it is
+    installed. Without numpy, the first round ranks the first few symbols packed into one integer, and later
+    rounds only re-sort the groups of suffixes that still share a prefix.
+
+    :param text: A string or a list of non-negative integers.
+    :return: List of suffix start positions in lexicographic order of the suffixes.
+    """
+
+    n = len(text)
+    if n == 0:
+        return []
+    np = _numpy() if n >= _NUMPY_MIN_LENGTH else None
+    if np is not None:
+        return _suffix_array_numpy(np, text)[0].tolist()
+
+    # rank of a suffix is the position in sa of the first suffix sharing its first k symbols,
+    # groups are the (start, end) ranges of sa whose suffixes still share their first k symbols
+    packed, k = _initial_ranks(text)
+    sa = sorted(range(n), key=packed.__getitem__)
+    rank = [0] * n
+    groups = []
+    start = 0
+    prev = packed[sa[0]]
+    for pos, i in enumerate(sa):
+        if packed[i] != prev:
+            if pos - start > 1:
+                groups.append((start, pos))
+            start = pos
+            prev = packed[i]
+        rank[i] = start
+    if n - start > 1:
+        groups.append((start, n))
+    del packed
+
+    while groups:
+        # sort every group by the rank of the suffix k symbols further, with -1 for suffixes shorter than k
+        sorted_groups = []
+        for start, end in groups:
+            members = sa[start:end]
+            keys = {i: rank[i + k] if i + k < n else -1 for i in members}
+            members.sort(key=keys.__getitem__)
+            sa[start:end] = members
+            sorted_groups.append((start, members, keys))
+
+        # split the groups by their keys, only after all groups are sorted by the ranks of this round
+        groups = []
+        for start, members in ((start, [(keys[i], i) for i in members]) for start, members, keys in sorted_groups):
+            for _, group in groupby(members, key=itemgetter(0)):
+                group = list(group)
+                for _, i in group:
+                    rank[i] = start
+                if len(group) > 1:
+                    groups.append((start, start + len(group)))
+                start += len(group)
+        k *= 2
+
+    return sa
+
+
+def lcp_array(text, sa: list[int]) -> list[int]:
+    """
+    Compute the LCP array with Kasai's algorithm in O(n).
+
+    lcp[i] is the length of the longest common prefix of the suffixes sa[i - 1] and sa[i]; lcp[0] is 0.
+
+    :param text: The text the suffix array was built for.
+    :param sa: Suffix array of text.
+    :return: List of LCP values.
+    """
+
+    n = len(text)
+    rank = [0] * n
+    for i, p in enumerate(sa):
+        rank[p] = i
+
+    lcp = [0] * n
+    h = 0
+    for p in range(n):
+        r = rank[p]
+        if r == 0:
+            h = 0
+            continue
+        q = sa[r - 1]
+        while p + h < n and q + h < n and text[p + h] == text[q + h]:
+            h += 1
+        lcp[r] = h
+        if h:
+            h -= 1
+    return lcp
+
+
+def longest_common_substrings(sequences, min_count: int = None) -> list[str]:
+    """
+    Find all longest substrings shared by at least min_count of the given sequences.
+
+    Runs in O(N log^2 N) time and O(N) memory for the total length N of all sequences. Python lists of N
+    integers are held, about 150 bytes per input character. With numpy, 20 sequences of 100 kb (N = 2 million)
+    take a few seconds, without it about three times as long; inputs of more than some 10 million characters
+    are better served by a dedicated tool.
+
+    :param sequences: An iterable of strings (it is not modified).
+    :param min_count: In how many sequences a substring has to occur, defaults to all of them.
+    :return: Sorted list of all distinct longest shared substrings ([] if there is no shared substring).
+    """
+
+    sequences = list(sequences)
+    k = len(sequences)
+    if k == 0:
+        raise ValueError('At least one sequence is required!')
+    if min_count is None:
+        min_count = k
+    if not 1 <= min_count <= k:
+        raise ValueError(f'min_count must be between 1 and the number of sequences ({k})')
+
+    # a single sequence shares all of itself
+    if min_count == 1:
+        longest = max(len(seq) for seq in sequences)
+        return sorted({seq for seq in sequences if len(seq) == longest}) if longest else []
+
+    # concatenate into one integer text with k unique separators smaller than all characters
+    alphabet = {c: r for r, c in enumerate(sorted(set().union(*sequences)), start=k)}
+    text = []
+    owner = []
+    starts = []
+    for i, seq in enumerate(sequences):
+        starts.append(len(text))
+        text.extend(alphabet[c] for c in seq)
+        text.append(i)
+        owner.extend([i] * (len(seq) + 1))
+
+    np = _numpy() if len(text) >= _NUMPY_MIN_LENGTH else None
+    if np is not None:
+        sa, ranks = _suffix_array_numpy(np, text)
+        lcp = _lcp_numpy(np, sa, ranks).tolist()
+        sa = sa.tolist()
+        del ranks
+    else:
+        sa = suffix_array(text)
+        lcp = lcp_array(text, sa)
+
+    # the k suffixes starting at separators sort first, skip them
+    best = 0
+    hits = []
+    counts = [0] * k
+    distinct = 0
+    window_min = deque()  # indices into sa with increasing lcp values
+    lo = k
+    for hi in range(k, len(sa)):
+        o = owner[sa[hi]]
+        if counts[o] == 0:
+            distinct += 1
+        counts[o] += 1
+        if hi > lo:
+            while window_min and lcp[window_min[-1]] >= lcp[hi]:
+                window_min.pop()
+            window_min.append(hi)
+
+        # shrink the window from the left as long as it still covers min_count sequences
+        while distinct >= min_count:
+            o = owner[sa[lo]]
+            if counts[o] == 1 and distinct == min_count:
+                break
+            counts[o] -= 1
+            if counts[o] == 0:
+                distinct -= 1
+            lo += 1
+            while window_min and window_min[0] <= lo:
+                window_min.popleft()
+
+        if distinct >= min_count and window_min:
+            length = lcp[window_min[0]]
+            if length > best:
+                best = length
+                hits = [sa[hi]]
+            elif length == best and length:
+                hits.append(sa[hi])
+
+    results = set()
+    for p in hits:
+        o = owner[p]
+        offset = p - starts[o]
+        results.add(sequences[o][offset:offset + best])
+    return sorted(results)
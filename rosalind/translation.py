@@ -0,0 +1,173 @@
+"""
+Translation of nucleic acid sequences into protein with the NCBI genetic codes.
+
+Codon tables are precomputed once at import. Sequences are converted to base codes with a byte translation table,
+the three positions of all codons are combined into one numeric codon index per codon with big integer arithmetic,
+and the indices are mapped to amino acids with another translation table. Stops are '*', codons with
+any other letter than A,C,G,T,U are 'X' and a trailing partial codon is ignored.
+
+Included functions:
+    codon_table:                Returns a genetic code as a dictionary like so: {codon:amino acid}.
+    translate:                  Translates one reading frame of a DNA/RNA sequence.
+    six_frame:                  Translates all three forward and three reverse complement frames.
+    translate_stream:           Translates a sequence given as an iterable of chunks, yielding protein chunks.
+"""
+
+from .alphabet import InvalidSequenceError
+from .kmer import _encode_bases
+
+# amino acids of the NCBI genetic codes, codons ordered TTT, TTC, TTA, TTG, TCT, ... (bases in T,C,A,G order)
+GENETIC_CODES = {
+    1: 'FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',
+    2: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG',
+    3: 'FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG',
+    4: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',
+    5: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG',
+    6: 'FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',
+    9: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG',
+    10: 'FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',
+    11: 'FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',
+    12: 'FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG',
+    13: 'FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG',
+    14: 'FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG',
+}
+
+GENETIC_CODE_NAMES = {
+    1: 'Standard',
+    2: 'Vertebrate Mitochondrial',
+    3: 'Yeast Mitochondrial',
+    4: 'Mold, Protozoan, and Coelenterate Mitochondrial and Mycoplasma/Spiroplasma',
+    5: 'Invertebrate Mitochondrial',
+    6: 'Ciliate, Dasycladacean and Hexamita Nuclear',
+    9: 'Echinoderm and Flatworm Mitochondrial',
+    10: 'Euplotid Nuclear',
+    11: 'Bacterial, Archaeal and Plant Plastid',
+    12: 'Alternative Yeast Nuclear',
+    13: 'Ascidian Mitochondrial',
+    14: 'Alternative Flatworm Mitochondrial',
+}
+
+# base codes of rosalind.kmer: A=0, C=1, G=2, T/U=3 (the complement of code c is 3 - c), 4 for any other letter
+_COMPLEMENT_CODES = bytes(3 - c if c < 4 else 4 for c in range(256))
+
+# codon index = first << 4 | second << 2 | third, bit 6 is set if any base of the codon is unknown
+_POSITION_TABLES = tuple(bytes(c << shift if c < 4 else 64 for c in range(256)) for shift in (4, 2, 0))
+
+# position of our base codes in the T,C,A,G order of GENETIC_CODES
+_NCBI_ORDER = (2, 1, 3, 0)
+
+
+def _amino_acid_table(code: str) -> bytes:
+    # amino acid of every codon index (and 'X' for indices of codons with unknown bases)
+    table = bytearray(b'X' * 256)
+    for index in range(64):
+        first, second, third = index >> 4, (index >> 2) & 3, index & 3
+        table[index] = ord(code[16 * _NCBI_ORDER[first] + 4 * _NCBI_ORDER[second] + _NCBI_ORDER[third]])
+    return bytes(table)
+
+
+_AMINO_ACID_TABLES = {table_id: _amino_acid_table(code) for table_id, code in GENETIC_CODES.items()}
+
+
+def _get_table(table: int) -> bytes:
+    try:
+        return _AMINO_ACID_TABLES[table]
+    except KeyError:
+        raise ValueError(f'Unknown genetic code {table!r}, available: {sorted(GENETIC_CODES)}') from None
+
+
+def codon_table(table: int = 1) -> dict[str, str]:
+    """
+    Return an NCBI genetic code as a dictionary of RNA codons.
+
+    :param table: NCBI genetic code number (1 is the standard code, 2 vertebrate mitochondrial, 11 bacterial, ...).
+    :return: Dictionary {codon:amino acid}, stops are '*'.
+    """
+
+    amino_acids = _get_table(table)
+    return {a + b + c: chr(amino_acids[i << 4 | j << 2 | k])
+            for i, a in enumerate('ACGU') for j, b in enumerate('ACGU') for k, c in enumerate('ACGU')}
+
+
+def _translate_codes(codes: bytes, amino_acids: bytes) -> str:
+    # translate base codes starting at the first base, ignoring a trailing partial codon
+    n = len(codes) // 3
+    if n == 0:
+        return ''
+    index = 0
+    for position, table in enumerate(_POSITION_TABLES):
+        index |= int.from_bytes(codes[position:3 * n:3].translate(table), 'big')
+    return index.to_bytes(n, 'big').translate(amino_acids).decode()
+
+
+def translate(seq, table: int = 1, frame: int = 0, to_stop: bool = False, strict: bool = False) -> str:
+    """
+    Translate one forward reading frame of a DNA or RNA sequence (str or bytes, any case).
+
+    :param seq: The sequence.
+    :param table: NCBI genetic code number.
+    :param frame: 0, 1 or 2 bases to skip at the start.
+    :param to_stop: Stop at (and exclude) the first stop codon.
+    :param strict: Raise InvalidSequenceError for letters other than A,C,G,T,U (checked on the encoded bases).
+    :return: Protein sequence, stops are '*', codons with unknown bases are 'X'.
+    """
+
+    amino_acids = _get_table(table)
+    codes = _encode_bases(seq, rna=True)
+    if strict and b'\x04' in codes:
+        raise InvalidSequenceError('Please enter a valid DNA/RNA sequence (a,t,g,c,u allowed)')
+    protein = _translate_codes(codes[frame:], amino_acids)
+    if to_stop:
+        stop = protein.find('*')
+        if stop != -1:
+            return protein[:stop]
+    return protein
+
+
+def six_frame(seq, table: int = 1) -> dict[str, str]:
+    """
+    Translate all six reading frames of a DNA or RNA sequence.
+
+    The sequence is encoded and reverse complemented once, frames -1, -2 and -3 start at the first,
+    second and third base of the reverse complement.
+
+    :param seq: The sequence (str or bytes).
+    :param table: NCBI genetic code number.
+    :return: Dictionary {frame:protein} with frames '+1', '+2', '+3', '-1', '-2', '-3'.
+    """
+
+    amino_acids = _get_table(table)
+    codes = _encode_bases(seq, rna=True)
+    reverse = codes[::-1].translate(_COMPLEMENT_CODES)
+    frames = {}
+    for strand, strand_codes in (('+', codes), ('-', reverse)):
+        for frame in range(3):
+            frames[f'{strand}{frame + 1}'] = _translate_codes(strand_codes[frame:], amino_acids)
+    return frames
+
+
+def translate_stream(chunks, table: int = 1, frame: int = 0):
+    """
+    Translate a forward reading frame of a sequence given in pieces, e.g. a chromosome read in blocks.
+
+    Only whole codons are translated per chunk and the remaining bases are carried over,
+    so memory depends on the chunk size only.
+
+    :param chunks: Iterable of str or bytes pieces of one sequence.
+    :param table: NCBI genetic code number.
+    :param frame: 0, 1 or 2 bases to skip at the start.
+    :return: Generator of protein pieces which concatenate to translate(sequence, table, frame).
+    """
+
+    amino_acids = _get_table(table)
+    skip = frame
+    carry = b''
+    for chunk in chunks:
+        codes = _encode_bases(chunk, rna=True)
+        if skip:
+            codes, skip = codes[skip:], max(0, skip - len(codes))
+        codes = carry + codes
+        whole = len(codes) - len(codes) % 3
+        carry = codes[whole:]
+        if whole:
+            yield _translate_codes(codes[:whole], amino_acids)
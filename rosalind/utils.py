@@ -2,97 +2,211 @@
 Auxiliary functions which are used in rosalind.sequence module.
 
 Includes functions:
+    iter_fasta:                 Streams a multi-line multi-sequence fasta file as (name, sequence) tuples.
     read_multifasta:            Reads multi-line multi-sequence fasta file into a dictionary like so: {name:sequence}.
     is_valid:                   Checks if a given string is a valid nucleic acid sequence.
     gc:                         Calculates GC% of a DNA/RNA sequence.
+    calculate_mw:               Calculates the mass of a protein.
 
 """
 
+import sys
+
+from .alphabet import ALPHABETS, validate_gc
+from .compression import open_compressed
+from .packed import PackedSequence
+
+# inputs shorter than this are processed faster in pure python than with the overhead of creating numpy arrays
+_NUMPY_MIN_LENGTH = 64
+
+_np = None
+_np_checked = False
+
+
+def _numpy():
+    """
+    The numpy module, or None if it is not installed.
+
+    numpy is an optional accelerator: every module has a pure python fallback and asks for numpy with this function
+    only where it uses it. numpy is imported on the first call, not with rosalind, so commands which never reach
+    a numpy code path (and every command line tool at startup) do not pay for loading it.
+    """
+
+    global _np, _np_checked
+    if not _np_checked:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np, _np_checked = numpy, True
+    return _np
+
+
+def _rosalind_modules():
+    # the loaded rosalind modules
+    for module_name, module in list(sys.modules.items()):
+        if module is not None and (module_name == 'rosalind' or module_name.startswith('rosalind.')):
+            yield module
+
+
+def _patch_functions(wrappers: dict):
+    """
+    Replace functions by wrappers in every loaded rosalind module that refers to them (used by rosalind.instrument
+    and rosalind.cache).
+
+    :param wrappers: Dictionary {id(original function):(original function, wrapper)}.
+    """
+
+    for module in _rosalind_modules():
+        for name, obj in list(vars(module).items()):
+            if id(obj) in wrappers and wrappers[id(obj)][0] is obj:
+                setattr(module, name, wrappers[id(obj)][1])
+
+
+def _unpatch_functions(marker: str):
+    """
+    Put the wrapped functions back in place of every wrapper with a true marker attribute in the rosalind modules.
+
+    :param marker: Attribute name set on the wrappers, e.g. '__cached_by_rosalind__'.
+    """
+
+    for module in _rosalind_modules():
+        for name, obj in list(vars(module).items()):
+            if getattr(obj, marker, False):
+                setattr(module, name, obj.__wrapped__)
+
+
+def iter_fasta(fasta_path, as_bytes: bool = False, chunk_size: int = 1 << 20, threads: int = None):
+    """
+    Stream a multiline fasta file one record at a time.
+
+    The file is read in large binary chunks. Sequence lines of a record are collected into a list
+    and joined once when the record is complete, so long sequences are built in linear time.
+    gzip and BGZF compressed files are detected and decompressed on the fly (see rosalind.compression).
+
+    :param fasta_path: Path to the fasta file or a binary file object (e.g. sys.stdin.buffer).
+    :param as_bytes: If True, sequences are yielded as bytes instead of str.
+    :param chunk_size: Number of bytes read from the file at once.
+    :param threads: Number of threads decompressing a BGZF file, defaults to the number of CPUs.
+    :return: Generator of (name[str], sequence[str or bytes]) tuples, names without >.
+    """
+
+    if hasattr(fasta_path, 'read'):
+        yield from _iter_fasta_records(open_compressed(fasta_path, threads), as_bytes, chunk_size)
+    else:
+        with open_compressed(fasta_path, threads) as f:
+            yield from _iter_fasta_records(f, as_bytes, chunk_size)
+
+
+def _iter_fasta_records(f, as_bytes, chunk_size):
+    """
+    Parse fasta records from an open binary file object (see iter_fasta).
+    """
+
+    name = None
+    parts = []
+    pending = b''
+
+    def make_record():
+        # join the collected lines once and drop all line breaks and whitespace in one pass
+        seq = b''.join(parts).translate(None, b' \t\r\n')
+        return name.decode(), seq if as_bytes else seq.decode()
+
+    while True:
+        chunk = f.read(chunk_size)
+        if chunk:
+            # only process whole lines, keep the unfinished last line for the next chunk
+            data = pending + chunk if pending else chunk
+            cut = data.rfind(b'\n') + 1
+            if cut == 0:
+                pending = data
+                continue
+            pending = data[cut:]
+            data = data[:cut]
+        elif pending:
+            # last line of the file without a trailing newline
+            data = pending + b'\n'
+            pending = b''
+        else:
+            break
+
+        pos = 0
+        while pos < len(data):
+            if data.startswith(b'>', pos):
+                eol = data.find(b'\n', pos)
+                if name is not None:
+                    yield make_record()
+                name = data[pos + 1:eol].strip()
+                parts = []
+                pos = eol + 1
+                continue
+            # everything up to the next header line belongs to the current sequence
+            nxt = data.find(b'\n>', pos)
+            end = len(data) if nxt == -1 else nxt + 1
+            if name is not None:
+                parts.append(data[pos:end])
+            # catch a case where there is no name before the sequence
+            elif data[pos:end].strip():
+                print('your fasta seems to be corrupt')
+            pos = end
+
+    if name is not None:
+        yield make_record()
+
 
 def read_multifasta(fasta_path):
     """
     A function to import multiline fasta into a dictionary.
 
     Returns a dictionary where key are sequence names (without >) and values are the sequences.
+    For large files prefer iter_fasta, which yields one record at a time.
 
-    :param fasta_path: Path to the fasta file.
+    :param fasta_path: Path to the fasta file (plain, gzip or BGZF compressed).
     :return: Dictionary {name[str]:sequence[str]}
     """
 
-    sequences = {}
-    with open(fasta_path, 'r') as f:
-        for line in f:
-            if line.startswith('>'):
-                name = line.strip()[1:]
-                sequences[name] = ''
-            else:
-                try:
-                    sequences[name] += line.strip()
-                # catch a case where there is no name before the sequence
-                except KeyError:
-                    print('your fasta seems to be corrupt')
-
-    return sequences
+    return dict(iter_fasta(fasta_path))
 
 
 def is_valid(dna: str) -> bool:
     """
     Checks if a string is a valid nucleic acid sequence (only A,T,G,C,U in any case).
-    Does not consider IUPAC code.
+    Does not consider IUPAC code, for other alphabets see rosalind.alphabet.
 
-    :param dna: DNA or RNA string.
+    :param dna: DNA or RNA string (or bytes).
     :return: whether it consists only of A,T,G,C,U letters (lowercase allowed).
     """
-    return set(dna.upper()) <= {'A', 'T', 'C', 'G', 'U'}
+    return ALPHABETS['nucleotide'].is_valid(dna)
 
 
 def gc(dna: str) -> float:
     """
     Calculate GC% of a nucleic acid string.
+    For GC content of many windows or intervals of a sequence use rosalind.gcprofile.GCProfile.
 
-    :param dna: DNA sequence.
+    :param dna: DNA sequence (str or PackedSequence).
     :return: A float representing %GC.
     """
-    if not is_valid(dna):
+    if isinstance(dna, PackedSequence):
+        return dna.gc()
+
+    # validation and counting in one pass
+    valid, content = validate_gc(dna)
+    if not valid:
         print('Please provide only DNA/RNA (A,T,G,C,U allowed')
 
-    dna = dna.upper()
-    return (dna.count('G') + dna.count('C')) / len(dna)
+    return content
 
 
 def calculate_mw(protein: str) -> float:
     """
-    This function calculates protein mass.
+    This function calculates protein mass (sum of monoisotopic residue masses).
+    For average masses, batches of proteins and fragment masses see rosalind.mass.
 
     :param protein: The sequence of the protein.
-    :return: Molecular weight of the protein.
-    """
-
-    if not protein.isupper():
-        protein = protein.upper()
-
-    mw = {"A": 71.03711,
-          "C": 103.00919,
-          "D": 115.02694,
-          "E": 129.04259,
-          "F": 147.06841,
-          "G": 57.02146,
-          "H": 137.05891,
-          "I": 113.08406,
-          "K": 128.09496,
-          "L": 113.08406,
-          "M": 131.04049,
-          "N": 114.04293,
-          "P": 97.05276,
-          "Q": 128.05858,
-          "R": 156.10111,
-          "S": 87.03203,
-          "T": 101.04768,
-          "V": 99.06841,
-          "W": 186.07931,
-          "Y": 163.06333}
-    try:
-        return sum(mw[aminoacid] for aminoacid in protein)
-    except KeyError:
-        print('Please provide a valid protein sequence.')
+    :return: Molecular weight of the protein. Raises ValueError for letters that are not amino acids.
+    """
+
+    from .mass import protein_mass  # imported on use, rosalind.mass loads numpy
 
+    return protein_mass(protein)
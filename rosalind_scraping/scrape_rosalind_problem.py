@@ -2,65 +2,211 @@ import requests
 import os
 from bs4 import BeautifulSoup
 import sys
+import argparse
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 """
-Example usage: python scrape_rosalind_problem.py https://rosalind.info/problems/tran/
+Example usage: python scrape_rosalind_problem.py tran
 
 Example output:
     1. Puzzle script: ../puzzles/transitions_and_transversions.py
     2. Puzzle sample input: ../puzzles/sample_data/transitions_and_transversions.txt
+
+Batch mode: python scrape_rosalind_problem.py fib tran lcsq --concurrency 8
+    Pages are fetched concurrently over one pooled session with retries and stored in an on-disk HTTP cache
+    (.rosalind_cache), so reruns only revalidate (ETag/Last-Modified) or skip pages which have not expired.
+    Templates are parsed and written in parallel processes.
 """
 
-def scrape_rosalind_problem(problem_suffix: str):
+BASE_URL = "https://rosalind.info/problems/"
+
+
+class HttpCache:
     """
-    This opens a rosalind problem and creates the following template files:
-    
-    problem_name.py in puzzles - script to write your code into
-    problem_name.txt - sample input form the description (fasta)
-    
-    :param problem_suffix: last part of url address of the puzzle to be scraped, 
-                    like "fib" in https://rosalind.info/problems/fib/
+    A small on-disk HTTP cache: one body file and one metadata file (ETag, Last-Modified, expiry) per URL.
+
+    Entries are fresh until their expiry (from Cache-Control max-age, Expires, or default_ttl),
+    afterwards they are revalidated with a conditional request.
+
+    :param cache_dir: Directory of the cache files.
+    :param default_ttl: Seconds an entry stays fresh if the server sends no expiry.
     """
-    
-    # get the name of the dataset
-    #problem_suffix = [s for s in url.split('/') if s][-1]
-    dataset_name = os.path.join('..', 'data', 'rosalind_' + problem_suffix + '.txt')
 
+    def __init__(self, cache_dir='.rosalind_cache', default_ttl=24 * 3600):
+        self.cache_dir = cache_dir
+        self.default_ttl = default_ttl
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.cache_dir, key + '.body'), os.path.join(self.cache_dir, key + '.json')
+
+    def get(self, url):
+        """
+        Return (body, metadata) of a cached URL, or (None, None).
+        """
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as m, open(body_path, 'rb') as b:
+                return b.read(), json.load(m)
+        except (OSError, ValueError):
+            return None, None
+
+    def put(self, url, body, headers):
+        """
+        Store a response body with its validators and expiry (atomically, so concurrent runs never see partial files).
+        With body None (a 304 response) the cached body is kept, and so are its validators unless the new headers
+        replace them.
+        """
+        body_path, meta_path = self._paths(url)
+        meta = {'url': url,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'expires': self.expiry(headers)}
+        if body is None:
+            # a 304 often carries no validators, keep the cached ones so later requests stay conditional
+            _, cached = self.get(url)
+            if cached:
+                meta['etag'] = meta['etag'] or cached.get('etag')
+                meta['last_modified'] = meta['last_modified'] or cached.get('last_modified')
+        else:
+            tmp = body_path + f'.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as b:
+                b.write(body)
+            os.replace(tmp, body_path)
+        tmp = meta_path + f'.{os.getpid()}.tmp'
+        with open(tmp, 'w') as m:
+            json.dump(meta, m)
+        os.replace(tmp, meta_path)
+        return meta
+
+    def expiry(self, headers):
+        """
+        Unix time until which a response is fresh.
+        """
+        cache_control = headers.get('Cache-Control', '')
+        for directive in cache_control.split(','):
+            directive = directive.strip().lower()
+            if directive in ('no-cache', 'no-store'):
+                return 0
+            if directive.startswith('max-age='):
+                try:
+                    return time.time() + int(directive.split('=', 1)[1])
+                except ValueError:
+                    pass
+        if headers.get('Expires'):
+            try:
+                return parsedate_to_datetime(headers['Expires']).timestamp()
+            except (TypeError, ValueError):
+                return 0
+        return time.time() + self.default_ttl
+
+
+def make_session(concurrency=8, retries=3):
+    """
+    A requests session with a connection pool for concurrent requests and retries with backoff.
+    """
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=('GET',))
+    adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def fetch(url, session=None, cache=None, timeout=30):
+    """
+    GET a page, from the cache if it is fresh, revalidating it if it has expired.
+
+    :param url: Page URL.
+    :param session: requests session (a new one is made if None).
+    :param cache: HttpCache or None to always fetch.
+    :param timeout: Seconds to wait for the server.
+    :return: Page content as bytes.
+    """
+    if session is None:
+        session = make_session()
+
+    headers = {}
+    body = None
+    if cache is not None:
+        body, meta = cache.get(url)
+        if body is not None:
+            if meta['expires'] > time.time():
+                return body
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and body is not None:
+        # not modified: keep the body, refresh the expiry
+        cache.put(url, None, response.headers)
+        return body
+    response.raise_for_status()
+    if cache is not None:
+        cache.put(url, response.content, response.headers)
+    return response.content
+
+
+def parse_problem(html):
+    """
+    Extract title, description, sample data and answer from a problem page.
+    """
+    soup = BeautifulSoup(html, "html.parser")
 
-    # get the html of the page
-    base_url = "https://rosalind.info/problems/"
-    response = requests.get(base_url + problem_suffix)
-    soup = BeautifulSoup(response.content, "html.parser")
-    
     # problem title and file names
     title = soup.find('h1').text.split('\r\n')[0]
-    puzzle = title.lower().replace(' ','_')
-    file_name = puzzle + '.py'
-    sample_data_path = os.path.join('..','puzzles','sample_data',puzzle+'.txt')
-
-    # description text
-    ps = soup.find_all("p")
     topics = soup.find('p', class_='topics')
-    
+
     # sample data and answer
     sample_data = soup.find_all('div', class_='codehilite')
-    sample = sample_data[0].text
-    answer = sample_data[1].text
-    
+    return {'title': title,
+            'puzzle': title.lower().replace(' ', '_'),
+            'topics': topics.text if topics else None,
+            # description text
+            'paragraphs': [p.text for p in soup.find_all("p")],
+            'sample': sample_data[0].text,
+            'answer': sample_data[1].text}
+
+
+def write_templates(problem, problem_suffix, puzzles_dir=os.path.join('..', 'puzzles'),
+                    data_dir=os.path.join('..', 'data')):
+    """
+    Write the solution template and the sample input of a parsed problem.
+    """
+    # get the name of the dataset
+    dataset_name = os.path.join(data_dir, 'rosalind_' + problem_suffix + '.txt')
+
+    title = problem['title']
+    puzzle = problem['puzzle']
+    ps = problem['paragraphs']
+    answer = problem['answer']
+    file_name = puzzle + '.py'
+    sample_data_path = os.path.join(puzzles_dir, 'sample_data', puzzle + '.txt')
+
     # write everything to a file
-    with open(os.path.join('..','puzzles',file_name), 'w') as f:
+    with open(os.path.join(puzzles_dir, file_name), 'w') as f:
         f.write('from rosalind.utils import read_multifasta\n\n')
         # function definition to solve the puzzle
         f.write('def solve_' + puzzle + '(fasta_path):\n')
         # write docstring from description
         f.write('\t"""\n')
         f.write('\t'+title+'\n\n')
-        if topics:
-            f.write('\t'+topics.text+'\n\n')
-        f.writelines(['\t'+p.text+'\n' for p in ps[2:6]])
+        if problem['topics']:
+            f.write('\t'+problem['topics']+'\n\n')
+        f.writelines(['\t'+p+'\n' for p in ps[2:6]])
         f.write('\n')
-        f.write('\t'+ps[6].text+'\n')
-        f.write('\t'+ps[7].text+'\n')
+        f.write('\t'+ps[6]+'\n')
+        f.write('\t'+ps[7]+'\n')
         f.write('\n\t"""\n\n')
         # Write body of the function: import fasta
         f.write('\t# Import sample sequences\n')
@@ -77,18 +223,89 @@ def scrape_rosalind_problem(problem_suffix: str):
         f.write('\t\tprint(f"{ans} is wrong")\n')
         f.write('\tprint("------rosalind problem------")\n')
         f.write('\t' + f'#print(solve_{puzzle}("{dataset_name}"))')
-        f.close()    
 
     # write a sample input file
     with open(sample_data_path, 'w') as t:
-        t.write(sample)
-        t.close()
-    
-    
+        t.write(problem['sample'])
+
+    return os.path.join(puzzles_dir, file_name)
+
+
+def _parse_and_write(html, problem_suffix, puzzles_dir, data_dir):
+    return write_templates(parse_problem(html), problem_suffix, puzzles_dir, data_dir)
+
+
+def scrape_rosalind_problem(problem_suffix: str, base_url=BASE_URL, session=None, cache=None, timeout=30,
+                            puzzles_dir=os.path.join('..', 'puzzles'), data_dir=os.path.join('..', 'data')):
+    """
+    This opens a rosalind problem and creates the following template files:
+
+    problem_name.py in puzzles - script to write your code into
+    problem_name.txt - sample input form the description (fasta)
+
+    :param problem_suffix: last part of url address of the puzzle to be scraped,
+                    like "fib" in https://rosalind.info/problems/fib/
+    """
+    # get the html of the page
+    html = fetch(base_url + problem_suffix, session, cache, timeout)
+    return write_templates(parse_problem(html), problem_suffix, puzzles_dir, data_dir)
+
+
+def scrape_rosalind_problems(problem_suffixes, base_url=BASE_URL, concurrency=8, retries=3, timeout=30,
+                             cache_dir='.rosalind_cache', puzzles_dir=os.path.join('..', 'puzzles'),
+                             data_dir=os.path.join('..', 'data')):
+    """
+    Batch mode: fetch many problems concurrently and write their templates in parallel.
+
+    :param problem_suffixes: last parts of the problem urls, like ["fib", "tran"]
+    :param base_url: url the suffixes are appended to (e.g. a local test server)
+    :param concurrency: maximal number of simultaneous requests (and pooled connections)
+    :param retries: retries of failed requests, with exponential backoff
+    :param timeout: seconds to wait for the server
+    :param cache_dir: directory of the on-disk HTTP cache, None to disable caching
+    :return: dictionary {suffix: path of the written script, or the exception if it failed}
+    """
+    session = make_session(concurrency, retries)
+    cache = HttpCache(cache_dir) if cache_dir else None
+    suffixes = list(dict.fromkeys(problem_suffixes))
+
+    def fetch_one(suffix):
+        try:
+            return fetch(base_url + suffix, session, cache, timeout)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pages = dict(zip(suffixes, pool.map(fetch_one, suffixes)))
+    session.close()
+
+    results = {s: page for s, page in pages.items() if isinstance(page, Exception)}
+    with ProcessPoolExecutor() as pool:
+        futures = {s: pool.submit(_parse_and_write, page, s, puzzles_dir, data_dir)
+                   for s, page in pages.items() if not isinstance(page, Exception)}
+        for s, future in futures.items():
+            try:
+                results[s] = future.result()
+            except Exception as e:
+                results[s] = e
+    return {s: results[s] for s in suffixes}
+
 
 if __name__=="__main__":
-    try:
-        url = sys.argv[1]
-        scrape_rosalind_problem(url)
-    except:
-        print("Please provide a valid Rosalind suffix (last part of problem url) as the first argument")
+    parser = argparse.ArgumentParser(description='Create solution templates for Rosalind problems.')
+    parser.add_argument('suffixes', nargs='+', help='last part of problem urls, like "fib"')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--cache-dir', default='.rosalind_cache')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--base-url', default=BASE_URL)
+    args = parser.parse_args()
+
+    results = scrape_rosalind_problems(args.suffixes, args.base_url, args.concurrency, args.retries, args.timeout,
+                                       None if args.no_cache else args.cache_dir)
+    for suffix, result in results.items():
+        if isinstance(result, Exception):
+            print(f"{suffix}: Please provide a valid Rosalind suffix (last part of problem url) ({result})")
+        else:
+            print(f"{suffix}: {result}")
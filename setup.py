@@ -8,11 +8,14 @@ setup(
     long_description=open("README.rst").read(),
     url="https://github.com/slebedeva/rosalind",
     license="MIT",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=[],
+    extras_require={
+        "fast": ["numpy"],
+    },
     entry_points={
         "console_scripts": [
-            "rosalind = mypackage.cli:main",
+            "rosalind = rosalind.cli:main",
         ],
     },
     classifiers=[
@@ -0,0 +1,56 @@
+from unittest import TestCase
+from rosalind.alignment import *
+import random
+
+
+def full_matrix_distance(s, t):
+    dp = [[i + j if i == 0 or j == 0 else 0 for j in range(len(t) + 1)] for i in range(len(s) + 1)]
+    for i in range(1, len(s) + 1):
+        for j in range(1, len(t) + 1):
+            dp[i][j] = min(dp[i - 1][j] + 1, dp[i][j - 1] + 1, dp[i - 1][j - 1] + (s[i - 1] != t[j - 1]))
+    return dp[-1][-1]
+
+
+class Test(TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.pairs = [(''.join(rng.choice('ACG') for _ in range(rng.randint(0, 15))),
+                       ''.join(rng.choice('ACG') for _ in range(rng.randint(0, 15)))) for _ in range(300)]
+
+    def test_levenshtein_two_row(self):
+        self.assertEqual(levenshtein_two_row('PLEASANTLY', 'MEANLY'), 5)
+        for s, t in self.pairs:
+            self.assertEqual(levenshtein_two_row(s, t), full_matrix_distance(s, t))
+
+    def test_levenshtein_bitparallel(self):
+        self.assertEqual(levenshtein_bitparallel('PLEASANTLY', 'MEANLY'), 5)
+        self.assertEqual(levenshtein_bitparallel('A' * 100 + 'C', 'A' * 100), 1)
+        for s, t in self.pairs:
+            self.assertEqual(levenshtein_bitparallel(s, t), full_matrix_distance(s, t))
+
+    def test_levenshtein_banded(self):
+        self.assertEqual(levenshtein_banded('PLEASANTLY', 'MEANLY', 2), 3)
+        for s, t in self.pairs:
+            d = full_matrix_distance(s, t)
+            for k in range(6):
+                self.assertEqual(levenshtein_banded(s, t, k), min(d, k + 1))
+
+    def test_align(self):
+        alignment = align('PLEASANTLY', 'MEANLY')
+        self.assertEqual(alignment.cost, 5)
+        self.assertEqual(alignment.aligned_s.replace('-', ''), 'PLEASANTLY')
+        self.assertEqual(alignment.aligned_t.replace('-', ''), 'MEANLY')
+        self.assertEqual(len(alignment.ops), len(alignment.aligned_s))
+
+    def test_align_long(self):
+        # long enough to go through the divide-and-conquer steps
+        rng = random.Random(1)
+        s = ''.join(rng.choice('ACGT') for _ in range(300))
+        t = ''.join(c for c in s if rng.random() > 0.1) + 'ACGT'
+        alignment = align(s, t)
+        self.assertEqual(alignment.cost, levenshtein_two_row(s, t))
+        self.assertEqual(alignment.aligned_s.replace('-', ''), s)
+        self.assertEqual(alignment.aligned_t.replace('-', ''), t)
+        self.assertEqual(align(t, s).cost, alignment.cost)
+        # with expensive gaps, mismatches are preferred
+        self.assertEqual(align('ACGT', 'AGGT', mismatch=1, gap=5).ops, '=X==')
@@ -0,0 +1,33 @@
+from unittest import TestCase
+from rosalind.alphabet import *
+
+
+class Test(TestCase):
+    def test_is_valid(self):
+        self.assertTrue(is_valid('ACGTUacgtu'))
+        self.assertTrue(is_valid(b'ACGT', 'dna'))
+        self.assertFalse(is_valid('ACGU', 'dna'))
+        self.assertFalse(is_valid('ACGN'))
+        self.assertTrue(is_valid('ACGNryk', 'iupac'))
+        self.assertTrue(is_valid('MKVLA', 'protein'))
+        self.assertFalse(is_valid('MKVLAB', 'protein'))
+        self.assertFalse(is_valid('ACGé'))
+        self.assertTrue(is_valid(''))
+        with self.assertRaises(ValueError):
+            is_valid('ACGT', 'klingon')
+
+    def test_normalize(self):
+        self.assertEqual(normalize('acgTu'), 'ACGTU')
+        self.assertEqual(normalize(b'acgn', 'iupac'), b'ACGN')
+        self.assertEqual(normalize('acgn', Alphabet('custom', 'ACGN')), 'ACGN')
+        with self.assertRaises(InvalidSequenceError):
+            normalize('acgn')
+
+    def test_validate_gc(self):
+        self.assertEqual(validate_gc('ggcA'), (True, 0.75))
+        self.assertEqual(validate_gc(b'GCAT', 'dna'), (True, 0.5))
+        self.assertEqual(validate_gc('GCNN'), (False, 0.5))
+        self.assertEqual(validate_gc('SWNN', 'iupac'), (True, 0.25))
+        # a custom alphabet does not reuse the table of a builtin one with the same name
+        self.assertEqual(validate_gc('GCNN', Alphabet('DNA', 'ACGTN')), (True, 0.5))
+        self.assertEqual(validate_gc('GCNN', 'dna'), (False, 0.5))
@@ -0,0 +1,117 @@
+from unittest import TestCase
+from rosalind import cache, instrument
+from rosalind.packed import PackedSequence
+from concurrent.futures import ProcessPoolExecutor
+import rosalind.pairwise
+import rosalind.sequence
+import os
+import pickle
+import tempfile
+
+
+def _cached_distance(path):
+    with cache.cached(path):
+        return rosalind.sequence.levenshtein_distance('KITTEN', 'SITTING'), cache.stats()
+
+
+class Test(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cache.sqlite')
+
+    def tearDown(self):
+        cache.disable()
+        cache.reset()
+        instrument.disable()
+        instrument.reset()
+        self.tmp.cleanup()
+
+    def test_cache_key(self):
+        key = cache.cache_key('f', {'s': 'ACGT', 't': ['A', b'C'], 'k': 3})
+        self.assertEqual(key, cache.cache_key('f', {'s': 'ACGT', 't': ['A', b'C'], 'k': 3}))
+        self.assertNotEqual(key, cache.cache_key('g', {'s': 'ACGT', 't': ['A', b'C'], 'k': 3}))
+        self.assertNotEqual(key, cache.cache_key('f', {'s': 'ACGT', 't': ['A', 'C'], 'k': 3}))
+        self.assertNotEqual(cache.cache_key('f', {'s': 'AB', 't': 'C'}), cache.cache_key('f', {'s': 'A', 't': 'BC'}))
+        self.assertEqual(cache.cache_key('f', {'s': PackedSequence('ACGT')}),
+                         cache.cache_key('f', {'s': PackedSequence('acgt')}))
+
+    def test_memory_tier(self):
+        original = rosalind.sequence.translate_rna
+        with cache.cached():
+            self.assertIsNot(rosalind.sequence.translate_rna, original)
+            self.assertEqual(rosalind.sequence.translate_rna('AUGGCC'), 'MA')
+            self.assertEqual(rosalind.sequence.translate_rna('AUGGCC'), 'MA')
+            self.assertEqual(rosalind.sequence.translate_rna(rna='AUGGCC', table=1), 'MA')
+            self.assertEqual(rosalind.sequence.translate_rna('AUGGCC', 2), 'MA')
+        self.assertIs(rosalind.sequence.translate_rna, original)
+        stats = cache.stats()['rosalind.sequence.translate_rna']
+        self.assertEqual((stats['memory_hits'], stats['disk_hits'], stats['misses']), (2, 0, 2))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_disk_tier(self):
+        sequences = ['GATTACA', 'TAGACCA', 'ATACA']
+        expected = rosalind.sequence.longest_common_substring(sequences)
+        with cache.cached(self.path):
+            self.assertEqual(rosalind.sequence.longest_common_substring(sequences), expected)
+        # a new process (here: a new cache) finds the result on disk
+        with cache.cached(self.path):
+            self.assertEqual(rosalind.sequence.longest_common_substring(sequences), expected)
+        stats = cache.stats()['rosalind.sequence.longest_common_substring']
+        self.assertEqual((stats['memory_hits'], stats['disk_hits'], stats['misses']), (0, 1, 1))
+
+    def test_processes(self):
+        with ProcessPoolExecutor(2) as pool:
+            results = list(pool.map(_cached_distance, [self.path] * 4))
+        self.assertEqual([distance for distance, _ in results], [3] * 4)
+        with cache.cached(self.path):
+            rosalind.sequence.levenshtein_distance('KITTEN', 'SITTING')
+        self.assertEqual(cache.stats()['rosalind.sequence.levenshtein_distance']['disk_hits'], 1)
+
+    def test_disk_eviction(self):
+        store = cache.ResultCache(self.path, max_items=1, max_disk_bytes=1000)
+        for i in range(20):
+            store.put(bytes([i]), 'A' * 100)
+        self.assertLessEqual(store.disk_bytes(), 1000)
+        self.assertEqual(store.get(bytes([19])), ('memory', 'A' * 100))
+        self.assertEqual(store.get(bytes([18])), ('disk', 'A' * 100))
+        self.assertEqual(store.get(bytes([0])), (None, None))
+        store.clear()
+        self.assertEqual(store.disk_bytes(), 0)
+        store.put(b'a', 'A' * 100)
+        store.put(b'a', 'A' * 200)
+        self.assertEqual(store.disk_bytes(), len(pickle.dumps('A' * 200, protocol=pickle.HIGHEST_PROTOCOL)))
+        store.close()
+
+    def test_disk_access_times(self):
+        store = cache.ResultCache(self.path, max_items=1)
+        store.put(b'a', 'A')
+        store.put(b'b', 'B')
+        connection = store._connect()
+        used = connection.execute("SELECT used FROM results WHERE key = x'61'").fetchone()[0]
+        # a recent access time is not rewritten on a disk hit, an old one is
+        self.assertEqual(store.get(b'a'), ('disk', 'A'))
+        self.assertEqual(connection.execute("SELECT used FROM results WHERE key = x'61'").fetchone()[0], used)
+        connection.execute("UPDATE results SET used = 0 WHERE key = x'62'")
+        self.assertEqual(store.get(b'b'), ('disk', 'B'))
+        self.assertGreater(connection.execute("SELECT used FROM results WHERE key = x'62'").fetchone()[0], 0)
+        store.close()
+
+    def test_pairwise_early_exit(self):
+        sequences = ['ACGTACGT', 'ACGTACGA', 'TTTTCCCC']
+        expected = list(rosalind.pairwise.close_pairs(sequences, 1, 'levenshtein', jobs=1))
+        with cache.cached():
+            self.assertEqual(list(rosalind.pairwise.close_pairs(sequences, 1, 'levenshtein', jobs=1)), expected)
+            # the distances were computed with the threshold, through the caching wrapper
+            key = cache.cache_key('rosalind.sequence.levenshtein_distance',
+                                  {'s': 'ACGTACGT', 't': 'TTTTCCCC', 'max_distance': 1})
+            self.assertEqual(cache._cache.get(key), ('memory', 2))
+
+    def test_with_instrumentation(self):
+        original = rosalind.sequence.translate_rna
+        instrument.enable()
+        cache.enable()
+        rosalind.sequence.translate_rna('AUG')
+        self.assertEqual(instrument.stats()['rosalind.sequence.translate_rna']['calls'], 1)
+        cache.disable()
+        instrument.disable()
+        self.assertIs(rosalind.sequence.translate_rna, original)
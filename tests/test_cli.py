@@ -0,0 +1,75 @@
+from unittest import TestCase, mock
+from rosalind.cli import main
+import io
+import os
+import tempfile
+
+
+class Test(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'test.fa')
+        with open(self.path, 'w') as f:
+            f.write('>seq1\nATGGCC\nTAAGG\n>seq2\nATGCATGCA\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *argv):
+        out = io.BytesIO()
+        self.assertFalse(main(list(argv), out=out))
+        return out.getvalue().decode()
+
+    def assert_fails(self, message, *argv):
+        with mock.patch('sys.stderr', new_callable=io.StringIO) as err:
+            self.assertEqual(main(list(argv), out=io.BytesIO()), 1)
+        self.assertTrue(err.getvalue().startswith('rosalind: '))
+        self.assertIn(message, err.getvalue())
+
+    def test_revcomp(self):
+        self.assertEqual(self.run_cli('revcomp', self.path, '--line-width', '5'),
+                         '>seq1\nCCTTA\nGGCCA\nT\n>seq2\nTGCAT\nGCAT\n')
+        with open(self.path, 'w') as f:
+            f.write('>ok\nACGT\n>bad\nPlease\n')
+        self.assert_fails('Record bad', 'revcomp', self.path)
+
+    def test_translate(self):
+        self.assertEqual(self.run_cli('translate', self.path), '>seq1\nMA*\n>seq2\nMHA\n')
+        self.assertEqual(self.run_cli('translate', self.path, '--to-stop').split('\n')[1], 'MA')
+        self.assertEqual(self.run_cli('translate', self.path, '--six-frame').count('>'), 12)
+
+    def test_gc(self):
+        self.assertEqual(self.run_cli('gc', self.path, '--jobs', '2'), f'seq1\t{6 / 11}\nseq2\t{4 / 9}\n')
+        # warnings about invalid records go to stderr, not into the table
+        with open(self.path, 'w') as f:
+            f.write('>bad\nGCXX\n')
+        with mock.patch('sys.stderr', new_callable=io.StringIO) as err:
+            self.assertEqual(self.run_cli('gc', self.path), 'bad\t0.5\n')
+        self.assertIn('Record bad', err.getvalue())
+
+    def test_motif(self):
+        self.assertEqual(self.run_cli('motif', self.path, '-m', 'ATG', '-m', 'GCA'),
+                         'seq1\tATG\t1\nseq1\tGCA\t\nseq2\tATG\t1 5\nseq2\tGCA\t3 7\n')
+
+    def test_hamming(self):
+        with open(self.path, 'w') as f:
+            f.write('>seq1\nATGCA\n>seq2\nATGGA\n>seq3\nTTGCA\n')
+        self.assertEqual(self.run_cli('hamming', self.path), 'seq1\t0\nseq2\t1\nseq3\t1\n')
+        self.assertEqual(self.run_cli('hamming', self.path, '--query', 'ATGGA'), 'seq1\t1\nseq2\t0\nseq3\t2\n')
+        self.assert_fails('must be the same', 'hamming', self.path, '--query', 'ATG')
+
+    def test_lcs(self):
+        self.assertEqual(self.run_cli('lcs', self.path), 'ATG\n')
+        self.assertEqual(self.run_cli('lcs', self.path, '--all', '--min-count', '1'), 'ATGGCCTAAGG\n')
+
+    def test_kmers(self):
+        counts = self.run_cli('kmers', self.path, '-k', '3', '--forward', '--min-count', '2')
+        self.assertEqual(counts, 'ATG\t3\nGCA\t2\nTGC\t2\n')
+        spectrum = self.run_cli('kmers', self.path, '-k', '3', '--forward', '--spectrum')
+        self.assertEqual(spectrum, '1\t9\n2\t2\n3\t1\n')
+        self.assertIn('ATG\t4\n', self.run_cli('kmers', self.path, '-k', '3'))  # ATG and CAT
+
+    def test_mw(self):
+        with open(self.path, 'w') as f:
+            f.write('>p\nSKADYEK\n')
+        self.assertAlmostEqual(float(self.run_cli('mw', self.path).split('\t')[1]), 821.392, places=2)
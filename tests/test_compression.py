@@ -0,0 +1,69 @@
+from unittest import TestCase
+from rosalind.compression import *
+from rosalind.utils import iter_fasta, read_multifasta
+from gzip import BadGzipFile
+import gzip
+import io
+import os
+import random
+import tempfile
+
+
+class Test(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = random.Random(3)
+        self.records = {f'seq{i}': ''.join(rng.choice('ACGT') for _ in range(rng.randint(1, 20000))) for i in range(10)}
+        self.data = ''.join(f'>{name}\n' + '\n'.join(seq[i:i + 60] for i in range(0, len(seq), 60)) + '\n'
+                            for name, seq in self.records.items()).encode()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_write_bgzf(self):
+        out = io.BytesIO()
+        write_bgzf(self.data, out)
+        compressed = out.getvalue()
+        self.assertTrue(is_bgzf(compressed))
+        self.assertFalse(is_bgzf(gzip.compress(self.data)))
+        # BGZF is valid (multi-member) gzip
+        self.assertEqual(gzip.decompress(compressed), self.data)
+
+    def test_open_compressed(self):
+        out = io.BytesIO()
+        write_bgzf(self.data, out)
+        members = gzip.compress(self.data[:1000]) + gzip.compress(self.data[1000:])
+        for content in (self.data, out.getvalue(), gzip.compress(self.data), members):
+            with open_compressed(self.path('test.fa', content), threads=3) as f:
+                self.assertEqual(f.read(), self.data)
+            self.assertEqual(open_compressed(io.BytesIO(content)).read(), self.data)
+
+    def test_bgzf_reader_small_batches(self):
+        out = io.BytesIO()
+        write_bgzf(self.data, out)
+        out.seek(0)
+        with BgzfReader(out, threads=2, blocks_per_task=1) as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_corrupt_bgzf(self):
+        out = io.BytesIO()
+        write_bgzf(self.data, out)
+        corrupt = bytearray(out.getvalue())
+        corrupt[-36] ^= 0xff  # crc of the last data block, before the 28 byte end-of-file block
+        with self.assertRaises(BadGzipFile):
+            open_compressed(io.BytesIO(bytes(corrupt))).read()
+
+    def test_iter_fasta_compressed(self):
+        bgzf_path = os.path.join(self.tmp.name, 'test.fa.bgz')
+        write_bgzf(self.data, bgzf_path)
+        gzip_path = self.path('test.fa.gz', gzip.compress(self.data))
+        self.assertEqual(dict(iter_fasta(bgzf_path, threads=2)), self.records)
+        self.assertEqual(read_multifasta(gzip_path), self.records)
+        with open(gzip_path, 'rb') as f:
+            self.assertEqual(dict(iter_fasta(f)), self.records)
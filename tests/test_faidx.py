@@ -0,0 +1,71 @@
+from unittest import TestCase
+from rosalind.faidx import *
+import os
+import tempfile
+
+
+class Test(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'test.fa')
+        with open(self.path, 'w') as f:
+            f.write('>chr1\nACGTA\nCGTAC\nGT\n>chr2\nTTTT\nGG')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_build_index(self):
+        index = build_index(self.path)
+        self.assertEqual(index['chr1'], FaidxEntry('chr1', 12, 6, 5, 6))
+        self.assertEqual(index['chr2'], FaidxEntry('chr2', 6, 27, 4, 5))
+        self.assertEqual(read_index(self.path + '.fai'), index)
+
+    def test_build_index_inconsistent_lines(self):
+        with open(self.path, 'w') as f:
+            f.write('>chr1\nACG\nACGTA\n')
+        with self.assertRaises(ValueError):
+            build_index(self.path)
+
+    def test_build_index_names(self):
+        # names are full header lines, a duplicate name would make an earlier record unreachable
+        with open(self.path, 'w') as f:
+            f.write('>chr1 first\nACGT\n>chr1 second\nGG\n')
+        self.assertEqual(list(build_index(self.path)), ['chr1 first', 'chr1 second'])
+        with open(self.path, 'w') as f:
+            f.write('>chr1\nACGT\n>chr2\nGG\n>chr1\nTT\n')
+        with self.assertRaisesRegex(ValueError, 'Duplicate'):
+            build_index(self.path)
+
+    def test_indexed_fasta(self):
+        with IndexedFasta(self.path) as fa:
+            self.assertEqual(str(fa['chr1']), 'ACGTACGTACGT')
+            self.assertEqual(fa['chr1'][4:11], 'ACGTACG')
+            self.assertEqual(fa['chr1'][-1], 'T')
+            self.assertEqual(fa['chr1'][::-1], 'TGCATGCATGCA')
+            self.assertEqual(fa['chr2'][2:100], 'TTGG')
+            self.assertEqual(len(fa['chr2']), 6)
+            self.assertEqual(list(fa), ['chr1', 'chr2'])
+
+    def test_stale_index(self):
+        with IndexedFasta(self.path) as fa:
+            self.assertEqual(str(fa['chr1']), 'ACGTACGTACGT')
+        # the fasta is edited after the index was built
+        with open(self.path, 'w') as f:
+            f.write('>chr0\nTT\n>chr1\nGGGGG\n')
+        index_time = os.stat(self.path + '.fai').st_mtime
+        os.utime(self.path, (index_time + 10, index_time + 10))
+        with IndexedFasta(self.path) as fa:
+            self.assertEqual(str(fa['chr1']), 'GGGGG')
+        # an index which does not fit the file is rebuilt even if it is newer
+        with open(self.path, 'w') as f:
+            f.write('>chr1\nACGTACGTACGTACGT\n')
+        build_index(self.path)
+        with open(self.path, 'w') as f:
+            f.write('>chr1\nAC\n')
+        os.utime(self.path, (index_time, index_time))
+        with IndexedFasta(self.path) as fa:
+            self.assertEqual(str(fa['chr1']), 'AC')
+
+    def test_iter_chunks(self):
+        with IndexedFasta(self.path) as fa:
+            self.assertEqual(list(fa['chr1'].iter_chunks(5)), ['ACGTA', 'CGTAC', 'GT'])
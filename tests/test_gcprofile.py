@@ -0,0 +1,45 @@
+from unittest import TestCase, mock
+from rosalind.gcprofile import *
+from rosalind.utils import gc
+import rosalind.gcprofile
+
+
+class Test(TestCase):
+    def setUp(self):
+        self.seq = 'CCACCCTCGTGGTATGGCTAGGCATTCAGGAACCGGAGAACGCTTCAGACCAGCCCGGACTGGGAACCTGCGGGCAGTAGGTGGAAT'
+
+    def test_gc(self):
+        profile = GCProfile(self.seq)
+        self.assertAlmostEqual(profile.gc(), gc(self.seq))
+        self.assertAlmostEqual(profile.gc(10, 37), gc(self.seq[10:37]))
+        self.assertAlmostEqual(profile.skew(0, 8), (0 - 6) / 6)
+        with self.assertRaises(ValueError):
+            profile.gc(10, 10)
+
+    def test_from_chunks(self):
+        chunks = [self.seq[i:i + 7].lower() for i in range(0, len(self.seq), 7)]
+        for resolution in (1, 5):
+            profile = GCProfile.from_chunks(chunks, resolution=resolution)
+            self.assertEqual(profile.length, len(self.seq))
+            self.assertAlmostEqual(profile.gc(), gc(self.seq))
+            self.assertAlmostEqual(profile.gc(10, 40), gc(self.seq[10:40]))
+        with self.assertRaises(ValueError):
+            profile.gc(3, 10)
+
+    def test_windows(self):
+        profile = GCProfile(self.seq, resolution=10)
+        windows = profile.gc_windows(20, step=10)
+        self.assertEqual(len(windows), 7)
+        for i, value in enumerate(windows):
+            self.assertAlmostEqual(value, gc(self.seq[10 * i:10 * i + 20]))
+        skews = GCProfile(self.seq).skew_windows(30)
+        self.assertEqual(len(skews), 2)
+        self.assertAlmostEqual(skews[1], GCProfile(self.seq[30:60]).skew())
+
+    def test_long_sequence_counts(self):
+        self.assertEqual(GCProfile(self.seq)._g.typecode, 'I')
+        # sequences longer than 32-bit counts allow switch to 64-bit prefix sums
+        with mock.patch.object(rosalind.gcprofile, '_MAX_SHORT_LENGTH', 50):
+            profile = GCProfile.from_chunks([self.seq[:40], self.seq[40:]])
+        self.assertEqual(profile._g.typecode, 'Q')
+        self.assertAlmostEqual(profile.gc(30, 70), gc(self.seq[30:70]))
@@ -0,0 +1,53 @@
+from unittest import TestCase
+from rosalind import instrument
+import rosalind.sequence
+import rosalind.utils
+import json
+
+
+class Test(TestCase):
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_instrumented(self):
+        original = rosalind.sequence.hamming_distance
+        with instrument.instrumented():
+            self.assertIsNot(rosalind.sequence.hamming_distance, original)
+            rosalind.sequence.hamming_distance('ACGT', 'ACGA')
+            rosalind.sequence.hamming_distance('ACGTACGT', 'ACGAACGT')
+            rosalind.sequence.gc('ACGT')
+        self.assertIs(rosalind.sequence.hamming_distance, original)
+
+        stats = instrument.stats()
+        self.assertEqual(stats['rosalind.sequence.hamming_distance']['calls'], 2)
+        self.assertEqual(stats['rosalind.sequence.hamming_distance']['bases'], 24)
+        # gc is imported into rosalind.sequence from rosalind.utils
+        self.assertEqual(stats['rosalind.utils.gc']['calls'], 1)
+        self.assertEqual(json.loads(instrument.to_json()), stats)
+
+    def test_disabled(self):
+        rosalind.utils.gc('ACGT')
+        self.assertEqual(instrument.stats(), {})
+
+    def test_to_prometheus(self):
+        with instrument.instrumented():
+            rosalind.utils.calculate_mw('SKADYEK')
+        text = instrument.to_prometheus()
+        self.assertIn('rosalind_calls_total{function="rosalind.utils.calculate_mw"} 1', text)
+        self.assertIn('rosalind_latency_seconds{function="rosalind.utils.calculate_mw",quantile="0.99"}', text)
+
+    def test_profile_stats(self):
+        with instrument.instrumented(cprofile=['levenshtein_distance'], sample_rate=0.5):
+            for _ in range(4):
+                rosalind.sequence.levenshtein_distance('PLEASANTLY', 'MEANLY')
+        self.assertGreater(instrument.profile_stats('levenshtein_distance').total_calls, 0)
+        with self.assertRaises(KeyError):
+            instrument.profile_stats('gc')
+        # a single name is not matched against the names of other functions
+        with instrument.instrumented(cprofile='hamming_distances'):
+            rosalind.sequence.hamming_distance('GAGC', 'CATC')
+            rosalind.sequence.hamming_distances('GAGC', ['CATC'])
+        self.assertGreater(instrument.profile_stats('hamming_distances').total_calls, 0)
+        with self.assertRaises(KeyError):
+            instrument.profile_stats('hamming_distance')
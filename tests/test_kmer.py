@@ -0,0 +1,27 @@
+from unittest import TestCase
+from rosalind.kmer import *
+
+
+class Test(TestCase):
+    def test_encode_decode(self):
+        self.assertEqual(encode_kmer('ACGT'), 0b00011011)
+        self.assertEqual(encode_kmer('acgt'), encode_kmer(b'ACGT'))
+        self.assertEqual(decode_kmer(encode_kmer('GATTACA'), 7), 'GATTACA')
+        self.assertEqual(decode_kmer(0, 3), 'AAA')
+        with self.assertRaises(ValueError):
+            encode_kmer('ACNT')
+
+    def test_iter_kmers(self):
+        seq = 'ACGTNacgtA'
+        expected = [(i, encode_kmer(seq[i:i + 3])) for i in range(len(seq) - 2) if 'N' not in seq[i:i + 3]]
+        self.assertEqual(list(iter_kmers(seq, 3)), expected)
+        self.assertEqual(list(iter_kmers(b'ACGTNacgtA', 3)), expected)
+        self.assertEqual(list(iter_kmers('AC', 3)), [])
+
+    def test_canonical(self):
+        self.assertEqual(reverse_complement_kmer(encode_kmer('AACG'), 4), encode_kmer('CGTT'))
+        self.assertEqual(canonical_kmer(encode_kmer('TTT'), 3), encode_kmer('AAA'))
+        self.assertEqual(canonical_kmer(encode_kmer('AAC'), 3), encode_kmer('AAC'))
+        seq = 'ACGTTNGGA'
+        expected = [(i, canonical_kmer(encode_kmer(seq[i:i + 3]), 3)) for i in (0, 1, 2, 6)]
+        self.assertEqual(list(iter_kmers(seq, 3, canonical=True)), expected)
@@ -0,0 +1,70 @@
+from unittest import TestCase
+from rosalind.kmercount import *
+from rosalind.sequence import reverse_complement
+from collections import Counter
+from unittest import mock
+import io
+import random
+import rosalind.kmercount
+
+
+class Test(TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.sequences = [''.join(rng.choice('ACGTN' if i % 5 == 0 else 'ACGT') for _ in range(rng.randint(0, 300)))
+                          for i in range(30)]
+
+    def expected(self, k, canonical=True):
+        counts = Counter()
+        for seq in self.sequences:
+            for i in range(len(seq) - k + 1):
+                kmer = seq[i:i + k]
+                if 'N' not in kmer:
+                    counts[min(kmer, reverse_complement(kmer)) if canonical else kmer] += 1
+        return dict(sorted(counts.items()))
+
+    def fasta(self):
+        return io.BytesIO(''.join(f'>seq{i}\n{seq}\n' for i, seq in enumerate(self.sequences)).encode())
+
+    def test_count_kmers(self):
+        counts = count_kmers('ACGTacgtNAC', 2, canonical=False)
+        self.assertEqual(dict(counts.items()), {'AC': 3, 'CG': 2, 'GT': 2, 'TA': 1})
+        self.assertEqual(counts['ac'], 3)
+        self.assertEqual(counts['TT'], 0)
+        self.assertEqual(counts.total, 8)
+        self.assertEqual(counts.spectrum(), {1: 1, 2: 2, 3: 1})
+        self.assertEqual(count_kmers('AAAA', 3)['TTT'], 2)
+        with self.assertRaises(ValueError):
+            count_kmers('ACGT', 33)
+
+    def test_merge_counts(self):
+        for k in (3, 21):
+            merged = merge_counts(count_kmers(seq, k) for seq in self.sequences)
+            self.assertEqual(dict(merged.items()), self.expected(k))
+
+    def test_count_fasta_kmers(self):
+        for k, canonical in [(1, True), (4, False), (21, True), (32, False)]:
+            counts = count_fasta_kmers(self.fasta(), k, canonical)
+            self.assertEqual(dict(counts.items()), self.expected(k, canonical))
+
+    def test_count_fasta_kmers_spill(self):
+        spilled = count_fasta_kmers(self.fasta(), 15, max_in_memory=100, partitions=4, jobs=2)
+        self.assertEqual(dict(spilled.items()), self.expected(15))
+        solid = count_fasta_kmers(self.fasta(), 3, min_count=40, max_in_memory=10)
+        self.assertEqual(dict(solid.items()), {kmer: n for kmer, n in self.expected(3).items() if n >= 40})
+
+    def test_iter_fasta_kmer_counts(self):
+        parts = list(iter_fasta_kmer_counts(self.fasta(), 15, max_in_memory=100, partitions=4))
+        self.assertGreater(len(parts), 1)
+        kmers = [kmer for part in parts for kmer, _ in part.items()]
+        self.assertEqual(kmers, sorted(kmers))
+        self.assertEqual(dict(kmer_spectrum(parts)), count_fasta_kmers(self.fasta(), 15).spectrum())
+        self.assertEqual(len(list(iter_fasta_kmer_counts(self.fasta(), 15))), 1)
+
+    def test_spill_without_numpy(self):
+        with mock.patch.object(rosalind.kmercount, '_numpy', lambda: None):
+            spilled = count_fasta_kmers(self.fasta(), 15, max_in_memory=100, partitions=4)
+            self.assertIsInstance(spilled.codes, list)
+            self.assertEqual(dict(spilled.items()), self.expected(15))
+            solid = count_fasta_kmers(self.fasta(), 3, min_count=40, max_in_memory=10)
+            self.assertEqual(dict(solid.items()), {kmer: n for kmer, n in self.expected(3).items() if n >= 40})
@@ -0,0 +1,77 @@
+from unittest import TestCase, mock
+from rosalind.kmerindex import *
+import rosalind.kmerindex
+from rosalind.sequence import find_motif
+import os
+import tempfile
+
+
+class Test(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sequences = {'chr1': 'GATATATGCATATACTTNNATATGCAT', 'chr2': 'atatgcatATATAT'}
+        self.fasta = self.write_fasta('test.fa', self.sequences)
+        self.index_dir = os.path.join(self.tmp.name, 'index')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_fasta(self, name, records):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w') as f:
+            for record, seq in records.items():
+                f.write(f'>{record}\n')
+                f.write(''.join(seq[i:i + 10] + '\n' for i in range(0, len(seq), 10)))
+        return path
+
+    def expected(self, sequences, motif):
+        hits = {name: find_motif(seq.upper(), motif) for name, seq in sequences.items()}
+        return {name: starts for name, starts in hits.items() if starts}
+
+    def test_find_motif(self):
+        with KmerIndex(self.index_dir, k=4) as index:
+            index.add_fasta(self.fasta)
+            for motif in ['ATAT', 'ATATGCAT', 'TATGCATA', 'GCA', 'AT', 'T', 'CATAT', 'GGGG', 'ACTT']:
+                self.assertEqual(index.find_motif(motif), self.expected(self.sequences, motif), motif)
+            self.assertEqual(index.find_motif('atat'), index.find_motif('ATAT'))
+            with self.assertRaises(ValueError):
+                index.find_motif('ATN')
+
+    def test_persistent_and_incremental(self):
+        with KmerIndex(self.index_dir, k=5) as index:
+            index.add_fasta(self.fasta)
+        more = {'chr3': 'TTATATGCATAA'}
+        fasta = self.write_fasta('more.fa', more)
+        with KmerIndex(self.index_dir) as index:
+            self.assertEqual(index.k, 5)
+            index.add_fasta(fasta)
+            self.assertEqual(index.records, ['chr1', 'chr2', 'chr3'])
+            expected = self.expected({**self.sequences, **more}, 'ATATGCAT')
+            self.assertEqual(index.find_motif('ATATGCAT'), expected)
+            index.compact()
+            self.assertEqual(index.find_motif('ATATGCAT'), expected)
+        with KmerIndex(self.index_dir) as index:
+            self.assertEqual(index.find_motif('ATATGCAT'), expected)
+        with self.assertRaises(ValueError):
+            KmerIndex(self.index_dir, k=6)
+
+    def test_sorted_runs(self):
+        # tiny runs force sorting in several runs on disk and merging them
+        expected = self.expected(self.sequences, 'ATAT')
+        for np in (rosalind.kmerindex._numpy(), None):
+            with mock.patch.object(rosalind.kmerindex, '_numpy', lambda: np):
+                index_dir = os.path.join(self.tmp.name, f'runs-{np is None}')
+                with KmerIndex(index_dir, k=3) as index:
+                    index.add_fasta(self.fasta, max_in_memory=4)
+                    self.assertEqual(index.find_motif('ATAT'), expected)
+                    self.assertEqual(len(os.listdir(index_dir)), 4)  # meta.json and one segment
+
+    def test_duplicates(self):
+        with KmerIndex(self.index_dir, k=4) as index:
+            index.add_fasta(self.fasta)
+            with self.assertRaises(ValueError):
+                index.add_fasta(self.fasta)
+            with self.assertRaises(ValueError):
+                index.add_fasta(self.write_fasta('copy.fa', {'chr2': 'ACGTACGT'}))
+            self.assertEqual(index.records, ['chr1', 'chr2'])
+            self.assertEqual(index.find_motif('ATATGCAT'), self.expected(self.sequences, 'ATATGCAT'))
@@ -0,0 +1,53 @@
+from unittest import TestCase
+from rosalind.mass import *
+import io
+
+
+class Test(TestCase):
+    def test_protein_mass(self):
+        self.assertAlmostEqual(protein_mass('SKADYEK'), 821.392, places=2)
+        self.assertAlmostEqual(protein_mass(b'skadyek'), protein_mass('SKADYEK'))
+        self.assertAlmostEqual(protein_mass('G', average=True, water=True), 57.0519 + 18.01528)
+        # long proteins are summed with numpy
+        self.assertAlmostEqual(protein_mass('SKADYEK' * 100), 100 * protein_mass('SKADYEK'), places=6)
+        for protein in ('SKAXYEK', 'SKADYEK' * 100 + '*'):
+            with self.assertRaises(ValueError):
+                protein_mass(protein)
+
+    def test_protein_masses(self):
+        proteins = ['SKADYEK', '', 'G', 'mkv' * 30]
+        masses = protein_masses(proteins, average=True)
+        for protein, mass in zip(proteins, masses):
+            self.assertAlmostEqual(mass, protein_mass(protein, average=True), places=6)
+        self.assertEqual(len(protein_masses([])), 0)
+        with self.assertRaises(ValueError):
+            protein_masses(['SKADYEK', 'B'])
+
+    def test_fasta_masses(self):
+        fasta = io.BytesIO(b'>p1\nSKAD\nYEK\n>p2\nGG\n>p3\nMKV\n')
+        result = list(fasta_masses(fasta, batch_size=2))
+        self.assertEqual([name for name, _ in result], ['p1', 'p2', 'p3'])
+        self.assertAlmostEqual(result[1][1], 2 * 57.02146)
+        with self.assertRaisesRegex(ValueError, 'Record p2'):
+            list(fasta_masses([('p1', 'GG'), ('p2', 'GXG')]))
+
+    def test_fragment_masses(self):
+        fragments = FragmentMasses('PEPTIDE')
+        self.assertEqual(len(fragments), 7)
+        self.assertAlmostEqual(fragments.mass(), protein_mass('PEPTIDE'))
+        self.assertAlmostEqual(fragments.mass(2, 5), protein_mass('PTI'))
+        self.assertAlmostEqual(fragments.precursor_mass(), 799.35996, places=4)
+        b_ions = fragments.b_ions()
+        y_ions = fragments.y_ions()
+        self.assertEqual((len(b_ions), len(y_ions)), (6, 6))
+        self.assertAlmostEqual(b_ions[0], 98.06004, places=4)
+        self.assertAlmostEqual(y_ions[0], 148.06043, places=4)
+        # complementary b and y ions add up to the precursor plus two protons
+        self.assertAlmostEqual(b_ions[1] + y_ions[4], fragments.precursor_mass() + 2 * PROTON)
+        subpeptides = list(fragments.subpeptide_masses(max_length=2))
+        self.assertEqual(len(subpeptides), 13)
+        self.assertAlmostEqual(subpeptides[1][2], protein_mass('PE'))
+        with self.assertRaises(IndexError):
+            fragments.mass(3, 8)
+        with self.assertRaises(ValueError):
+            FragmentMasses('PEPTIDEZ')
@@ -0,0 +1,42 @@
+from unittest import TestCase
+from rosalind.motif import *
+import random
+
+
+class Test(TestCase):
+    def test_find_motifs(self):
+        self.assertEqual(find_motifs('GATATATGCATATACTT', ['ATAT', 'TAT', 'GGG']),
+                         {'ATAT': [2, 4, 10], 'TAT': [3, 5, 11], 'GGG': []})
+        self.assertEqual(find_motifs('ACGTT', ['ACG', 'CG', 'A']), {'ACG': [1], 'CG': [2], 'A': [1]})
+
+    def test_find_motifs_both_strands(self):
+        # AAC is GTT on the minus strand, ACGT is its own reverse complement
+        self.assertEqual(find_motifs('AACGTT', ['AAC', 'ACGT'], both_strands=True), {'AAC': [1, 4], 'ACGT': [2]})
+
+    def test_motif_automaton(self):
+        automaton = MotifAutomaton(['AAC'], both_strands=True)
+        self.assertEqual(list(automaton.iter_matches('GTTAAC')), [(0, 'AAC', '-'), (3, 'AAC', '+')])
+        self.assertEqual(list(automaton.search_records([('r1', 'AAC'), ('r2', 'GGG')])),
+                         [('r1', {'AAC': [1]}), ('r2', {'AAC': []})])
+
+    def test_find_approximate(self):
+        self.assertEqual(find_approximate('GATATATGCATATACTT', 'ATCT', 1), [2, 4, 10])
+        self.assertEqual(find_approximate('GATATATGCATATACTT', 'ATAT', 0), [2, 4, 10])
+        self.assertEqual(find_approximate('ACGT', 'ACGTA', 2), [])
+        self.assertEqual(find_approximate('ACGT', 'GG', 2), [1, 2, 3])
+        # reverse complement of AACC is GGTT, which matches GGAT and GATT with one mismatch
+        self.assertEqual(find_approximate('TTGGATTAAC', 'AACC', 1, both_strands=True), [3, 4])
+        with self.assertRaises(ValueError):
+            find_approximate('ACGT', 'AC', -1)
+
+    def test_find_approximate_long_motif(self):
+        # long motifs are seeded with exact pieces, compare to a windowed Hamming distance
+        rng = random.Random(7)
+        s = ''.join(rng.choice('ACGT') for _ in range(2000))
+        t = list(s[500:560])
+        t[3], t[40] = 'A' if t[3] != 'A' else 'C', 'G' if t[40] != 'G' else 'T'
+        t = ''.join(t)
+        for d in (0, 2, 4, 30):
+            expected = [i + 1 for i in range(len(s) - len(t) + 1)
+                        if sum(a != b for a, b in zip(s[i:i + len(t)], t)) <= d]
+            self.assertEqual(find_approximate(s, t, d), expected)
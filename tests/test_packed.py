@@ -0,0 +1,54 @@
+from unittest import TestCase
+from rosalind.packed import *
+from rosalind.sequence import reverse_complement, hamming_distance, find_motif, translate_rna, gc
+from rosalind.translation import translate
+import random
+
+
+class Test(TestCase):
+    def test_packed_sequence(self):
+        rng = random.Random(0)
+        for length in range(0, 12):
+            seq = ''.join(rng.choice('ACGT') for _ in range(length))
+            packed = PackedSequence(seq.lower())
+            self.assertEqual(str(packed), seq)
+            self.assertEqual(len(packed), length)
+            self.assertEqual(len(packed.data), (length + 3) // 4)
+            self.assertEqual(str(packed.reverse_complement()), reverse_complement(seq))
+        self.assertEqual(str(PackedSequence('ACGU')), 'ACGU')
+        self.assertEqual(PackedSequence('ACGTAC')[1:4], PackedSequence('CGT'))
+        self.assertEqual(PackedSequence('ACGTAC')[-1], 'C')
+        with self.assertRaises(ValueError):
+            PackedSequence('ACGN')
+
+    def test_slices(self):
+        rng = random.Random(1)
+        seq = ''.join(rng.choice('ACGT') for _ in range(37))
+        packed = PackedSequence(seq)
+        for start in range(-2, 39):
+            for stop in range(start - 1, 40):
+                sliced = packed[start:stop]
+                self.assertEqual(str(sliced), seq[start:stop])
+                self.assertEqual(sliced, PackedSequence(seq[start:stop]))
+        self.assertEqual(str(packed[::-3]), seq[::-3])
+        rna = PackedSequence('ACGUUA')
+        self.assertTrue(rna[:3].is_rna)
+        self.assertEqual(str(rna[:3]), 'ACG')
+        self.assertEqual(str(rna[4:]), 'UA')
+        self.assertEqual(str(rna[::2]), 'AGU')
+
+    def test_translate(self):
+        rng = random.Random(2)
+        for length in range(0, 40):
+            seq = ''.join(rng.choice('ACGT') for _ in range(length))
+            for table in (1, 2):
+                self.assertEqual(PackedSequence(seq).translate(table), translate(seq, table))
+
+    def test_sequence_functions(self):
+        packed = PackedSequence('GATATATGCATATACTT')
+        self.assertEqual(reverse_complement(PackedSequence('ATGC')), PackedSequence('GCAT'))
+        self.assertEqual(hamming_distance(PackedSequence('GAGCCTACTAACGGGAT'), PackedSequence('CATCGTAATGACGGCCT')), 7)
+        self.assertEqual(find_motif(packed, 'ATAT'), [2, 4, 10])
+        self.assertAlmostEqual(gc(packed), gc('GATATATGCATATACTT'))
+        self.assertEqual(translate_rna(PackedSequence('AUGGCCAUGGCGCCCAGAACUGAGAUCAAUAGUACCCGUAUUAACGGGUGA')),
+                         'MAMAPRTEINSTRING')
@@ -0,0 +1,45 @@
+from unittest import TestCase
+from rosalind.pairwise import *
+from rosalind.sequence import hamming_distance, levenshtein_distance
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+
+class Test(TestCase):
+    def setUp(self):
+        self.sequences = ['ACGTACGT', 'ACGTTCGT', 'TTGTACGA', 'ACGAACGT', 'GGGTACGT']
+
+    def expected(self, metric):
+        n = len(self.sequences)
+        return [metric(self.sequences[i], self.sequences[j]) for i in range(n) for j in range(i + 1, n)]
+
+    def test_condensed_index(self):
+        self.assertEqual([condensed_index(4, i, j) for i in range(4) for j in range(i + 1, 4)], list(range(6)))
+
+    def test_distance_matrix(self):
+        self.assertEqual(list(distance_matrix(self.sequences, jobs=1, tile_size=2)), self.expected(hamming_distance))
+        self.assertEqual(list(distance_matrix(self.sequences, 'levenshtein', jobs=2, tile_size=2)),
+                         self.expected(levenshtein_distance))
+
+    def test_distance_matrix_out(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'dist.bin')
+            distances = distance_matrix(self.sequences, jobs=1, tile_size=3, out=path)
+            self.assertEqual(list(distances), self.expected(hamming_distance))
+            self.assertEqual(os.path.getsize(path), 8 * 10)
+
+    def test_close_pairs(self):
+        self.assertEqual(sorted(close_pairs(self.sequences, 1, 'levenshtein', jobs=1, tile_size=2)),
+                         [(0, 1, 1), (0, 3, 1)])
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'seqs.fa')
+            with open(path, 'w') as f:
+                f.write('>a\nACGT\n>b\nACGA\n')
+            output = io.StringIO()
+            with redirect_stdout(output):
+                main([path, '--jobs', '1'])
+            self.assertEqual(output.getvalue(), '\ta\tb\na\t0\t1\nb\t1\t0\n')
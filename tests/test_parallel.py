@@ -0,0 +1,23 @@
+from unittest import TestCase
+from rosalind.parallel import *
+from rosalind.utils import gc
+from rosalind.sequence import reverse_complement
+import os
+import tempfile
+
+
+class Test(TestCase):
+    def test_parallel_map(self):
+        items = ['ACGT' * i for i in range(1, 50)]
+        expected = [reverse_complement(s) for s in items]
+        self.assertEqual(list(parallel_map(reverse_complement, items, jobs=1)), expected)
+        self.assertEqual(list(parallel_map(reverse_complement, iter(items), jobs=2, batch_size=4, max_in_flight=2)),
+                         expected)
+        self.assertEqual(list(parallel_map(reverse_complement, [], jobs=2)), [])
+
+    def test_map_fasta(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'test.fa')
+            with open(path, 'w') as f:
+                f.writelines(f'>seq{i}\n{"GC" * i}{"AT" * (10 - i)}\n' for i in range(10))
+            self.assertEqual(list(map_fasta(gc, path, jobs=2, batch_size=3)), [(f'seq{i}', i / 10) for i in range(10)])
@@ -0,0 +1,80 @@
+from unittest import TestCase, skipUnless
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+
+HAS_DEPENDENCIES = all(importlib.util.find_spec(name) for name in ('requests', 'bs4'))
+if HAS_DEPENDENCIES:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'rosalind_scraping'))
+    import scrape_rosalind_problem as scraper
+
+PAGE = b'''<html><body>
+<h1>Counting DNA Nucleotides</h1>
+<p class="topics">Topics: String Algorithms</p>
+<p>p0</p><p>p1</p><p>A string is a collection of symbols.</p><p>p3</p><p>p4</p><p>p5</p>
+<p>Given: A DNA string.</p><p>Return: Four integers.</p>
+<div class="codehilite">AGCTTTTCATTCTGACTGC</div>
+<div class="codehilite">20 12 17 21</div>
+</body></html>'''
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # a problem page with an ETag which must be revalidated on every use, 304 responses carry no ETag
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@skipUnless(HAS_DEPENDENCIES, 'requests and bs4 are not installed')
+class Test(TestCase):
+    def setUp(self):
+        StandInHandler.requests = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/problems/'
+        self.tmp = tempfile.TemporaryDirectory()
+        self.puzzles_dir = os.path.join(self.tmp.name, 'puzzles')
+        os.makedirs(os.path.join(self.puzzles_dir, 'sample_data'))
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_scrape_and_revalidate(self):
+        # first fetch: the page is downloaded, cached and turned into templates
+        results = scraper.scrape_rosalind_problems(['dna'], self.base_url, concurrency=2, cache_dir=self.cache_dir,
+                                                   puzzles_dir=self.puzzles_dir, data_dir=self.tmp.name)
+        self.assertEqual(results['dna'], os.path.join(self.puzzles_dir, 'counting_dna_nucleotides.py'))
+        with open(os.path.join(self.puzzles_dir, 'sample_data', 'counting_dna_nucleotides.txt')) as f:
+            self.assertEqual(f.read(), 'AGCTTTTCATTCTGACTGC')
+        self.assertEqual(StandInHandler.requests, [('/problems/dna', None)])
+
+        # the cached page is revalidated with its ETag, the 304 keeps the cached body and validators
+        cache = scraper.HttpCache(self.cache_dir)
+        session = scraper.make_session()
+        url = self.base_url + 'dna'
+        for _ in range(2):
+            self.assertEqual(scraper.fetch(url, session, cache), PAGE)
+            self.assertEqual(cache.get(url)[1]['etag'], '"v1"')
+        session.close()
+        self.assertEqual(StandInHandler.requests, [('/problems/dna', None)] + [('/problems/dna', '"v1"')] * 2)
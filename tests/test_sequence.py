@@ -1,6 +1,11 @@
-from unittest import TestCase
+from unittest import TestCase, skipUnless
 from rosalind.sequence import *
+import rosalind.sequence
+import os
+import subprocess
+import sys
 import tempfile
+from unittest import mock
 
 
 # Tests for rosalind.sequence module
@@ -16,6 +21,31 @@ class Test(TestCase):
     def test_hamming_distance(self):
         self.assertEqual(hamming_distance('GAGCCTACTAACGGGAT', 'CATCGTAATGACGGCCT'), 7)
 
+    def test_hamming_distance_long(self):
+        # long enough for the numpy path if it is installed, and the pure python fallback
+        dna1 = 'GAGCCTACTAACGGGAT' * 10
+        dna2 = 'catcgtaatgacggcct' * 10
+        self.assertEqual(hamming_distance(dna1, dna2), 70)
+        with mock.patch.object(rosalind.sequence, '_numpy', lambda: None):
+            self.assertEqual(hamming_distance(dna1, dna2), 70)
+
+    def test_hamming_distances(self):
+        self.assertEqual(list(hamming_distances('ACGT', ['ACGT', 'acga', 'TGCA'])), [0, 1, 4])
+        with mock.patch.object(rosalind.sequence, '_numpy', lambda: None):
+            self.assertEqual(hamming_distances('ACGT', ['ACGT', 'acga', 'TGCA']), [0, 1, 4])
+
+    def test_import_is_light(self):
+        # revcomp, hamming and motif commands import rosalind.sequence, numpy must only be loaded for long inputs
+        code = ('import sys, rosalind.sequence as s; s.hamming_distance("ACGT", "ACGA");'
+                's.hamming_distances("ACGT", ["ACGA"]); print("numpy" in sys.modules)')
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+    @skipUnless(rosalind.sequence._numpy(), 'numpy is not installed')
+    def test_hamming_distances_array(self):
+        np = rosalind.sequence._numpy()
+        self.assertEqual(list(hamming_distances('ACGT', np.array([b'ACGT', b'acga', b'TGCA']))), [0, 1, 4])
+
     def test_find_motif(self):
         self.assertEqual(find_motif('GATATATGCATATACTT', 'ATAT'), [2, 4, 10])
 
@@ -26,7 +56,50 @@ class Test(TestCase):
     def test_longest_common_substring(self):
         self.assertEqual(longest_common_substring(
             ['ATGGTCTACATAGCTGACAAACAGCACGTAGCAATCGGTCGAATCTCGAGAGGCATATGGTCACATGATCGGTCGAGCGTGTTTCAAAGTTTGCGCCTAG',
-             'ATCGGTCGAA','ATCGGTCGAGCGTGT']), 'TCGGTCGAA')
+             'ATCGGTCGAA','ATCGGTCGAGCGTGT']), 'ATCGGTCGA')
 
     def test_levenshtein_distance(self):
         self.assertEqual(levenshtein_distance('PLEASANTLY', 'MEANLY'), 5)
+
+    def test_longest_common_substring_keeps_input(self):
+        sequences = ['GATTACA', 'TAGACCA', 'ATACA']
+        self.assertEqual(longest_common_substring(sequences), 'AC')
+        self.assertEqual(sequences, ['GATTACA', 'TAGACCA', 'ATACA'])
+
+    def test_find_motif_at_start(self):
+        self.assertEqual(find_motif('ATATAT', 'ATA'), [1, 3])
+
+    def test_find_motif_mismatches(self):
+        self.assertEqual(find_motif('GATATATGCATATACTT', 'ATCT', max_mismatches=1), [2, 4, 10])
+        self.assertEqual(find_motif('AACGTT', 'AAC', both_strands=True), [1, 4])
+
+    def test_levenshtein_distance_threshold(self):
+        self.assertEqual(levenshtein_distance('PLEASANTLY', 'MEANLY', max_distance=5), 5)
+        self.assertEqual(levenshtein_distance('PLEASANTLY', 'MEANLY', max_distance=3), 4)
+        with self.assertRaises(ValueError):
+            levenshtein_distance('PLEASANTLY', 'PLEASANTLY', max_distance=-1)
+
+    def test_translate_genetic_code(self):
+        # UGA is a stop in the standard code and tryptophan in vertebrate mitochondria, the partial codon is ignored
+        self.assertEqual(translate_rna('AUGUGAAAAGG'), 'M')
+        self.assertEqual(translate_rna('AUGUGAAAAGG', table=2), 'MWK')
+
+    def test_reverse_complement_variants(self):
+        self.assertEqual(reverse_complement('AUGc'), 'gCAU')
+        self.assertEqual(reverse_complement('ATGNRyU'), 'ArYNCAT')
+        self.assertEqual(reverse_complement(b'ATGC'), b'GCAT')
+        self.assertTrue(reverse_complement('ATGX').startswith('Please'))
+        with self.assertRaises(ValueError):
+            reverse_complement(b'ATGX')
+
+    def test_reverse_complement_fasta(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = tmp + '/test.fa'
+            with open(path, 'w') as f:
+                f.write('>seq1\nAACCG\nGTTAC\nG\n>seq2\nATGC\n')
+            reverse_complement_fasta(path, tmp + '/rc.fa', block_size=3, line_width=4)
+            with open(tmp + '/rc.fa') as f:
+                self.assertEqual(f.read(), '>seq1\nCGTA\nACCG\nGTT\n>seq2\nGCAT\n')
+            self.assertTrue(os.path.exists(path + '.fai'))
+            reverse_complement_fasta(path, tmp + '/rc2.fa', index_path=tmp + '/other.fai')
+            self.assertTrue(os.path.exists(tmp + '/other.fai'))
@@ -0,0 +1,60 @@
+from unittest import TestCase, mock
+from rosalind.suffix import *
+import random
+import rosalind.suffix
+
+
+def brute_force_lcs(sequences, min_count):
+    # all substrings of the first sequences, kept if they occur in enough sequences
+    best = []
+    for seq in sequences:
+        for i in range(len(seq)):
+            for j in range(i + 1, len(seq) + 1):
+                sub = seq[i:j]
+                if sum(sub in s for s in sequences) >= min_count:
+                    if not best or len(sub) > len(best[0]):
+                        best = [sub]
+                    elif len(sub) == len(best[0]):
+                        best.append(sub)
+    return sorted(set(best))
+
+
+class Test(TestCase):
+    def test_suffix_array(self):
+        self.assertEqual(suffix_array('banana'), [5, 3, 1, 0, 4, 2])
+        self.assertEqual(suffix_array('aaaa'), [3, 2, 1, 0])
+
+    def test_suffix_array_random(self):
+        rng = random.Random(2)
+        texts = ['a' * 300, 'ab' * 150, 'abcab' * 40 + 'c'] + [
+            ''.join(rng.choice('ACGT') for _ in range(rng.randint(1, 400))) for _ in range(20)]
+        for text in texts:
+            expected = sorted(range(len(text)), key=lambda i: text[i:])
+            self.assertEqual(suffix_array(text), expected)
+            self.assertEqual(suffix_array([ord(c) for c in text]), expected)
+            with mock.patch.object(rosalind.suffix, '_numpy', lambda: None):
+                self.assertEqual(suffix_array(text), expected)
+
+    def test_longest_common_substrings_long(self):
+        rng = random.Random(3)
+        shared = ''.join(rng.choice('ACGT') for _ in range(30))
+        sequences = [''.join(rng.choice('ACGT') for _ in range(500)) + shared +
+                     ''.join(rng.choice('ACGT') for _ in range(500)) for _ in range(4)]
+        self.assertEqual(longest_common_substrings(sequences), [shared])
+        with mock.patch.object(rosalind.suffix, '_numpy', lambda: None):
+            self.assertEqual(longest_common_substrings(sequences), [shared])
+
+    def test_lcp_array(self):
+        self.assertEqual(lcp_array('banana', suffix_array('banana')), [0, 1, 3, 0, 0, 2])
+
+    def test_longest_common_substrings(self):
+        self.assertEqual(longest_common_substrings(['GATTACA', 'TAGACCA', 'ATACA']), ['AC', 'CA', 'TA'])
+        self.assertEqual(longest_common_substrings(['AAAA', 'CCCC']), [])
+        self.assertEqual(longest_common_substrings(['ACGTTT', 'GGACGT', 'TTTT'], min_count=2), ['ACGT'])
+
+    def test_longest_common_substrings_random(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            sequences = [''.join(rng.choice('ACG') for _ in range(rng.randint(1, 12))) for _ in range(rng.randint(2, 4))]
+            min_count = rng.randint(2, len(sequences))
+            self.assertEqual(longest_common_substrings(sequences, min_count), brute_force_lcs(sequences, min_count))
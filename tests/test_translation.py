@@ -0,0 +1,39 @@
+from unittest import TestCase
+from rosalind.translation import *
+from rosalind.alphabet import InvalidSequenceError
+from rosalind.sequence import reverse_complement
+
+
+class Test(TestCase):
+    def test_codon_table(self):
+        standard = codon_table()
+        self.assertEqual(len(standard), 64)
+        self.assertEqual((standard['AUG'], standard['UAA'], standard['UGG'], standard['GCU']), ('M', '*', 'W', 'A'))
+        self.assertEqual(codon_table(2)['AGA'], '*')
+        with self.assertRaises(ValueError):
+            codon_table(7)
+
+    def test_translate(self):
+        self.assertEqual(translate('ATGGCCTAAGGNCC'), 'MA*X')
+        self.assertEqual(translate('ATGGCCTAAGGNCC', to_stop=True), 'MA')
+        self.assertEqual(translate(b'xatggcc', frame=1), 'MA')
+
+    def test_six_frame(self):
+        seq = 'ATGGCCATTGTAATGGGCCGCTGAAAGGGTGCCCGATAG'
+        frames = six_frame(seq)
+        self.assertEqual(frames['+1'], 'MAIVMGR*KGAR*')
+        for frame in range(3):
+            self.assertEqual(frames[f'+{frame + 1}'], translate(seq, frame=frame))
+            self.assertEqual(frames[f'-{frame + 1}'], translate(reverse_complement(seq), frame=frame))
+
+    def test_translate_stream(self):
+        seq = 'ATGGCCATTGTAATGGGCCGCTGAAAGGGTGCCCGATAG'
+        chunks = [seq[i:i + 4] for i in range(0, len(seq), 4)]
+        for frame in range(3):
+            self.assertEqual(''.join(translate_stream(chunks, frame=frame)), translate(seq, frame=frame))
+
+    def test_translate_strict(self):
+        self.assertEqual(translate('AUGGCC', strict=True), 'MA')
+        with self.assertRaises(InvalidSequenceError):
+            translate('AUGNCC', strict=True)
+        self.assertEqual(translate('AUGNCC'), 'MX')
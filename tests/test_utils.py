@@ -1,5 +1,10 @@
 from unittest import TestCase
 from rosalind.utils import *
+import os
+import subprocess
+import sys
+import tempfile
+
 
 class Test(TestCase):
     def test_gc(self):
@@ -8,3 +13,28 @@ class Test(TestCase):
 
     def test_mw(self):
         self.assertAlmostEqual(calculate_mw("SKADYEK"), 821.392, places = 2)
+        with self.assertRaises(ValueError):
+            calculate_mw("SKADYEKB")
+
+    def test_iter_fasta(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'test.fa')
+            with open(path, 'w') as f:
+                f.write('>seq1 first\nACGT\nAC\n>seq2\r\nGG\r\nTT\n>empty\n>seq3\nA')
+            # a tiny chunk size forces records and lines to be split across chunks
+            self.assertEqual(list(iter_fasta(path, chunk_size=3)),
+                             [('seq1 first', 'ACGTAC'), ('seq2', 'GGTT'), ('empty', ''), ('seq3', 'A')])
+            self.assertEqual(next(iter_fasta(path, as_bytes=True)), ('seq1 first', b'ACGTAC'))
+
+    def test_read_multifasta(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'test.fa')
+            with open(path, 'w') as f:
+                f.write('>Rosalind_1\nATCCAGCT\nGGGCAACT\n>Rosalind_2\nATGGATCT\n')
+            self.assertEqual(read_multifasta(path), {'Rosalind_1': 'ATCCAGCTGGGCAACT', 'Rosalind_2': 'ATGGATCT'})
+
+    def test_import_is_light(self):
+        # every CLI command imports rosalind.utils, numpy must only be loaded on use
+        code = 'import sys, rosalind.utils; print("numpy" in sys.modules)'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')